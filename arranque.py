@@ -0,0 +1,60 @@
+# -------------------------------------------------------
+# Módulo: arranque.py
+# CHATBOT Benedit asistente emocional
+# Función: Utilidades para que Benedit arranque rápido: verificación local
+# de los datos de NLTK (sin red) y registro de tiempos de arranque
+# -------------------------------------------------------
+
+import re         # Para leer la versión de NLTK
+import time       # Para medir los tiempos de cada etapa del arranque
+import threading  # Para registrar tiempos desde el hilo de carga en segundo plano
+
+
+# Recurso de NLTK que usa word_tokenize: 'punkt_tab' desde NLTK 3.8.2, 'punkt' antes
+def recurso_tokenizador_nltk():
+    import nltk  # Importación diferida: NLTK tarda en cargar
+
+    version = tuple(int(parte) for parte in re.findall(r"\d+", nltk.__version__)[:3])
+    return ("punkt_tab", "tokenizers/punkt_tab") if version >= (3, 8, 2) else ("punkt", "tokenizers/punkt")
+
+
+# Verifica si los datos del tokenizador de NLTK ya están en disco, sin ninguna llamada de red.
+# Solo descarga si faltan y se permite (descargar=True); devuelve si quedaron disponibles.
+def verificar_datos_nltk(descargar=True):
+    import nltk
+
+    nombre, ruta = recurso_tokenizador_nltk()
+    try:
+        nltk.data.find(ruta)
+        return True
+    except LookupError:
+        pass
+
+    # nltk.download devuelve False si no se pudo descargar (por ejemplo, sin conexión)
+    if descargar and nltk.download(nombre, quiet=True):
+        return True
+
+    print(f"⚠️ No se encontraron los datos '{nombre}' de NLTK. Ejecuta: python -m nltk.downloader {nombre}")
+    return False
+
+
+# Clase que acumula los tiempos de cada etapa desde que se importó el programa
+class TiemposArranque:
+    def __init__(self):
+        self.inicio = time.perf_counter()  # Momento de referencia
+        self.marcas = []                   # Lista de (etapa, segundos desde el inicio)
+        self.lock = threading.Lock()       # Las marcas llegan desde varios hilos
+
+    # Registra que una etapa terminó en este momento
+    def marcar(self, etapa):
+        with self.lock:
+            self.marcas.append((etapa, time.perf_counter() - self.inicio))
+
+    # Devuelve el reporte de tiempos como texto
+    def reporte(self):
+        with self.lock:
+            marcas = sorted(self.marcas, key=lambda m: m[1])
+        lineas = ["⏱️ Tiempos de arranque de Benedit:"]
+        for etapa, segundos in marcas:
+            lineas.append(f"  {segundos * 1000:9.1f} ms  {etapa}")
+        return "\n".join(lineas)
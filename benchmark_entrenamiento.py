@@ -0,0 +1,82 @@
+# ---------------------------------------------------------
+# benchmark_entrenamiento.py - TIEMPOS DE CONSTRUCCIÓN DE DATOS
+# ---------------------------------------------------------
+# Compara la construcción de la matriz de entrenamiento de
+# EntrenadorChatbot con la versión anterior (bucle sobre todo el
+# vocabulario por patrón) sobre un intents.json sintético con
+# N veces más patrones, y verifica que ambas den la misma matriz.
+#
+# Uso: python benchmark_entrenamiento.py [--factor 100]
+# ---------------------------------------------------------
+
+import argparse
+import json
+import os
+import tempfile
+import time
+import numpy as np
+
+from training import EntrenadorChatbot
+
+
+# Versión anterior de crear_datos_entrenamiento (sin mezclar), como referencia
+def crear_datos_referencia(entrenador):
+    training = []
+    output_empty = [0] * len(entrenador.classes)
+    for doc in entrenador.documents:
+        bag = []
+        pattern_words = doc[0]  # Tokens ya lematizados por el preprocesador
+        for w in entrenador.words:
+            bag.append(1 if w in pattern_words else 0)
+        output_row = output_empty[:]
+        output_row[entrenador.classes.index(doc[1])] = 1
+        training.append([bag, output_row])
+    training = np.array(training, dtype=object)
+    return np.array(list(training[:, 0])), np.array(list(training[:, 1]))
+
+
+# Genera un intents.json con 'factor' variantes de cada patrón.
+# Cada variante agrega una palabra nueva, así también crece el vocabulario.
+def intents_sinteticos(intents, factor):
+    sintetico = {"intents": []}
+    for intent in intents["intents"]:
+        patrones = [
+            f"{patron} variante{k}"
+            for patron in intent["patterns"]
+            for k in range(factor)
+        ]
+        sintetico["intents"].append({**intent, "patterns": patrones})
+    return sintetico
+
+
+def medir(funcion):
+    inicio = time.perf_counter()
+    resultado = funcion()
+    return resultado, time.perf_counter() - inicio
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Benchmark de construcción de datos de entrenamiento")
+    parser.add_argument("--factor", type=int, default=100, help="Multiplicador de patrones")
+    args = parser.parse_args()
+
+    with open("intents.json", encoding="utf-8") as f:
+        intents = json.load(f)
+
+    with tempfile.TemporaryDirectory() as carpeta:
+        ruta = os.path.join(carpeta, "intents_sintetico.json")
+        with open(ruta, "w", encoding="utf-8") as f:
+            json.dump(intents_sinteticos(intents, args.factor), f, ensure_ascii=False)
+
+        entrenador = EntrenadorChatbot(ruta)
+        entrenador.cargar_datos()
+        entrenador.procesar_datos()
+        print(f"Patrones: {len(entrenador.documents)}  Vocabulario: {len(entrenador.words)}  Clases: {len(entrenador.classes)}")
+
+        (ref_x, ref_y), t_ref = medir(lambda: crear_datos_referencia(entrenador))
+        _, t_nuevo = medir(lambda: entrenador.crear_datos_entrenamiento(mezclar=False))
+
+    iguales = np.array_equal(ref_x, entrenador.train_x) and np.array_equal(ref_y, entrenador.train_y)
+    print(f"Versión anterior:  {t_ref:8.3f} s")
+    print(f"Versión vectorial: {t_nuevo:8.3f} s  ({t_ref / t_nuevo:.1f}x)")
+    print(f"Misma matriz de entrada y salida: {'sí' if iguales else 'NO'}")
@@ -0,0 +1,67 @@
+# ---------------------------------------------------------
+# benchmark_inferencia.py - EXACTITUD Y COSTO DE LOS FORMATOS DE PESOS
+# ---------------------------------------------------------
+# Clasifica todos los patrones de intents.json con el modelo Keras
+# (chatbot_model.h5) y con la red NumPy en float32, float16 e int8,
+# usando la primera capa dispersa (solo las palabras presentes).
+# Reporta para cada formato: exactitud sobre los tags de intents.json,
+# coincidencia con Keras, diferencia máxima de probabilidad,
+# microsegundos por mensaje (densa vs dispersa) y memoria de los pesos.
+#
+# Uso: python benchmark_inferencia.py [--repeticiones 200]
+# ---------------------------------------------------------
+
+import argparse
+import json
+import time
+import numpy as np
+
+from main import ChatBot
+from inferencia import FORMATOS_PESOS, RedDensaNumpy
+from voz import VozSilenciosa
+
+
+# Microsegundos promedio por mensaje de una función aplicada a cada entrada
+def medir_us(funcion, entradas, repeticiones):
+    inicio = time.perf_counter()
+    for _ in range(repeticiones):
+        for entrada in entradas:
+            funcion(entrada)
+    return (time.perf_counter() - inicio) / (repeticiones * len(entradas)) * 1e6
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Exactitud y costo de la inferencia por formato de pesos")
+    parser.add_argument("--repeticiones", type=int, default=200)
+    args = parser.parse_args()
+
+    with open("intents.json", encoding="utf-8") as f:
+        intents = json.load(f)
+    patrones = [(p, intent["tag"]) for intent in intents["intents"] for p in intent["patterns"]]
+
+    # Mismo preprocesamiento que en la conversación (tokenizar, lematizar, índice del vocabulario)
+    bot = ChatBot(carga_diferida=False, voz=VozSilenciosa(), indice_sesiones=None)
+    lista_indices = [bot.active_indices(patron) for patron, _ in patrones]
+    bolsas = np.zeros((len(patrones), len(bot.words)), dtype=np.float32)
+    for fila, indices in enumerate(lista_indices):
+        bolsas[fila, indices] = 1
+    tags = np.array([bot.classes.index(tag) for _, tag in patrones])
+
+    # Referencia: el modelo Keras
+    from keras.models import load_model
+    modelo = load_model("chatbot_model.h5")
+    ref = modelo.predict(bolsas, verbose=0)
+    print(f"Patrones: {len(patrones)}  Vocabulario: {len(bot.words)}  Clases: {len(bot.classes)}")
+    print(f"Keras: exactitud {np.mean(ref.argmax(1) == tags):.4f}")
+
+    print(f"{'formato':<9}{'exactitud':>10}{'= Keras':>9}{'máx Δp':>10}{'densa µs':>10}{'dispersa µs':>13}{'pesos KB':>10}")
+    base = RedDensaNumpy.desde_keras(modelo)
+    for formato in FORMATOS_PESOS:
+        red = base.convertir(formato)
+        prob = red.predecir_indices_lote(lista_indices)
+        exactitud = np.mean(prob.argmax(1) == tags)
+        iguales = np.mean(prob.argmax(1) == ref.argmax(1))
+        delta = np.abs(prob - ref).max()
+        densa = medir_us(lambda fila: red.predecir(bolsas[fila:fila + 1]), range(len(patrones)), args.repeticiones)
+        dispersa = medir_us(red.predecir_indices, lista_indices, args.repeticiones)
+        print(f"{formato:<9}{exactitud:>10.4f}{iguales:>9.4f}{delta:>10.2e}{densa:>10.1f}{dispersa:>13.1f}{red.bytes_pesos() / 1024:>10.1f}")
@@ -0,0 +1,104 @@
+# ---------------------------------------------------------
+# benchmark_memoria.py - MEMORIA POR PROCESO CON VARIOS TRABAJADORES
+# ---------------------------------------------------------
+# Lanza N procesos que cargan el modelo de Benedit de tres formas:
+#   keras    chatbot_model.h5 + words.pkl + classes.pkl (TensorFlow en cada proceso)
+#   npz      artefacto ligero benedit_modelo.npz (copia propia de los pesos)
+#   binario  benedit_modelo.bin mapeado con np.memmap (páginas compartidas)
+# y reporta la memoria de cada proceso antes y después de cargar el modelo:
+# RSS (lo que ve 'top'), PSS (RSS repartiendo las páginas compartidas entre
+# los procesos que las usan) y la parte compartida. La suma de PSS es la
+# memoria física real de todos los trabajadores juntos.
+#
+# Uso: python benchmark_memoria.py --trabajadores 4 [--modos keras npz binario]
+# ---------------------------------------------------------
+
+import argparse
+import multiprocessing
+import os
+import pickle
+
+MODOS = ("keras", "npz", "binario")
+
+
+# Memoria del proceso actual en MB: {"rss", "pss", "compartida"}
+# (Linux: /proc/self/smaps_rollup; en otros sistemas solo el RSS máximo)
+def memoria_proceso():
+    try:
+        valores = {}
+        with open("/proc/self/smaps_rollup") as f:
+            for linea in f:
+                partes = linea.split()
+                if len(partes) >= 2 and partes[1].isdigit():
+                    valores[partes[0].rstrip(":")] = int(partes[1]) / 1024
+        return {
+            "rss": valores.get("Rss", 0.0),
+            "pss": valores.get("Pss", 0.0),
+            "compartida": valores.get("Shared_Clean", 0.0) + valores.get("Shared_Dirty", 0.0),
+        }
+    except OSError:
+        import resource
+        import sys
+        maxrss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        rss = maxrss / (1024 * 1024) if sys.platform == "darwin" else maxrss / 1024
+        return {"rss": rss, "pss": rss, "compartida": 0.0}
+
+
+# Carga el modelo como lo haría main.py en cada modo y devuelve la red
+def cargar_modelo(modo):
+    if modo == "keras":
+        from keras.models import load_model
+        from inferencia import RedDensaNumpy
+        modelo = load_model("chatbot_model.h5")
+        pickle.load(open("words.pkl", "rb"))
+        pickle.load(open("classes.pkl", "rb"))
+        return RedDensaNumpy.desde_keras(modelo), modelo
+    if modo == "npz":
+        from inferencia import ARTEFACTO_MODELO, cargar_artefacto
+        return cargar_artefacto(ARTEFACTO_MODELO)[0], None
+    from inferencia import ARCHIVO_COMPARTIDO, cargar_binario
+    return cargar_binario(ARCHIVO_COMPARTIDO)[0], None
+
+
+# Proceso trabajador: mide, carga, predice y espera a los demás antes de medir otra vez
+def trabajador(modo, barrera, resultados):
+    import numpy as np
+    antes = memoria_proceso()
+    red, modelo = cargar_modelo(modo)
+    rng = np.random.default_rng(os.getpid())
+    for _ in range(200):
+        red.predecir_indices(rng.choice(len(red.capas[0][0]), size=5, replace=False))
+    barrera.wait()  # Todos los trabajadores tienen el modelo cargado al mismo tiempo
+    resultados.put((modo, os.getpid(), antes, memoria_proceso()))
+    barrera.wait()  # No terminar hasta que todos hayan medido
+
+
+def medir_modo(modo, trabajadores):
+    contexto = multiprocessing.get_context("spawn")  # Cada proceso arranca desde cero, como main.py
+    barrera = contexto.Barrier(trabajadores)
+    resultados = contexto.Queue()
+    procesos = [contexto.Process(target=trabajador, args=(modo, barrera, resultados))
+                for _ in range(trabajadores)]
+    for p in procesos:
+        p.start()
+    medidas = [resultados.get() for _ in procesos]
+    for p in procesos:
+        p.join()
+    return medidas
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Memoria por trabajador según la forma de cargar el modelo")
+    parser.add_argument("--trabajadores", type=int, default=4)
+    parser.add_argument("--modos", nargs="+", choices=MODOS, default=list(MODOS))
+    args = parser.parse_args()
+
+    print(f"{'modo':<9}{'pid':>8}{'RSS antes':>11}{'RSS después':>13}{'PSS después':>13}{'compartida':>12}")
+    for modo in args.modos:
+        medidas = medir_modo(modo, args.trabajadores)
+        for _, pid, antes, despues in medidas:
+            print(f"{modo:<9}{pid:>8}{antes['rss']:>11.1f}{despues['rss']:>13.1f}"
+                  f"{despues['pss']:>13.1f}{despues['compartida']:>12.1f}")
+        total = sum(despues["pss"] for _, _, _, despues in medidas)
+        aumento = sum(despues["rss"] - antes["rss"] for _, _, antes, despues in medidas) / len(medidas)
+        print(f"{modo:<9} total PSS: {total:.1f} MB  aumento medio de RSS al cargar: {aumento:.1f} MB\n")
@@ -0,0 +1,170 @@
+# ---------------------------------------------------------
+# benchmark_preprocesamiento.py - PREPROCESAMIENTO ANTERIOR VS UNIFICADO
+# ---------------------------------------------------------
+# Compara el preprocesamiento anterior de main.py (nltk.word_tokenize +
+# WordNetLemmatizer) con preprocesamiento.py (tokenizador regex, sin tildes
+# ni signos, tabla de lemas y caché). Cada uno usa el modelo entrenado con
+# su propio preprocesamiento:
+#   - mensajes por segundo del preprocesamiento + índice del vocabulario,
+#     sin caché (cada mensaje distinto) y con los mensajes repetidos;
+#   - exactitud sobre los patrones de intents.json;
+#   - coincidencia del intent elegido en los mensajes de las conversaciones.
+#
+# El modelo anterior es el que estaba en el repositorio antes de agregar
+# preprocesamiento.py (entrenado con NLTK). La primera vez se extrae con git
+# (chatbot_model.h5 y los .pkl de esa versión) y se guarda como
+# benedit_modelo_nltk.npz; para eso hacen falta git y Keras. Requiere además
+# los datos 'punkt_tab' y 'wordnet' de NLTK.
+#
+# Uso: python benchmark_preprocesamiento.py [--factor 20] [--anterior benedit_modelo_nltk.npz]
+# ---------------------------------------------------------
+
+import argparse
+import json
+import os
+import pickle
+import subprocess
+import sys
+import tempfile
+import time
+import numpy as np
+
+from arranque import verificar_datos_nltk
+from benchmark_replay import ampliar_corpus, cargar_corpus
+from inferencia import ARTEFACTO_MODELO, FUENTES_MODELO, RedDensaNumpy, cargar_artefacto, guardar_artefacto
+from preprocesamiento import Preprocesador
+from vocabulario import IndiceVocabulario
+
+
+ARTEFACTO_NLTK = "benedit_modelo_nltk.npz"
+
+
+def git(*argumentos):
+    return subprocess.run(["git", *argumentos], capture_output=True, check=True).stdout
+
+
+# Versión del repositorio anterior al preprocesamiento unificado: la que precede
+# al commit que agregó preprocesamiento.py (se busca en el historial, sin fijar un hash)
+def referencia_nltk():
+    agregado = git("log", "--diff-filter=A", "--format=%H", "--", "preprocesamiento.py").split()
+    if not agregado:
+        raise ValueError("preprocesamiento.py no aparece en el historial de git")
+    return agregado[-1].decode() + "^"
+
+
+# Arma el artefacto del modelo entrenado con NLTK a partir del .h5 y los .pkl de esa versión
+def extraer_modelo_nltk(destino, referencia=None):
+    from keras.models import load_model
+    referencia = referencia or referencia_nltk()
+    with tempfile.TemporaryDirectory() as carpeta:
+        rutas = {}
+        for nombre in FUENTES_MODELO:
+            rutas[nombre] = os.path.join(carpeta, nombre)
+            with open(rutas[nombre], "wb") as f:
+                f.write(git("show", f"{referencia}:{nombre}"))
+        red = RedDensaNumpy.desde_keras(load_model(rutas["chatbot_model.h5"], compile=False))
+        with open(rutas["words.pkl"], "rb") as f:
+            words = pickle.load(f)
+        with open(rutas["classes.pkl"], "rb") as f:
+            classes = pickle.load(f)
+    guardar_artefacto(destino, red, words, classes, fuentes=[])
+
+
+# Preprocesamiento anterior de ChatBot.clean_up_sentence
+class PreprocesamientoNltk:
+    def __init__(self, words):
+        import nltk
+        from nltk.stem import WordNetLemmatizer
+        if not verificar_datos_nltk(descargar=False):
+            sys.exit("❌ Faltan los datos del tokenizador de NLTK: no se puede medir el preprocesamiento anterior.")
+        self.tokenizar = nltk.word_tokenize
+        self.lemmatizer = WordNetLemmatizer()
+        try:
+            self.lemmatizer.lemmatize("clases")
+        except LookupError:
+            sys.exit("❌ Faltan los datos 'wordnet' de NLTK. Ejecuta: python -m nltk.downloader wordnet")
+        self.indice = IndiceVocabulario(words)
+
+    def indices(self, mensaje):
+        tokens = [self.lemmatizer.lemmatize(w) for w in self.tokenizar(mensaje.lower())]
+        return self.indice.indices(tokens)
+
+
+# Preprocesamiento unificado (el de main.py y training.py)
+class PreprocesamientoUnificado:
+    def __init__(self, words):
+        self.preprocesador = Preprocesador(words)
+        self.indice = IndiceVocabulario(words)
+
+    def indices(self, mensaje):
+        return self.indice.indices(self.preprocesador.procesar(mensaje))
+
+    def vaciar_caches(self):
+        self.preprocesador.procesar.cache_clear()
+        self.indice.buscar.cache_clear()
+
+
+# Mensajes por segundo de preprocesar + buscar en el vocabulario
+def medir(preprocesamiento, mensajes):
+    inicio = time.perf_counter()
+    for mensaje in mensajes:
+        preprocesamiento.indices(mensaje)
+    return len(mensajes) / (time.perf_counter() - inicio)
+
+
+# Intent (tag) elegido por el modelo para cada mensaje
+def clasificar(red, classes, preprocesamiento, mensajes):
+    elegidas = red.predecir_indices_lote([preprocesamiento.indices(m) for m in mensajes]).argmax(axis=1)
+    return np.array([classes[i] for i in elegidas])
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Preprocesamiento anterior vs unificado")
+    parser.add_argument("--factor", type=int, default=20, help="Multiplicador sintético del corpus")
+    parser.add_argument("--anterior", default=ARTEFACTO_NLTK, help="Artefacto del modelo entrenado con NLTK")
+    args = parser.parse_args()
+
+    if not os.path.exists(args.anterior):
+        print(f"⏳ Extrayendo el modelo entrenado con NLTK en '{args.anterior}'...")
+        try:
+            extraer_modelo_nltk(args.anterior)
+        except (OSError, ValueError, subprocess.CalledProcessError) as e:
+            sys.exit(f"❌ No se pudo extraer el modelo entrenado con NLTK del historial de git: {e}")
+    red_anterior, words_anterior, classes_anterior = cargar_artefacto(args.anterior)
+    red, words, classes = cargar_artefacto(ARTEFACTO_MODELO)
+    with open("intents.json", encoding="utf-8") as f:
+        intents = json.load(f)
+    patrones = [p for intent in intents["intents"] for p in intent["patterns"]]
+    tags = [intent["tag"] for intent in intents["intents"] for _ in intent["patterns"]]
+    corpus = cargar_corpus()
+    mensajes = ampliar_corpus(corpus, args.factor)
+
+    anterior = PreprocesamientoNltk(words_anterior)
+    unificado = PreprocesamientoUnificado(words)
+
+    # Rendimiento: todos los mensajes distintos (sin caché) y con repeticiones
+    distintos = list(dict.fromkeys(mensajes))
+    anterior.indice.buscar.cache_clear()
+    unificado.vaciar_caches()
+    mps_anterior = medir(anterior, distintos)
+    mps_unificado = medir(unificado, distintos)
+    mps_anterior_rep = medir(anterior, mensajes)
+    mps_unificado_rep = medir(unificado, mensajes)
+
+    print(f"Mensajes: {len(mensajes)} ({len(distintos)} distintos)")
+    print(f"{'':<12}{'msg/s distintos':>17}{'msg/s con repetidos':>21}")
+    print(f"{'anterior':<12}{mps_anterior:>17.0f}{mps_anterior_rep:>21.0f}")
+    print(f"{'unificado':<12}{mps_unificado:>17.0f}{mps_unificado_rep:>21.0f}"
+          f"   ({mps_unificado / mps_anterior:.1f}x / {mps_unificado_rep / mps_anterior_rep:.1f}x)")
+
+    # Exactitud de cada preprocesamiento con el modelo entrenado con él
+    tags = np.array(tags)
+    predichos_anterior = clasificar(red_anterior, classes_anterior, anterior, patrones)
+    predichos_unificado = clasificar(red, classes, unificado, patrones)
+    acierto_anterior = np.mean(predichos_anterior == tags)
+    acierto_unificado = np.mean(predichos_unificado == tags)
+    print(f"Mismo intent en los {len(patrones)} patrones: {np.mean(predichos_anterior == predichos_unificado):.4f}")
+    iguales = np.mean(clasificar(red_anterior, classes_anterior, anterior, corpus)
+                      == clasificar(red, classes, unificado, corpus))
+    print(f"Exactitud en patrones de intents.json: anterior {acierto_anterior:.4f}  unificado {acierto_unificado:.4f}")
+    print(f"Mismo intent en las {len(corpus)} conversaciones reales: {iguales:.4f}")
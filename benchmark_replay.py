@@ -0,0 +1,230 @@
+# ---------------------------------------------------------
+# benchmark_replay.py - REPRODUCCIÓN DE CONVERSACIONES REALES
+# ---------------------------------------------------------
+# Toma los mensajes de los estudiantes ('Usuario:') de los archivos
+# conversacion_*.txt / conversacion_*.jsonl, opcionalmente los amplía con
+# variantes sintéticas, y los pasa por SesionConversacion como en una
+# conversación real (atajo de palabras clave, predict_class con el contexto
+# del estudiante y respuesta), sin voz ni escritura de archivos. Reporta
+# p50/p95/p99 por etapa (los tramos de instrumentacion.py), los mensajes
+# resueltos por el atajo, mensajes por segundo y memoria máxima, y guarda
+# el resultado en JSON para comparar ejecuciones y detectar regresiones.
+#
+# Uso:
+#   python benchmark_replay.py --factor 20 --salida replay.json
+#   python benchmark_replay.py --comparar replay.json --tolerancia 0.10
+# ---------------------------------------------------------
+
+import argparse
+import glob
+import json
+import platform
+import random
+import resource
+import sys
+import time
+from datetime import datetime
+import numpy as np
+
+import instrumentacion
+from instrumentacion import Metricas
+from main import ChatBot
+from registro import leer_txt
+from sesion import CONVERSACION, SesionConversacion
+from voz import VozSilenciosa
+
+# Tramos de un turno de conversación ("turno" es el total)
+ETAPAS = ["preprocesamiento", "vocabulario", "inferencia", "respuesta", "turno"]
+
+
+# Métricas que además guardan cada medición (para percentiles exactos)
+class MetricasConMuestras(Metricas):
+    def __init__(self):
+        super().__init__()
+        self.muestras = {}
+
+    def observar(self, nombre, ms):
+        super().observar(nombre, ms)
+        with self.lock:
+            self.muestras.setdefault(nombre, []).append(ms)
+
+
+# Extrae los mensajes de los estudiantes de las transcripciones existentes
+def cargar_corpus(patron="conversacion_*"):
+    mensajes = []
+    for ruta in sorted(glob.glob(patron + ".txt")):
+        mensajes.extend(r["usuario"] for r in leer_txt(ruta) if r["tipo"] == "turno")
+    for ruta in sorted(glob.glob(patron + ".jsonl")):
+        with open(ruta, encoding="utf-8") as f:
+            for linea in f:
+                registro = json.loads(linea)
+                if registro.get("tipo") == "turno" and registro.get("origen") != "txt":
+                    mensajes.append(registro["usuario"])
+    return mensajes
+
+
+# Variante sintética de un mensaje: reordena, duplica u omite palabras
+# y a veces introduce un error de tipeo (como escribiría un estudiante con prisa)
+def variante(mensaje, rng):
+    palabras = mensaje.split()
+    if len(palabras) > 2 and rng.random() < 0.3:
+        palabras.pop(rng.randrange(len(palabras)))
+    if len(palabras) > 1 and rng.random() < 0.3:
+        i = rng.randrange(len(palabras) - 1)
+        palabras[i], palabras[i + 1] = palabras[i + 1], palabras[i]
+    if palabras and rng.random() < 0.3:
+        palabras.append(rng.choice(palabras))
+    if palabras and rng.random() < 0.4:
+        i = rng.randrange(len(palabras))
+        p = palabras[i]
+        if len(p) > 3:
+            j = rng.randrange(len(p) - 1)
+            palabras[i] = p[:j] + p[j + 1] + p[j] + p[j + 2:]
+    return " ".join(palabras)
+
+
+# Amplía el corpus: los mensajes originales más (factor - 1) variantes de cada uno
+def ampliar_corpus(mensajes, factor, semilla=0):
+    rng = random.Random(semilla)
+    ampliado = list(mensajes)
+    for _ in range(factor - 1):
+        ampliado.extend(variante(m, rng) for m in mensajes)
+    return ampliado
+
+
+# Sesión con un estudiante ya identificado, lista para conversar
+# (sin archivo de conversación ni índice de sesiones)
+def nueva_sesion(bot, voz):
+    sesion = SesionConversacion(bot.respuestas, bot.predict_class, voz, registrar=False)
+    sesion.iniciar()
+    for texto in ("hola", "Estudiante", "Primero", "A"):
+        sesion.procesar(texto)
+    return sesion
+
+
+# Pasa cada mensaje por una sesión de conversación y devuelve los tiempos (ms) por etapa,
+# la duración total de los turnos (s) y cuántos mensajes resolvió cada camino
+# (despedida, saludo, patrón del atajo o modelo)
+def reproducir(bot, mensajes, frio=False):
+    instrumentacion.ACTIVO = True
+    registro = instrumentacion.metricas = MetricasConMuestras()
+    voz = VozSilenciosa()
+    sesion = nueva_sesion(bot, voz)
+    duracion = 0.0
+
+    for mensaje in mensajes:
+        if frio:
+            bot.preprocesador.procesar.cache_clear()  # Sin aprovechar mensajes ni tokens ya vistos
+            bot.indice.buscar.cache_clear()
+
+        inicio = time.perf_counter()
+        sesion.procesar(mensaje)
+        duracion += time.perf_counter() - inicio
+
+        # Una despedida, un video o el menú post-video terminan la conversación libre:
+        # se cancela el video (no se abre el navegador) y se sigue con otra sesión
+        if sesion.estado != CONVERSACION or sesion.video_pendiente is not None:
+            sesion.cerrar()
+            sesion = nueva_sesion(bot, voz)
+
+    tiempos = {etapa: registro.muestras.get(etapa, []) for etapa in ETAPAS}
+    caminos = {dict(etiquetas)["resultado"]: n for (nombre, etiquetas), n in registro.contadores.items()
+               if nombre == "atajo_resultados"}
+    return tiempos, duracion, caminos
+
+
+# Resume los tiempos de cada etapa en percentiles (ms)
+def resumir(tiempos):
+    resumen = {}
+    for etapa, valores in tiempos.items():
+        if not valores:
+            continue  # Ningún mensaje pasó por esta etapa (por ejemplo, todos por el atajo)
+        valores = np.array(valores)
+        resumen[etapa] = {
+            "p50": float(np.percentile(valores, 50)),
+            "p95": float(np.percentile(valores, 95)),
+            "p99": float(np.percentile(valores, 99)),
+            "media": float(valores.mean()),
+        }
+    return resumen
+
+
+# Memoria máxima del proceso en MB (ru_maxrss está en KB en Linux y en bytes en macOS)
+def memoria_maxima_mb():
+    maxrss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return maxrss / (1024 * 1024) if sys.platform == "darwin" else maxrss / 1024
+
+
+# Compara con un resultado anterior: devuelve la lista de regresiones encontradas
+def comparar(actual, anterior, tolerancia):
+    regresiones = []
+    for etapa in ETAPAS:
+        if etapa not in anterior["etapas"] or etapa not in actual["etapas"]:
+            continue  # Etapa sin mediciones (o de una versión anterior del benchmark)
+        for metrica in ("p50", "p95", "p99"):
+            antes = anterior["etapas"][etapa][metrica]
+            ahora = actual["etapas"][etapa][metrica]
+            if antes > 0 and ahora > antes * (1 + tolerancia):
+                regresiones.append(f"{etapa}.{metrica}: {antes:.3f} ms -> {ahora:.3f} ms")
+    antes, ahora = anterior["mensajes_por_segundo"], actual["mensajes_por_segundo"]
+    if ahora < antes * (1 - tolerancia):
+        regresiones.append(f"mensajes_por_segundo: {antes:.1f} -> {ahora:.1f}")
+    return regresiones
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Benchmark de Benedit con conversaciones reales")
+    parser.add_argument("--factor", type=int, default=1, help="Multiplicador sintético del corpus")
+    parser.add_argument("--semilla", type=int, default=0)
+    parser.add_argument("--frio", action="store_true", help="Vaciar la caché de tokens antes de cada mensaje")
+    parser.add_argument("--salida", help="Archivo JSON donde guardar el resultado")
+    parser.add_argument("--comparar", help="Resultado JSON anterior con el que comparar")
+    parser.add_argument("--tolerancia", type=float, default=0.10, help="Empeoramiento permitido (0.10 = 10%%)")
+    args = parser.parse_args()
+
+    corpus = cargar_corpus()
+    mensajes = ampliar_corpus(corpus, args.factor, args.semilla)
+
+    inicio_carga = time.perf_counter()
+    bot = ChatBot(carga_diferida=False, voz=VozSilenciosa(), indice_sesiones=None)
+    carga_ms = (time.perf_counter() - inicio_carga) * 1000
+
+    tiempos, duracion, caminos = reproducir(bot, mensajes, args.frio)
+    resultado = {
+        "fecha": datetime.now().isoformat(timespec="seconds"),
+        "python": platform.python_version(),
+        "maquina": platform.machine(),
+        "mensajes": len(mensajes),
+        "mensajes_originales": len(corpus),
+        "factor": args.factor,
+        "frio": args.frio,
+        "carga_modelo_ms": carga_ms,
+        "mensajes_por_segundo": len(mensajes) / duracion,
+        "memoria_maxima_mb": memoria_maxima_mb(),
+        "caminos": caminos,
+        "etapas": resumir(tiempos),
+    }
+
+    print(f"Mensajes: {resultado['mensajes']} ({len(corpus)} originales x{args.factor})")
+    print(f"{'etapa':<18}{'p50 ms':>10}{'p95 ms':>10}{'p99 ms':>10}")
+    for etapa, r in resultado["etapas"].items():
+        print(f"{etapa:<18}{r['p50']:>10.3f}{r['p95']:>10.3f}{r['p99']:>10.3f}")
+    print("Caminos:          " + ", ".join(f"{camino}={n}" for camino, n in sorted(caminos.items())))
+    print(f"Mensajes/segundo: {resultado['mensajes_por_segundo']:.1f}")
+    print(f"Memoria máxima:   {resultado['memoria_maxima_mb']:.1f} MB")
+
+    if args.salida:
+        with open(args.salida, "w", encoding="utf-8") as f:
+            json.dump(resultado, f, ensure_ascii=False, indent=2)
+        print(f"✅ Resultado guardado en '{args.salida}'.")
+
+    if args.comparar:
+        with open(args.comparar, encoding="utf-8") as f:
+            anterior = json.load(f)
+        regresiones = comparar(resultado, anterior, args.tolerancia)
+        if regresiones:
+            print("❌ Regresiones respecto a", args.comparar)
+            for r in regresiones:
+                print("  ", r)
+            sys.exit(1)
+        print("✅ Sin regresiones respecto a", args.comparar)
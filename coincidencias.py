@@ -0,0 +1,130 @@
+# -------------------------------------------------------
+# Módulo: coincidencias.py
+# CHATBOT Benedit asistente emocional
+# Función: Atajo de palabras clave antes del modelo. Un autómata Aho-Corasick,
+# construido una sola vez con las listas de saludos y despedidas, encuentra
+# todas las palabras clave de un mensaje en una sola pasada; los patrones de
+# intents.json se buscan en un diccionario (deben ser todo el mensaje). Si el
+# mensaje es un saludo, una despedida o igual a un patrón conocido (sin contar
+# tildes ni signos), se responde sin llamar a la red neuronal.
+# -------------------------------------------------------
+
+from collections import deque  # Cola para construir los enlaces de falla
+
+from instrumentacion import contar      # Contadores de aciertos (BENEDIT_METRICAS=1)
+from preprocesamiento import normalizar  # Minúsculas, sin tildes ni signos
+
+
+# Autómata de Aho-Corasick: busca muchas palabras clave a la vez recorriendo el texto una vez
+class AutomataAhoCorasick:
+    def __init__(self):
+        self.transiciones = [{}]  # Estado -> {carácter: estado siguiente}
+        self.falla = [0]          # Estado -> estado al que se salta si no hay transición
+        self.salidas = [[]]       # Estado -> [(longitud, valor)] de las claves que terminan ahí
+        self.construido = False
+
+    # Agrega una palabra clave con el valor que se devolverá al encontrarla
+    def agregar(self, clave, valor):
+        estado = 0
+        for c in clave:
+            siguiente = self.transiciones[estado].get(c)
+            if siguiente is None:
+                siguiente = len(self.transiciones)
+                self.transiciones[estado][c] = siguiente
+                self.transiciones.append({})
+                self.falla.append(0)
+                self.salidas.append([])
+            estado = siguiente
+        self.salidas[estado].append((len(clave), valor))
+        self.construido = False
+
+    # Calcula los enlaces de falla por niveles (búsqueda en anchura)
+    def construir(self):
+        cola = deque(self.transiciones[0].values())
+        for estado in cola:
+            self.falla[estado] = 0
+        while cola:
+            estado = cola.popleft()
+            for c, siguiente in self.transiciones[estado].items():
+                cola.append(siguiente)
+                f = self.falla[estado]
+                while f and c not in self.transiciones[f]:
+                    f = self.falla[f]
+                destino = self.transiciones[f].get(c, 0)
+                self.falla[siguiente] = destino if destino != siguiente else 0
+                # Las claves que terminan en el estado de falla también terminan aquí
+                self.salidas[siguiente] = self.salidas[siguiente] + self.salidas[self.falla[siguiente]]
+        self.construido = True
+
+    # Devuelve (inicio, fin, valor) de cada clave encontrada en el texto
+    def buscar(self, texto):
+        if not self.construido:
+            self.construir()
+        transiciones, falla, salidas = self.transiciones, self.falla, self.salidas
+        encontradas = []
+        estado = 0
+        for i, c in enumerate(texto):
+            while estado and c not in transiciones[estado]:
+                estado = falla[estado]
+            estado = transiciones[estado].get(c, 0)
+            for longitud, valor in salidas[estado]:
+                encontradas.append((i + 1 - longitud, i + 1, valor))
+        return encontradas
+
+
+# Resultado de revisar un mensaje con el detector
+class Coincidencia:
+    __slots__ = ("categorias", "tag")
+
+    def __init__(self, categorias, tag):
+        self.categorias = categorias  # Categorías de palabras clave encontradas (saludo, despedida, ...)
+        self.tag = tag                # Tag del patrón de intents.json igual al mensaje (o None)
+
+
+# Detector de saludos, despedidas y patrones exactos en una sola pasada.
+# palabras: {categoría: [palabras clave]} (se buscan como palabras completas y con sus
+#   tildes: "qué tal" no coincide con "creo que tal vez")
+# intents: diccionario de intents.json (sus patrones deben coincidir con el mensaje completo,
+#   sin importar tildes)
+# completas: categorías cuyas palabras clave también deben ocupar todo el mensaje
+class DetectorRapido:
+    def __init__(self, palabras, intents=None, completas=()):
+        self.completas = set(completas)
+        self.palabras = AutomataAhoCorasick()
+        for categoria, lista in palabras.items():
+            for palabra in lista:
+                clave = normalizar(palabra, tildes=True)
+                if clave:
+                    self.palabras.agregar(clave, categoria)
+        self.palabras.construir()
+
+        # Un patrón repetido en dos tags distintos es ambiguo: lo decide el modelo
+        patrones = {}
+        for intent in (intents or {}).get("intents", []):
+            for patron in intent.get("patterns", []):
+                clave = normalizar(patron)
+                if clave:
+                    patrones.setdefault(clave, set()).add(intent["tag"])
+        # Patrón normalizado -> tag (el patrón debe ser todo el mensaje: basta un diccionario)
+        self.patrones = {clave: next(iter(tags)) for clave, tags in patrones.items() if len(tags) == 1}
+
+    # Revisa el mensaje y cuenta el resultado (la tasa de aciertos se ve en las métricas)
+    def revisar(self, mensaje):
+        # El texto normalizado solo tiene palabras separadas por un espacio:
+        # una coincidencia es una palabra completa si está entre espacios o en los extremos
+        texto = normalizar(mensaje, tildes=True)
+        categorias = set()
+        for inicio, fin, categoria in self.palabras.buscar(texto):
+            if (inicio > 0 and texto[inicio - 1] != " ") or (fin < len(texto) and texto[fin] != " "):
+                continue
+            if categoria in self.completas and (inicio > 0 or fin < len(texto)):
+                continue
+            categorias.add(categoria)
+
+        return Coincidencia(categorias, self.patrones.get(normalizar(mensaje)))
+
+
+# Cuenta una consulta al atajo y su resultado ("modelo" cuando no hubo acierto)
+def contar_atajo(resultado):
+    contar("atajo_consultas")
+    contar("atajo_resultados", resultado=resultado)
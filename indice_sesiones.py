@@ -0,0 +1,259 @@
+# -------------------------------------------------------
+# Módulo: indice_sesiones.py
+# CHATBOT Benedit asistente emocional
+# Función: Índice persistente (SQLite) de estudiantes, sesiones y turnos.
+# Cada estudiante se identifica por su nombre, semestre y paralelo normalizados
+# (sin mayúsculas, tildes ni signos: "Nivelación" y "nivelacion" son el mismo).
+# Se actualiza turno a turno durante la conversación y permite consultar
+# cuántos turnos y estudiantes hay por intent en un semestre/paralelo sin
+# volver a leer los archivos de conversación.
+#
+# Uso:
+#   python indice_sesiones.py --ingerir                 (una vez: .txt y .jsonl existentes)
+#   python indice_sesiones.py --semestre Segundo --paralelo B --tag ansiedad --dias 7
+# -------------------------------------------------------
+
+import glob        # Para encontrar los archivos de conversación
+import json        # Para leer los .jsonl
+import os          # Tamaño y fecha de los archivos ya ingeridos
+import sqlite3     # Base de datos del índice (incluida en Python)
+import threading   # El servidor escribe desde varios hilos
+import uuid        # Identificador propio de cada sesión
+from datetime import datetime, timedelta  # Para las consultas de los últimos días
+
+from preprocesamiento import normalizar  # Misma normalización que el resto de Benedit
+from registro import leer_txt, marca_tiempo  # Lectura de los .txt antiguos y formato de fecha
+
+RUTA_INDICE = "sesiones.db"
+
+# Versión del esquema (PRAGMA user_version). La 3 da a cada sesión su propio identificador
+# (antes dos sesiones del mismo estudiante en el mismo segundo se mezclaban) y los turnos
+# se identifican por (sesión, número): las sesiones y turnos anteriores se vuelven a ingerir.
+VERSION_ESQUEMA = 3
+
+ESQUEMA = """
+CREATE TABLE IF NOT EXISTS estudiantes (
+    identidad TEXT PRIMARY KEY,
+    nombre TEXT, semestre TEXT, paralelo TEXT,   -- Como los escribió la primera vez
+    semestre_norm TEXT, paralelo_norm TEXT
+);
+CREATE TABLE IF NOT EXISTS sesiones (
+    id TEXT PRIMARY KEY, identidad TEXT, ts TEXT
+);
+CREATE TABLE IF NOT EXISTS turnos (
+    sesion TEXT, numero INTEGER, identidad TEXT, ts TEXT, tag TEXT,
+    PRIMARY KEY (sesion, numero)
+);
+CREATE TABLE IF NOT EXISTS conteos (
+    identidad TEXT, tag TEXT, n INTEGER,
+    PRIMARY KEY (identidad, tag)
+);
+CREATE TABLE IF NOT EXISTS archivos (
+    ruta TEXT PRIMARY KEY, tamano INTEGER, mtime REAL
+);
+CREATE INDEX IF NOT EXISTS turnos_por_tag ON turnos (tag, ts);
+CREATE INDEX IF NOT EXISTS sesiones_por_identidad ON sesiones (identidad);
+CREATE INDEX IF NOT EXISTS estudiantes_por_cohorte ON estudiantes (semestre_norm, paralelo_norm);
+"""
+
+
+# Identidad del estudiante: "nombre|semestre|paralelo" normalizados
+def identidad_normalizada(nombre, semestre, paralelo):
+    return "|".join(normalizar(parte or "") for parte in (nombre, semestre, paralelo))
+
+
+# Índice de sesiones compartido por todas las sesiones de un proceso
+class IndiceSesiones:
+    def __init__(self, ruta=RUTA_INDICE):
+        self.ruta = ruta
+        self.lock = threading.Lock()
+        self.conexion = sqlite3.connect(ruta, check_same_thread=False)
+        self.conexion.execute("PRAGMA journal_mode=WAL")     # Lecturas sin bloquear a quien escribe
+        self.conexion.execute("PRAGMA synchronous=NORMAL")   # Sin fsync en cada turno
+        self._migrar()
+        self.conexion.executescript(ESQUEMA)
+
+    # Actualiza un índice creado con un esquema anterior (antes de crear las tablas nuevas)
+    def _migrar(self):
+        version = self.conexion.execute("PRAGMA user_version").fetchone()[0]
+        if version >= VERSION_ESQUEMA:
+            return
+        # Las sesiones y turnos anteriores no tenían identificador propio: se reconstruyen
+        # desde los archivos de conversación (python indice_sesiones.py --ingerir)
+        anterior = self.conexion.execute(
+            "SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'sesiones'").fetchone()
+        if anterior is not None and self.conexion.execute("SELECT 1 FROM sesiones LIMIT 1").fetchone() is not None:
+            print("⚠️ Índice de sesiones de una versión anterior: vuelve a ejecutar python indice_sesiones.py --ingerir")
+        self.conexion.executescript("DROP TABLE IF EXISTS sesiones; DROP TABLE IF EXISTS turnos; "
+                                    "DROP TABLE IF EXISTS conteos; DROP TABLE IF EXISTS archivos;")
+        self.conexion.execute(f"PRAGMA user_version = {VERSION_ESQUEMA}")
+        self.conexion.commit()
+
+    # Indica si el estudiante ya tiene alguna sesión en el índice
+    def conocido(self, nombre, semestre, paralelo):
+        identidad = identidad_normalizada(nombre, semestre, paralelo)
+        with self.lock:
+            fila = self.conexion.execute(
+                "SELECT 1 FROM sesiones WHERE identidad = ? LIMIT 1", (identidad,)).fetchone()
+        return fila is not None
+
+    # Registra el inicio de una sesión (y al estudiante si es nuevo) y devuelve su identificador.
+    # sesion: identificador ya conocido (el del .jsonl al ingerir); si no se indica, uno nuevo.
+    def registrar_sesion(self, nombre, semestre, paralelo, ts=None, sesion=None, confirmar=True):
+        identidad = identidad_normalizada(nombre, semestre, paralelo)
+        sesion = sesion or uuid.uuid4().hex
+        with self.lock:
+            self.conexion.execute(
+                "INSERT OR IGNORE INTO estudiantes VALUES (?, ?, ?, ?, ?, ?)",
+                (identidad, nombre, semestre, paralelo, normalizar(semestre), normalizar(paralelo)))
+            self.conexion.execute("INSERT OR IGNORE INTO sesiones VALUES (?, ?, ?)",
+                                  (sesion, identidad, ts or marca_tiempo()))
+            if confirmar:
+                self.conexion.commit()
+        return sesion
+
+    # Registra un turno con su intent. numero: posición del turno en su sesión (0, 1, ...).
+    # Un turno ya indexado (misma sesión y número) no se vuelve a contar, así ingerir
+    # un archivo dos veces no duplica nada.
+    def registrar_turno(self, sesion, tag, ts=None, numero=0, confirmar=True):
+        with self.lock:
+            nuevo = self.conexion.execute(
+                "INSERT OR IGNORE INTO turnos SELECT id, ?, identidad, ?, ? FROM sesiones WHERE id = ?",
+                (numero, ts or marca_tiempo(), tag, sesion)).rowcount
+            if nuevo and tag:
+                self.conexion.execute(
+                    "INSERT INTO conteos SELECT identidad, ?, 1 FROM sesiones WHERE id = ? "
+                    "ON CONFLICT (identidad, tag) DO UPDATE SET n = n + 1", (tag, sesion))
+            if confirmar:
+                self.conexion.commit()
+        return bool(nuevo)
+
+    # --- Ingesta de los archivos existentes ---
+
+    # Registros de un archivo de conversación, uno a uno (.jsonl línea por línea)
+    @staticmethod
+    def _leer_registros(ruta):
+        if ruta.endswith(".txt"):
+            yield from leer_txt(ruta)
+            return
+        with open(ruta, encoding="utf-8") as f:
+            for linea in f:
+                if linea.strip():
+                    yield json.loads(linea)
+
+    # Agrega al índice los archivos que cambiaron desde la última ingesta.
+    # clasificar: función mensaje -> tag para los turnos sin tag (los de los .txt antiguos)
+    def ingerir(self, patron="conversacion_*", clasificar=None):
+        rutas = sorted(glob.glob(patron + ".txt")) + sorted(glob.glob(patron + ".jsonl"))
+        resumen = {"archivos": 0, "turnos": 0}
+        for ruta in rutas:
+            estado = os.stat(ruta)
+            with self.lock:
+                fila = self.conexion.execute(
+                    "SELECT tamano, mtime FROM archivos WHERE ruta = ?", (ruta,)).fetchone()
+            if fila == (estado.st_size, estado.st_mtime):
+                continue  # Sin cambios desde la última ingesta
+
+            sesion = None
+            numero = 0        # Número de turno dentro de la sesión
+            posiciones = {}   # Sesiones sin identificador vistas hasta ahora, por archivo de origen
+            for registro in self._leer_registros(ruta):
+                if registro.get("tipo") == "inicio":
+                    sesion = registro.get("sesion")
+                    if sesion is None:
+                        # Registros sin identificador (.txt y .jsonl anteriores): la sesión se
+                        # identifica por su archivo y su posición en él. Lo convertido desde un .txt
+                        # usa el nombre del .txt, así el .txt y su .jsonl no se cuentan dos veces.
+                        origen = os.path.splitext(ruta)[0] + ".txt" if registro.get("origen") == "txt" else ruta
+                        posiciones[origen] = posiciones.get(origen, -1) + 1
+                        sesion = f"{os.path.abspath(origen)}#{posiciones[origen]}"
+                    self.registrar_sesion(registro["nombre"], registro["semestre"], registro["paralelo"],
+                                          registro.get("ts"), sesion, confirmar=False)
+                    numero = 0
+                elif registro.get("tipo") == "turno" and sesion is not None:
+                    tag = registro.get("tag")
+                    if tag is None and clasificar is not None:
+                        tag = clasificar(registro["usuario"])
+                    if self.registrar_turno(sesion, tag, registro.get("ts"), numero, confirmar=False):
+                        resumen["turnos"] += 1
+                    numero += 1
+
+            with self.lock:
+                self.conexion.execute("INSERT OR REPLACE INTO archivos VALUES (?, ?, ?)",
+                                      (ruta, estado.st_size, estado.st_mtime))
+                self.conexion.commit()
+            resumen["archivos"] += 1
+        return resumen
+
+    # --- Consultas por cohorte ---
+
+    # Turnos y estudiantes por intent en un semestre/paralelo (None = todos),
+    # opcionalmente desde/hasta una fecha ("AAAA-MM-DD HH:MM:SS").
+    # Devuelve [(tag, turnos, estudiantes)] ordenado de más a menos turnos.
+    def consultar_cohorte(self, semestre=None, paralelo=None, tag=None, desde=None, hasta=None):
+        condiciones, parametros = ["t.tag IS NOT NULL"], []
+        for columna, valor in (("e.semestre_norm", semestre), ("e.paralelo_norm", paralelo)):
+            if valor is not None:
+                condiciones.append(f"{columna} = ?")
+                parametros.append(normalizar(valor))
+        if tag is not None:
+            condiciones.append("t.tag = ?")
+            parametros.append(tag)
+
+        if desde is None and hasta is None:
+            # Sin rango de fechas basta con los conteos acumulados por estudiante
+            consulta = ("SELECT t.tag, SUM(t.n), COUNT(DISTINCT t.identidad) FROM conteos t "
+                        "JOIN estudiantes e ON e.identidad = t.identidad")
+        else:
+            if desde is not None:
+                condiciones.append("t.ts >= ?")
+                parametros.append(desde)
+            if hasta is not None:
+                condiciones.append("t.ts < ?")
+                parametros.append(hasta)
+            consulta = ("SELECT t.tag, COUNT(*), COUNT(DISTINCT t.identidad) FROM turnos t "
+                        "JOIN estudiantes e ON e.identidad = t.identidad")
+
+        consulta += " WHERE " + " AND ".join(condiciones) + " GROUP BY t.tag ORDER BY 2 DESC"
+        with self.lock:
+            return self.conexion.execute(consulta, parametros).fetchall()
+
+    def cerrar(self):
+        with self.lock:
+            self.conexion.commit()
+            self.conexion.close()
+
+
+# --- Punto de entrada: ingesta y consultas desde la consola ---
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Índice de sesiones de Benedit")
+    parser.add_argument("--ingerir", action="store_true", help="Agrega los archivos conversacion_* nuevos o modificados")
+    parser.add_argument("--semestre")
+    parser.add_argument("--paralelo")
+    parser.add_argument("--tag")
+    parser.add_argument("--dias", type=int, help="Solo los últimos N días")
+    args = parser.parse_args()
+
+    indice = IndiceSesiones()
+    if args.ingerir:
+        # Los turnos de los .txt antiguos no tienen intent: se clasifican con el modelo
+        from main import ChatBot
+        from voz import Voz
+        bot = ChatBot(carga_diferida=False, voz=Voz(solo_texto=True), indice_sesiones=None)
+
+        def clasificar(mensaje):
+            ints = bot.predict_class(mensaje)
+            return ints[0]["intent"] if ints else None
+
+        resumen = indice.ingerir(clasificar=clasificar)
+        print(f"✅ {resumen['archivos']} archivos ingeridos ({resumen['turnos']} turnos nuevos)")
+
+    desde = None
+    if args.dias:
+        desde = (datetime.now() - timedelta(days=args.dias)).strftime('%Y-%m-%d %H:%M:%S')
+    print(f"{'intent':<20}{'turnos':>8}{'estudiantes':>13}")
+    for tag, turnos, estudiantes in indice.consultar_cohorte(args.semestre, args.paralelo, args.tag, desde):
+        print(f"{tag:<20}{turnos:>8}{estudiantes:>13}")
+    indice.cerrar()
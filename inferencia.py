@@ -0,0 +1,328 @@
+# -------------------------------------------------------
+# Módulo: inferencia.py
+# CHATBOT Benedit asistente emocional
+# Función: Ejecuta la red neuronal entrenada (chatbot_model.h5) con NumPy puro,
+# sin el costo fijo de llamar a model.predict() en cada mensaje
+# -------------------------------------------------------
+
+import os           # Para comprobar si el artefacto ligero está al día
+import hashlib      # Para la huella de los archivos de origen del artefacto
+import json         # Para la cabecera del archivo binario compartido
+import numpy as np  # Para las multiplicaciones de matrices de la red
+
+
+# Funciones de activación que usa la red de Benedit (Dense relu/relu/softmax)
+def relu(x):
+    return np.maximum(x, 0)
+
+def softmax(x):
+    x = x - x.max(axis=-1, keepdims=True)  # Estabilidad numérica
+    e = np.exp(x)
+    return e / e.sum(axis=-1, keepdims=True)
+
+def lineal(x):
+    return x
+
+ACTIVACIONES = {"relu": relu, "softmax": softmax, "linear": lineal}
+
+
+# Formatos de pesos: float32 (original), float16 (mitad de memoria) e int8
+# (un cuarto de memoria, con una escala por neurona de salida)
+FORMATOS_PESOS = ("float32", "float16", "int8")
+
+
+# Convierte una matriz de pesos al formato indicado; devuelve (pesos, escalas o None)
+def cuantizar_pesos(pesos, formato):
+    pesos = np.asarray(pesos, dtype=np.float32)
+    if formato == "float32":
+        return pesos, None
+    if formato == "float16":
+        return pesos.astype(np.float16), None
+    if formato == "int8":
+        # Cuantización simétrica por columna: w ≈ q * escala, con q en [-127, 127]
+        escalas = np.abs(pesos).max(axis=0) / 127
+        escalas[escalas == 0] = 1
+        q = np.clip(np.rint(pesos / escalas), -127, 127).astype(np.int8)
+        return q, escalas.astype(np.float32)
+    raise ValueError(f"Formato de pesos no soportado: {formato}")
+
+
+# Clase que guarda los pesos de las capas densas y calcula la salida de la red
+class RedDensaNumpy:
+    # capas: lista de tuplas (pesos, sesgos, nombre_activacion) en float32
+    # formato: float32, float16 o int8 (los pesos se convierten al crear la red)
+    # escalas: si se indican, los pesos de 'capas' ya están en 'formato' (al cargar un artefacto)
+    def __init__(self, capas, formato="float32", escalas=None):
+        if formato not in FORMATOS_PESOS:
+            raise ValueError(f"Formato de pesos no soportado: {formato}")
+        self.formato = formato
+        self.capas = []
+        self.escalas = []
+        for i, (pesos, sesgos, activacion) in enumerate(capas):
+            if activacion not in ACTIVACIONES:
+                raise ValueError(f"Activación no soportada: {activacion}")
+            if escalas is None:
+                pesos, escala = cuantizar_pesos(pesos, formato)
+            else:
+                pesos, escala = np.asarray(pesos), escalas[i]
+            self.capas.append((pesos, np.asarray(sesgos, dtype=np.float32), activacion))
+            self.escalas.append(escala)
+
+
+    # Extrae los pesos de un modelo Keras ya cargado (las capas Dropout no se usan al predecir)
+    @classmethod
+    def desde_keras(cls, model, formato="float32"):
+        capas = []
+        for capa in model.layers:
+            if not capa.get_weights():
+                continue  # Dropout y otras capas sin pesos
+            pesos, sesgos = capa.get_weights()
+            capas.append((pesos, sesgos, capa.activation.__name__))
+        return cls(capas, formato)
+
+
+    # Copia de la red con los pesos en otro formato
+    def convertir(self, formato):
+        capas = [(self.pesos_float32(i), sesgos, activacion)
+                 for i, (_, sesgos, activacion) in enumerate(self.capas)]
+        return RedDensaNumpy(capas, formato)
+
+
+    # Pesos de una capa en float32 (deshace la cuantización)
+    def pesos_float32(self, i):
+        pesos, escala = self.capas[i][0].astype(np.float32), self.escalas[i]
+        return pesos if escala is None else pesos * escala
+
+
+    # Memoria ocupada por los pesos y sesgos, en bytes
+    def bytes_pesos(self):
+        total = sum(pesos.nbytes + sesgos.nbytes for pesos, sesgos, _ in self.capas)
+        return total + sum(e.nbytes for e in self.escalas if e is not None)
+
+
+    # Aplica una capa a la suma ya calculada de entradas * pesos
+    def _activar(self, i, z):
+        _, sesgos, activacion = self.capas[i]
+        if self.escalas[i] is not None:
+            z = z * self.escalas[i]
+        return ACTIVACIONES[activacion](z + sesgos)
+
+
+    # Capas a partir de la segunda (entradas densas, pocas neuronas)
+    def _propagar(self, salida, desde=1):
+        for i in range(desde, len(self.capas)):
+            salida = self._activar(i, salida @ self.capas[i][0])
+        return salida
+
+
+    # Calcula las probabilidades para una matriz de entradas (una fila por oración)
+    def predecir(self, x):
+        salida = np.asarray(x, dtype=np.float32)
+        return self._propagar(salida, desde=0)
+
+
+    # Probabilidades a partir de los índices activos de la bolsa de palabras.
+    # La bolsa es 0/1 y casi toda ceros, así que la primera capa se calcula sumando
+    # solo las filas de pesos de las palabras presentes (en vez de multiplicar toda la matriz).
+    def predecir_indices(self, indices):
+        pesos = self.capas[0][0]
+        if len(indices):
+            z = pesos[indices].sum(axis=0, dtype=np.float32)
+        else:
+            z = np.zeros(pesos.shape[1], dtype=np.float32)
+        return self._propagar(self._activar(0, z))
+
+
+    # Igual que predecir_indices para varias oraciones (una lista de índices por oración)
+    def predecir_indices_lote(self, lista_indices):
+        pesos = self.capas[0][0]
+        z = np.zeros((len(lista_indices), pesos.shape[1]), dtype=np.float32)
+        for fila, indices in enumerate(lista_indices):
+            if len(indices):
+                z[fila] = pesos[indices].sum(axis=0, dtype=np.float32)
+        return self._propagar(self._activar(0, z))
+
+
+# --- Artefacto ligero: pesos + vocabulario + clases en un solo archivo .npz ---
+# Permite arrancar sin importar Keras/TensorFlow ni abrir el .h5 y los dos .pkl
+
+ARTEFACTO_MODELO = "benedit_modelo.npz"
+
+
+FUENTES_MODELO = ("chatbot_model.h5", "words.pkl", "classes.pkl")
+
+
+# Huella (SHA-256) del contenido de los archivos de los que se genera el artefacto
+def huella_fuentes(fuentes=FUENTES_MODELO):
+    sha = hashlib.sha256()
+    for ruta in fuentes:
+        if os.path.exists(ruta):
+            with open(ruta, "rb") as f:
+                sha.update(f.read())
+    return sha.hexdigest()
+
+
+# Guarda la red, el vocabulario y las clases en un único archivo .npz
+def guardar_artefacto(ruta, red, words, classes, fuentes=FUENTES_MODELO):
+    arrays = {
+        "words": np.array(words, dtype=str),
+        "classes": np.array(classes, dtype=str),
+        "activaciones": np.array([activacion for _, _, activacion in red.capas], dtype=str),
+        "huella": np.array(huella_fuentes(fuentes)),
+        "formato": np.array(red.formato),
+    }
+    for i, (pesos, sesgos, _) in enumerate(red.capas):
+        arrays[f"pesos_{i}"] = pesos
+        arrays[f"sesgos_{i}"] = sesgos
+        if red.escalas[i] is not None:
+            arrays[f"escalas_{i}"] = red.escalas[i]
+    with open(ruta, "wb") as f:
+        np.savez(f, **arrays)
+
+
+# Carga el artefacto .npz y devuelve (red, words, classes)
+def cargar_artefacto(ruta):
+    with np.load(ruta, allow_pickle=False) as datos:
+        activaciones = [str(a) for a in datos["activaciones"]]
+        capas = [
+            (datos[f"pesos_{i}"], datos[f"sesgos_{i}"], activacion)
+            for i, activacion in enumerate(activaciones)
+        ]
+        # Los artefactos anteriores no guardan el formato: son float32
+        formato = str(datos["formato"]) if "formato" in datos.files else "float32"
+        escalas = [datos[f"escalas_{i}"] if f"escalas_{i}" in datos.files else None
+                   for i in range(len(capas))]
+        words = [str(w) for w in datos["words"]]
+        classes = [str(c) for c in datos["classes"]]
+    return RedDensaNumpy(capas, formato, escalas), words, classes
+
+
+# Indica si el artefacto existe y corresponde al .h5 y los .pkl actuales
+# (si se reentrena el modelo, la huella cambia y se vuelve a usar el .h5)
+def artefacto_vigente(ruta, fuentes=FUENTES_MODELO):
+    if not os.path.exists(ruta):
+        return False
+    with np.load(ruta, allow_pickle=False) as datos:
+        return "huella" in datos.files and str(datos["huella"]) == huella_fuentes(fuentes)
+
+
+# --- Archivo binario compartido: pesos + vocabulario + clases en un solo archivo plano ---
+# Cada proceso lo abre con np.memmap (solo lectura), así todos los procesos de Benedit
+# comparten las mismas páginas de memoria física en lugar de tener su propia copia.
+#
+# Estructura: MAGIA (8 bytes) + largo de la cabecera (uint64) + cabecera JSON
+# (vocabulario, clases, formato, huella y posición de cada arreglo) + arreglos
+# alineados a 64 bytes.
+
+ARCHIVO_COMPARTIDO = "benedit_modelo.bin"
+MAGIA_BINARIO = b"BENEDIT1"
+ALINEACION = 64
+
+
+def _alinear(n):
+    return -(-n // ALINEACION) * ALINEACION
+
+
+# Guarda la red, el vocabulario y las clases en el archivo binario plano
+def guardar_binario(ruta, red, words, classes, fuentes=FUENTES_MODELO):
+    arreglos = []
+    for i, (pesos, sesgos, _) in enumerate(red.capas):
+        arreglos += [(f"pesos_{i}", pesos), (f"sesgos_{i}", sesgos)]
+        if red.escalas[i] is not None:
+            arreglos.append((f"escalas_{i}", red.escalas[i]))
+
+    cabecera = {
+        "words": list(words),
+        "classes": list(classes),
+        "activaciones": [activacion for _, _, activacion in red.capas],
+        "formato": red.formato,
+        "huella": huella_fuentes(fuentes),
+        "arreglos": {},
+    }
+    # La posición de los arreglos depende del largo de la cabecera: se calcula hasta que no cambie
+    inicio_datos = 0
+    while True:
+        posicion = inicio_datos
+        for nombre, arreglo in arreglos:
+            cabecera["arreglos"][nombre] = {"offset": posicion, "dtype": arreglo.dtype.str,
+                                            "shape": list(arreglo.shape)}
+            posicion = _alinear(posicion + arreglo.nbytes)
+        texto = json.dumps(cabecera, ensure_ascii=False).encode("utf-8")
+        necesario = _alinear(len(MAGIA_BINARIO) + 8 + len(texto))
+        if necesario == inicio_datos:
+            break
+        inicio_datos = necesario
+
+    temporal = ruta + ".tmp"
+    with open(temporal, "wb") as f:
+        f.write(MAGIA_BINARIO + np.uint64(len(texto)).tobytes() + texto)
+        for nombre, arreglo in arreglos:
+            f.seek(cabecera["arreglos"][nombre]["offset"])
+            f.write(np.ascontiguousarray(arreglo).tobytes())
+        f.truncate(posicion)
+    os.replace(temporal, ruta)  # Los procesos que ya lo tienen abierto conservan la versión anterior
+
+
+# Lee la cabecera JSON del archivo binario
+def leer_cabecera_binario(ruta):
+    with open(ruta, "rb") as f:
+        if f.read(len(MAGIA_BINARIO)) != MAGIA_BINARIO:
+            raise ValueError(f"'{ruta}' no es un archivo de modelo de Benedit")
+        largo = int(np.frombuffer(f.read(8), dtype=np.uint64)[0])
+        return json.loads(f.read(largo).decode("utf-8"))
+
+
+# Abre el archivo binario sin copiar los pesos y devuelve (red, words, classes)
+def cargar_binario(ruta):
+    cabecera = leer_cabecera_binario(ruta)
+    mapa = np.memmap(ruta, dtype=np.uint8, mode="r")
+
+    def arreglo(nombre):
+        info = cabecera["arreglos"].get(nombre)
+        if info is None:
+            return None
+        dtype = np.dtype(info["dtype"])
+        cantidad = int(np.prod(info["shape"]))
+        return np.frombuffer(mapa, dtype=dtype, count=cantidad,
+                             offset=info["offset"]).reshape(info["shape"])
+
+    capas = [
+        (arreglo(f"pesos_{i}"), arreglo(f"sesgos_{i}"), activacion)
+        for i, activacion in enumerate(cabecera["activaciones"])
+    ]
+    escalas = [arreglo(f"escalas_{i}") for i in range(len(capas))]
+    return RedDensaNumpy(capas, cabecera["formato"], escalas), cabecera["words"], cabecera["classes"]
+
+
+# Indica si el archivo binario existe y corresponde al .h5 y los .pkl actuales
+def binario_vigente(ruta, fuentes=FUENTES_MODELO):
+    if not os.path.exists(ruta):
+        return False
+    try:
+        return leer_cabecera_binario(ruta).get("huella") == huella_fuentes(fuentes)
+    except (OSError, ValueError):
+        return False
+
+
+# --- Punto de entrada: exporta el artefacto a partir del .h5 y los .pkl ---
+# Uso: python inferencia.py [--formato float32|float16|int8]
+if __name__ == "__main__":
+    import argparse
+    import pickle
+    from keras.models import load_model
+
+    parser = argparse.ArgumentParser(description="Exporta el artefacto ligero de Benedit")
+    parser.add_argument("--formato", choices=FORMATOS_PESOS, default="float32",
+                        help="Formato de los pesos (ver benchmark_inferencia.py para la diferencia de exactitud)")
+    parser.add_argument("--binario", action="store_true",
+                        help=f"Guarda también '{ARCHIVO_COMPARTIDO}' (memoria compartida entre procesos)")
+    args = parser.parse_args()
+
+    red = RedDensaNumpy.desde_keras(load_model("chatbot_model.h5"), args.formato)
+    words = pickle.load(open("words.pkl", "rb"))
+    classes = pickle.load(open("classes.pkl", "rb"))
+    guardar_artefacto(ARTEFACTO_MODELO, red, words, classes)
+    print(f"✅ Artefacto ligero guardado como '{ARTEFACTO_MODELO}' ({args.formato}, {red.bytes_pesos() / 1024:.0f} KB de pesos).")
+    if args.binario:
+        guardar_binario(ARCHIVO_COMPARTIDO, red, words, classes)
+        print(f"✅ Archivo compartido guardado como '{ARCHIVO_COMPARTIDO}'.")
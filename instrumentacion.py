@@ -0,0 +1,292 @@
+# -------------------------------------------------------
+# Módulo: instrumentacion.py
+# CHATBOT Benedit asistente emocional
+# Función: Mide cuánto tarda cada etapa de un turno (preprocesamiento,
+# vocabulario, inferencia, voz, registro) con tramos con nombre, contadores e
+# histogramas. Está apagado por defecto; se activa con variables de entorno:
+#
+#   BENEDIT_METRICAS=1                   Activa las métricas
+#   BENEDIT_METRICAS_ARCHIVO=ruta.prom   Archivo en formato Prometheus (por defecto metricas_benedit.prom)
+#   BENEDIT_METRICAS_INTERVALO=30        Segundos entre escrituras del archivo
+#   BENEDIT_PERFIL_TURNOS=5              Guarda el perfil de los 5 turnos más lentos
+#   BENEDIT_PERFILADOR=pyinstrument      Usa pyinstrument en lugar de cProfile (si está instalado)
+# -------------------------------------------------------
+
+import atexit      # Para exportar las métricas al salir
+import bisect      # Para ubicar cada medición en su rango del histograma
+import cProfile    # Perfilador estándar de Python
+import heapq       # Para conservar solo los N turnos más lentos
+import io          # Para el texto de los perfiles
+import os          # Variables de entorno y carpetas de salida
+import pstats      # Para resumir los perfiles de cProfile
+import threading   # Exportador periódico y acceso concurrente a las métricas
+import time        # Para medir la duración de cada tramo
+
+
+def _entorno_activo(variable):
+    return os.environ.get(variable, "") not in ("", "0", "false", "no")
+
+
+ACTIVO = _entorno_activo("BENEDIT_METRICAS")
+
+# Límites de los rangos de los histogramas, en milisegundos
+LIMITES_MS = (0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 25, 50, 100, 250, 500, 1000, 2500, 5000)
+
+
+# Contexto vacío para cuando las métricas están apagadas (casi sin costo)
+class _TramoNulo:
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+_NULO = _TramoNulo()
+
+
+# Histograma acumulado de duraciones (ms)
+class Histograma:
+    def __init__(self, limites=LIMITES_MS):
+        self.limites = limites
+        self.conteos = [0] * (len(limites) + 1)  # El último rango es +Inf
+        self.suma = 0.0
+        self.total = 0
+        self.maximo = 0.0
+
+    def observar(self, valor):
+        self.conteos[bisect.bisect_left(self.limites, valor)] += 1
+        self.suma += valor
+        self.total += 1
+        self.maximo = max(self.maximo, valor)
+
+    # Percentil aproximado: límite superior del rango donde cae
+    def percentil(self, p):
+        if not self.total:
+            return 0.0
+        objetivo = p / 100 * self.total
+        acumulado = 0
+        for limite, conteo in zip(self.limites + (self.maximo,), self.conteos):
+            acumulado += conteo
+            if acumulado >= objetivo:
+                return min(limite, self.maximo)
+        return self.maximo
+
+
+# Tramo con nombre: mide el bloque 'with' y lo guarda en el histograma de la etapa
+class _Tramo:
+    __slots__ = ("metricas", "nombre", "inicio")
+
+    def __init__(self, metricas, nombre):
+        self.metricas = metricas
+        self.nombre = nombre
+
+    def __enter__(self):
+        self.inicio = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc):
+        self.metricas.observar(self.nombre, (time.perf_counter() - self.inicio) * 1000)
+        return False
+
+
+# Registro central de contadores e histogramas
+class Metricas:
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.contadores = {}   # (nombre, etiquetas) -> valor
+        self.histogramas = {}  # nombre -> Histograma
+
+    def tramo(self, nombre):
+        return _Tramo(self, nombre)
+
+    def observar(self, nombre, ms):
+        with self.lock:
+            histograma = self.histogramas.get(nombre)
+            if histograma is None:
+                histograma = self.histogramas[nombre] = Histograma()
+            histograma.observar(ms)
+
+    def contar(self, nombre, n=1, **etiquetas):
+        clave = (nombre, tuple(sorted(etiquetas.items())))
+        with self.lock:
+            self.contadores[clave] = self.contadores.get(clave, 0) + n
+
+    # Texto en formato de exposición de Prometheus
+    def exportar_prometheus(self):
+        lineas = []
+        with self.lock:
+            anterior = None
+            for (nombre, etiquetas), valor in sorted(self.contadores.items()):
+                if nombre != anterior:  # Una línea TYPE por contador, antes de todas sus etiquetas
+                    lineas.append(f"# TYPE benedit_{nombre}_total counter")
+                    anterior = nombre
+                texto = ",".join(f'{k}="{v}"' for k, v in etiquetas)
+                lineas.append(f"benedit_{nombre}_total{{{texto}}} {valor}" if texto else f"benedit_{nombre}_total {valor}")
+            for nombre, h in sorted(self.histogramas.items()):
+                metrica = f"benedit_{nombre}_ms"
+                lineas.append(f"# TYPE {metrica} histogram")
+                acumulado = 0
+                for limite, conteo in zip(h.limites, h.conteos):
+                    acumulado += conteo
+                    lineas.append(f'{metrica}_bucket{{le="{limite}"}} {acumulado}')
+                lineas.append(f'{metrica}_bucket{{le="+Inf"}} {h.total}')
+                lineas.append(f"{metrica}_sum {h.suma:.6f}")
+                lineas.append(f"{metrica}_count {h.total}")
+        return "\n".join(lineas) + "\n"
+
+    # Resumen legible para la consola
+    def resumen(self):
+        lineas = ["📊 Métricas de Benedit:"]
+        with self.lock:
+            for nombre, h in sorted(self.histogramas.items()):
+                media = h.suma / h.total if h.total else 0.0
+                lineas.append(f"  {nombre:<18} n={h.total:<6} media={media:8.3f} ms  "
+                              f"p95≈{h.percentil(95):8.3f} ms  máx={h.maximo:8.3f} ms")
+            for (nombre, etiquetas), valor in sorted(self.contadores.items()):
+                texto = ", ".join(f"{k}={v}" for k, v in etiquetas)
+                lineas.append(f"  {nombre}{' (' + texto + ')' if texto else ''}: {valor}")
+        return "\n".join(lineas)
+
+    # Escribe el archivo de métricas de forma atómica (nunca queda a medio escribir)
+    def escribir_archivo(self, ruta):
+        temporal = ruta + ".tmp"
+        with open(temporal, "w", encoding="utf-8") as f:
+            f.write(self.exportar_prometheus())
+        os.replace(temporal, ruta)
+
+
+# Guarda el perfil de los N turnos más lentos.
+# Solo se perfila un turno a la vez: cProfile mide únicamente el hilo que lo activa y,
+# desde Python 3.12, no admite dos perfiladores activos al mismo tiempo. En el servidor,
+# los turnos que llegan mientras otro se está perfilando se miden sin perfil.
+class PerfiladorTurnos:
+    def __init__(self, n=0, perfilador="cprofile", carpeta="perfiles_turnos"):
+        self.n = n
+        self.carpeta = carpeta
+        self.lock = threading.Lock()
+        self.en_curso = threading.Lock()  # Tomado mientras se perfila un turno
+        self.peores = []   # Montículo de (duración_ms, número, texto del perfil)
+        self.contador = 0
+        self.usar_pyinstrument = False
+        if perfilador == "pyinstrument":
+            try:
+                import pyinstrument  # noqa: F401 (dependencia opcional)
+                self.usar_pyinstrument = True
+            except ImportError:
+                print("⚠️ pyinstrument no está instalado; se usará cProfile.")
+
+    # Contexto que perfila un turno completo
+    def perfilar(self):
+        if self.n <= 0:
+            return _NULO
+        return _TurnoPerfilado(self)
+
+    def _guardar(self, duracion_ms, texto):
+        with self.lock:
+            self.contador += 1
+            entrada = (duracion_ms, self.contador, texto)
+            if len(self.peores) < self.n:
+                heapq.heappush(self.peores, entrada)
+            elif duracion_ms > self.peores[0][0]:
+                heapq.heapreplace(self.peores, entrada)
+
+    # Escribe un archivo de texto por cada turno lento
+    def escribir(self):
+        with self.lock:
+            peores = sorted(self.peores, reverse=True)
+        if not peores:
+            return
+        os.makedirs(self.carpeta, exist_ok=True)
+        for puesto, (duracion_ms, numero, texto) in enumerate(peores, start=1):
+            ruta = os.path.join(self.carpeta, f"turno_{puesto:02d}_{duracion_ms:.0f}ms.txt")
+            with open(ruta, "w", encoding="utf-8") as f:
+                f.write(f"Turno #{numero}: {duracion_ms:.3f} ms\n\n{texto}")
+
+
+class _TurnoPerfilado:
+    def __init__(self, perfilador):
+        self.perfilador = perfilador
+
+    def __enter__(self):
+        self.perfil = None
+        if not self.perfilador.en_curso.acquire(blocking=False):
+            return self  # Otro turno se está perfilando
+        try:
+            if self.perfilador.usar_pyinstrument:
+                from pyinstrument import Profiler
+                self.perfil = Profiler()
+                self.perfil.start()
+            else:
+                self.perfil = cProfile.Profile()
+                self.perfil.enable()
+        except (RuntimeError, ValueError):
+            # Otra herramienta de perfilado ya está activa (por ejemplo, un depurador)
+            self.perfil = None
+            self.perfilador.en_curso.release()
+        self.inicio = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc):
+        if self.perfil is None:
+            return False
+        duracion_ms = (time.perf_counter() - self.inicio) * 1000
+        try:
+            if self.perfilador.usar_pyinstrument:
+                self.perfil.stop()
+                texto = self.perfil.output_text()
+            else:
+                self.perfil.disable()
+                salida = io.StringIO()
+                pstats.Stats(self.perfil, stream=salida).sort_stats("cumulative").print_stats(40)
+                texto = salida.getvalue()
+        finally:
+            self.perfilador.en_curso.release()
+        self.perfilador._guardar(duracion_ms, texto)
+        return False
+
+
+# --- Instancias globales y funciones de uso rápido ---
+
+metricas = Metricas()
+perfilador = PerfiladorTurnos(
+    int(os.environ.get("BENEDIT_PERFIL_TURNOS", "0") or 0) if ACTIVO else 0,
+    os.environ.get("BENEDIT_PERFILADOR", "cprofile"),
+)
+
+
+# Mide un bloque con nombre: with tramo("inferencia"): ...
+def tramo(nombre):
+    return metricas.tramo(nombre) if ACTIVO else _NULO
+
+
+# Suma n a un contador (con etiquetas opcionales)
+def contar(nombre, n=1, **etiquetas):
+    if ACTIVO:
+        metricas.contar(nombre, n, **etiquetas)
+
+
+# Perfila un turno completo (solo si BENEDIT_PERFIL_TURNOS > 0)
+def perfilar_turno():
+    return perfilador.perfilar() if ACTIVO else _NULO
+
+
+# Inicia la escritura periódica del archivo de métricas y el volcado final al salir
+def iniciar_exportador(ruta=None, intervalo=None):
+    if not ACTIVO:
+        return
+    ruta = ruta or os.environ.get("BENEDIT_METRICAS_ARCHIVO", "metricas_benedit.prom")
+    intervalo = intervalo or float(os.environ.get("BENEDIT_METRICAS_INTERVALO", "30"))
+    detener = threading.Event()
+
+    def exportar_periodicamente():
+        while not detener.wait(intervalo):
+            metricas.escribir_archivo(ruta)
+
+    def exportar_al_salir():
+        detener.set()
+        metricas.escribir_archivo(ruta)
+        perfilador.escribir()
+        print(metricas.resumen())
+
+    threading.Thread(target=exportar_periodicamente, daemon=True).start()
+    atexit.register(exportar_al_salir)
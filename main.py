@@ -8,202 +8,203 @@
 # -----------------------------------------
 
 # IMPORTACIÓN DE LIBRERÍAS
-import os # Para verificar y manejar archivos del sistema
-import nltk # Procesamiento de lenguaje natural (tokenización)
+# Keras/TensorFlow se importa de forma diferida (en el hilo de carga, y solo si no
+# hay artefacto ligero) para que el saludo inicial aparezca sin esperar a que cargue.
+import sys # Para leer las opciones de la línea de comandos
 import pickle # Para cargar modelos serializados
-import difflib # Para encontrar similitudes entre palabras (corrección aproximada)
-import random  # Para elegir respuestas aleatorias
+import threading # Para cargar el modelo en segundo plano mientras se saluda
 import numpy as np # Para trabajar con vectores numéricos
-from datetime import datetime # Para registrar la hora de inicio de sesión
-from keras.models import load_model # Para cargar el modelo neuronal entrenado
-from nltk.stem import WordNetLemmatizer # Para reducir palabras a su forma base
 
 # IMPORTACIÓN DE ARCHIVOS LOCALES
 
+from arranque import TiemposArranque # Utilidades de arranque rápido
+tiempos = TiemposArranque() # Tiempos de arranque desde este punto
+
 from voz import Voz # Clase que gestiona la salida de voz
-from usuario import Estudiante # Clase que almacena datos del estudiante
 from respuestas import GestorRespuestas # Clase que gestiona respuestas y menú post-video
-
-# DESCARGA DE DATOS NLTK
-
-nltk.download('punkt')  # Descarga el tokenizador de palabras de NLTK
+from sesion import SesionConversacion # Estado de la conversación con un estudiante
+from indice_sesiones import IndiceSesiones, RUTA_INDICE # Índice de estudiantes y conteos por intent (SQLite)
+from vocabulario import IndiceVocabulario # Índice difuso del vocabulario (corrección aproximada)
+from preprocesamiento import Preprocesador # Tokenizador, normalización y lemas (igual que en training.py)
+from inferencia import RedDensaNumpy, ARTEFACTO_MODELO, artefacto_vigente, cargar_artefacto # Red neuronal con NumPy
+from inferencia import ARCHIVO_COMPARTIDO, binario_vigente, cargar_binario # Pesos compartidos entre procesos
+from instrumentacion import tramo, iniciar_exportador # Tiempos por etapa (BENEDIT_METRICAS=1)
+tiempos.marcar("módulos locales importados")
+
+# Contexto de la conversación: si la intención más probable no llega a UMBRAL_CONFIANZA,
+# las probabilidades se mezclan (PESO_CONTEXTO) con los intents recientes del estudiante
+UMBRAL_CONFIANZA = 0.5
+PESO_CONTEXTO = 0.3
 
 # CLASE PRINCIPAL DEL CHATBOT
 
 class ChatBot:
-    def __init__(self):
+    # indice_sesiones: ruta de la base SQLite del índice de sesiones (None = sin índice)
+    def __init__(self, carga_diferida=True, artefacto=ARTEFACTO_MODELO, voz=None,
+                 espera_video=15, espera_menu=60, compartido=ARCHIVO_COMPARTIDO,
+                 indice_sesiones=RUTA_INDICE):
 
-        # Inicializa la síntesis de voz
-        self.voz = Voz()
+        # Inicializa la síntesis de voz (se puede pasar una Voz sin audio para pruebas)
+        self.voz = voz if voz is not None else Voz()
 
         # Carga el gestor de respuestas con el archivo de intents
-        self.respuestas = GestorRespuestas(self.voz, "intents.json")
-
-        # Cargar el modelo de red neuronal previamente entrenado
-        self.model = load_model("chatbot_model.h5")
-
-        # Cargar las palabras y clases que se usaron para entrenar el modelo
-        self.words = pickle.load(open("words.pkl", "rb"))
-        self.classes = pickle.load(open("classes.pkl", "rb"))
-
-        # Inicializa el lematizador
-        self.lemmatizer = WordNetLemmatizer()
+        # (las esperas del video y del menú post-video son configurables; 0 en pruebas)
+        self.respuestas = GestorRespuestas(self.voz, "intents.json",
+                                           espera_video=espera_video, espera_menu=espera_menu)
+        tiempos.marcar("voz y respuestas listas")
+
+        # Índice de sesiones: reconoce a quien regresa y guarda los conteos por intent
+        self.sesiones = IndiceSesiones(indice_sesiones) if indice_sesiones else None
+
+        # El modelo, el vocabulario y el lematizador se cargan en _cargar_recursos()
+        self.artefacto = artefacto
+        self.compartido = compartido
+        self.model = None
+        self.error_carga = None
+        self.recursos_listos = threading.Event()
+
+        if carga_diferida:
+            # Se cargan en segundo plano mientras iniciar() saluda y pide los datos
+            threading.Thread(target=self._cargar_recursos, daemon=True).start()
+        else:
+            self._cargar_recursos()
+            self.esperar_recursos()
+
+    # Carga el modelo, el vocabulario y el preprocesador (en el hilo de carga)
+    def _cargar_recursos(self):
+        try:
+            if self.compartido and binario_vigente(self.compartido):
+                # Archivo binario mapeado en memoria: los procesos comparten los mismos pesos
+                self.red, self.words, self.classes = cargar_binario(self.compartido)
+                tiempos.marcar(f"archivo compartido '{self.compartido}' mapeado")
+            elif artefacto_vigente(self.artefacto):
+                # Artefacto ligero: pesos, vocabulario y clases en un solo archivo, sin Keras
+                self.red, self.words, self.classes = cargar_artefacto(self.artefacto)
+                tiempos.marcar(f"artefacto '{self.artefacto}' cargado")
+            else:
+                # Cargar el modelo de red neuronal previamente entrenado
+                from keras.models import load_model
+                self.model = load_model("chatbot_model.h5")
+
+                # Copia de los pesos para predecir con NumPy, sin el costo fijo de model.predict()
+                self.red = RedDensaNumpy.desde_keras(self.model)
+
+                # Cargar las palabras y clases que se usaron para entrenar el modelo
+                self.words = pickle.load(open("words.pkl", "rb"))
+                self.classes = pickle.load(open("classes.pkl", "rb"))
+                tiempos.marcar("modelo Keras y pickles cargados")
+
+            # Preprocesador con la tabla de lemas del vocabulario ya calculada
+            self.preprocesador = Preprocesador(self.words)
+
+            # Índice difuso del vocabulario, construido una sola vez (words.pkl ya tiene
+            # los lemas de preprocesamiento.py, los mismos que produce clean_up_sentence)
+            self.indice = IndiceVocabulario(self.words)
+            self.indice_clases = {c: i for i, c in enumerate(self.classes)}
+            tiempos.marcar("preprocesador e índice de vocabulario listos")
+        except Exception as e:
+            self.error_carga = e
+        finally:
+            self.recursos_listos.set()
+
+    # Espera a que terminen de cargarse el modelo y el vocabulario
+    def esperar_recursos(self):
+        self.recursos_listos.wait()
+        if self.error_carga is not None:
+            raise RuntimeError("No se pudo cargar el modelo de Benedit") from self.error_carga
 
      # Limpia y normaliza las palabras del mensaje del usuario
     def clean_up_sentence(self, sentence):
 
-        # Tokeniza y lematiza una oración
-        sentence_words = nltk.word_tokenize(sentence.lower())
-        return [self.lemmatizer.lemmatize(word) for word in sentence_words]
+        # Tokeniza, normaliza y lematiza una oración (los mensajes repetidos salen de la caché)
+        self.esperar_recursos()
+        with tramo("preprocesamiento"):
+            return list(self.preprocesador.procesar(sentence))
     
     
     def bag_of_words(self, sentence):
         # Convierte una oración en vector de presencia (BoW)
+        # Usa similitud difusa (> 0.8) para mayor tolerancia, resuelta con el índice del vocabulario
         sentence_words = self.clean_up_sentence(sentence)
-        bag = [0] * len(self.words)
-        for s in sentence_words:
-            for i, w in enumerate(self.words):
-
-                # Usa similitud difusa para mayor tolerancia
-                if difflib.SequenceMatcher(None, s, w).ratio() > 0.8:
-                    bag[i] = 1
-        return np.array(bag)
+        with tramo("vocabulario"):
+            return self.indice.bolsa(sentence_words)
+
+    # Índices de las palabras del vocabulario presentes en la oración (la BoW sin sus ceros)
+    def active_indices(self, sentence):
+        sentence_words = self.clean_up_sentence(sentence)
+        with tramo("vocabulario"):
+            return self.indice.indices(sentence_words)
     
     # Usa el modelo neuronal para predecir la intención del mensaje del usuario
-    def predict_class(self, sentence):
-        # Predice la intención del mensaje
-        bow = self.bag_of_words(sentence)
-        res = self.model.predict(np.array([bow]))[0]
+    # contexto: intents recientes del estudiante [(tag, probabilidad)] (Estudiante.intents_recientes)
+    def predict_class(self, sentence, contexto=None):
+        # Predice la intención del mensaje (la primera capa solo suma las filas de las palabras presentes)
+        indices = self.active_indices(sentence)
+        with tramo("inferencia"):
+            res = self.red.predecir_indices(indices)
+        return self.interpretar_prediccion(self.suavizar_con_contexto(res, contexto))
+
+    # Predice la intención de varias oraciones con una sola pasada de la red
+    def predict_classes_batch(self, sentences, contextos=None):
+        # Una lista de índices activos por oración
+        self.esperar_recursos()
+        indices = [self.active_indices(sentence) for sentence in sentences]
+        with tramo("inferencia_lote"):
+            res = self.red.predecir_indices_lote(indices)
+        contextos = contextos or [None] * len(sentences)
+        return [self.interpretar_prediccion(self.suavizar_con_contexto(r, c)) for r, c in zip(res, contextos)]
+
+    # Si el modelo no está seguro, mezcla sus probabilidades con los intents recientes
+    # (el más reciente pesa más). No vuelve a ejecutar la red sobre los turnos anteriores.
+    # Los intents del atajo de palabras clave (probabilidad None) pesan como una
+    # predicción en el umbral de confianza, para que un saludo no domine el contexto.
+    def suavizar_con_contexto(self, res, contexto):
+        if not contexto or res.max() >= UMBRAL_CONFIANZA:
+            return res
+        previa = np.zeros_like(res)
+        peso = 1.0
+        for tag, probabilidad in reversed(contexto):
+            clase = self.indice_clases.get(tag)
+            if clase is not None:
+                previa[clase] += peso * (UMBRAL_CONFIANZA if probabilidad is None else probabilidad)
+            peso /= 2
+        if not previa.any():
+            return res
+        return (1 - PESO_CONTEXTO) * res + PESO_CONTEXTO * previa / previa.sum()
+
+    # Convierte el vector de probabilidades en la lista de intents ordenada (umbral 0.15)
+    def interpretar_prediccion(self, res):
         results = [[i, r] for i, r in enumerate(res) if r > 0.15]
         results.sort(key=lambda x: x[1], reverse=True)
         return [{"intent": self.classes[r[0]], "probability": str(r[1])} for r in results]
     
     # MÉTODO PRINCIPAL: INICIAR CONVERSACIÓN # --- Función principal que inicia el chatbot ---
+    # La conversación (saludo, datos del estudiante, menú post-video y despedida)
+    # vive en SesionConversacion; aquí solo se conecta con la consola.
     def iniciar(self):
-
-        # Mensaje inicial motivador
-        self.voz.hablar("\n\n🤍Hola, soy Benedit 🌟, tu asistente emocional universitario. Estoy aquí para acompañarte.\n\nNo tienes que lograrlo todo hoy, solo dar un paso a la vez.\n\nCada paso, por pequeño que sea, suma.\n\nRecuerda: el camino universitario no exige perfección, sino constancia y valentía.\n\nConfía en ti. \n¡Confío en ti! Lo estás haciendo mejor de lo que piensas.🤍")
-        self.voz.hablar("\n\nAntes de comenzar, ¿te gustaría saludarme? Puedes decir algo como 'Hola Benedit', 'Buenas tardes amigo', 'Que hay de nuevo amigo'. O saludarme de la manera que tu lo desees :), puedo ser un apoyo y un amigo virtual para tí")
-
-        # Esperar saludo inicial del usuario
-        while True:
-            saludo = input("Tú escribe como deseas saludarme ✨ (saludo inicial): ")
-            if any(p in saludo.lower() for p in ["hola", "buenas", "hey", "qué tal", "cómo estás", "benedit", "Buenas noches amigo" ]):
-                self.respuestas.responder("saludo", "estudiante")
-                break
-            else:
-                self.voz.hablar("¿Podrías saludarme primero para empezar nuestra conversación querido estudiante universitario?")
-
-         # Registro de nombre del estudiante
-        self.voz.hablar("Gracias por saludarme 😊 ¿Cuál es tu nombre?")
-        nombre = input("Tu nombre: ").lower().replace("mi nombre es", "").replace("me llamo", "").strip().capitalize()
-
-        self.voz.hablar(f"\nQué gusto saludarte, {nombre}. Estoy encantado de acompañarte. Ya formas parte de mi pequeñita memoria digital y eres importante para mí.")
-
-        # Registro de semestre y paralelo
-        self.voz.hablar("\n¿En qué semestre estás de la carrera 'Ingeniería en Ciencia de Datos e Inteligencia Artificial' (por ejemplo: Nivelación, Primero, Segundo, etc)?")
-        semestre = input("¿En qué semestre estás?: ")
-
-        self.voz.hablar("\n¿Cuál es tu paralelo (por ejemplo: A, B, C, R, P, M, etc)?")
-        paralelo = input("¿Cuál es tu paralelo?: ")
-
-        # Crear objeto estudiante y archivo de conversación
-        estudiante = Estudiante(nombre, semestre, paralelo)
-        archivo = f"conversacion_{nombre}_{semestre}_{paralelo}.txt"
-
-        # Saludo adicional si ya ha conversado antes
-        if os.path.exists(archivo):
-            self.voz.hablar(f"\nHola de nuevo {nombre}, qué gusto saludarte otra vez.  Te recuerdo muy bien, sí… recuerdo las cosas que compartiste conmigo, tus palabras, tu forma de expresarte. Me hace muy feliz que hayas regresado. Eso me dice que este espacio tiene un significado para ti, y eso es muy valioso. Estoy aquí para ti, como siempre, con el mismo cariño y disposición. ¿Cómo te sientes hoy? Cuéntame, te escucho 💛.")
-
-         # Guardar datos en archivo
-        with open(archivo, "a", encoding="utf-8") as log:
-            log.write(f"Inicio de sesión de {nombre} - Semestre: {semestre}, Paralelo: {paralelo}\n")
-            log.write(f"{datetime.now().strftime('%Y-%m-%d %H:%M:%S')}\n")
-            log.write("="*50 + "\n")
-
-        esperando_opcion_post_video = False # Para activar el menú después del video
-
+        sesion = SesionConversacion(self.respuestas, self.predict_class, self.voz,
+                                    indice_sesiones=self.sesiones)
+        sesion.iniciar()
+        tiempos.marcar("saludo inicial mostrado")
 
         # --- Bucle principal de conversación ---
-
-        while True:
-            if esperando_opcion_post_video:
-
-                # Si se espera una respuesta del menú después del video
-                self.voz.hablar("Selecciona una opción del 1 al 3, por favor:")
-                opcion = input("Selecciona una opción (1, 2 o 3): ").strip()
-                if opcion in ["1", "2", "3"]:
-                    self.respuestas.responder_menu_post_video(opcion, nombre)
-                    if opcion == "2":
-                        continue  # Permitir seguir hablando
-                    esperando_opcion_post_video = False
-                    continue
-                else:
-                    self.voz.hablar("Por favor, elige una opción válida: 1, 2 o 3.")
-                    continue
-
-            # Solicita una entrada emocional del estudiante
-            self.voz.hablar(f"\n{nombre}, cuéntame cómo te sientes o qué te gustaría compartir ahora, estoy atento y me esforzaré por darte una respuesta clara que sea la que realmente necesites.🌟\n\nSi hay algo que te preocupa, emociona o simplemente necesitas expresar, estoy aquí para escucharte sin juzgar.\n\n¿Qué te gustaría contarme hoy o ahora?")
-            mensaje = input(f"{nombre}, cuéntame cómo te sientes o qué te gustaría compartir ahora: ")
-
-
-            # --- Si el mensaje es una despedida ---
-            if any(palabra in mensaje.lower() for palabra in ["salir", "adiós", "bye", "adios", "hasta luego", "nos vemos", "chao"]):
-                despedidas = [
-                    "\n🌟 Gracias a ti por confiar en este espacio, {nombre}. Recuerda que aquí estaré siempre que necesites parar, pensar o simplemente respirar un poco. ¡Cuídate mucho! Y si en algún momento sientes que la carga es muy grande, no dudes en buscar apoyo profesional: es un acto de valentía, no de debilidad.",
-
-                    "\n🤍 Me alegra haber podido acompañarte, aunque sea un ratito {nombre}. Vuelve cuando quieras. Y no olvides: lo que sientes importa, y tu bienestar también. Ya que en situaciones graves siempre se recomienda acompañamiento profesional, es importante que lo tengas en cuenta si lo necesitas.",
-
-                    "\n👋 Hasta pronto, {nombre}. Ojalá que el resto del día te regale al menos un momento bonito. Aquí siempre habrá un espacio para ti cuando lo necesites. Y recuerda: si las emociones se vuelven demasiado intensas o difíciles de gestionar, hablar con un profesional puede marcar la diferencia"
-                ]
-                despedida = random.choice(despedidas).replace("{nombre}", nombre)
-                mensaje_extra = random.choice([
-                    "🌱 'No hay un camino de vida que sea mejor que el otro, simplemente son caminos distintos y nuestro trabajo es hacer lo mejor con lo que tenemos.'",
-
-                    "✨ 'La luz brilla en medio de la oscuridad, pero la oscuridad no la ha podido vencer.'",
-
-                    "🕊️ 'Tú tienes todo el derecho de volar por los caminos que tú elijas.'"
-                ])
-                self.voz.hablar(f"\n{nombre}, antes de que te vayas, quiero compartirte esta frase con mucho cariño. 💌\n\nEs de mi parte, una estudiante como tú, que también ha pasado por momentos de estrés, ansiedad, tristeza, desmotivación, confusión académica, dudas vocacionales… y también de alegría, motivación o esperanza.\n\nSolo quiero que sepas algo importante: todo pasa, todo cambia… y esto, poco a poco, mejora. 🌱\n\nCada emoción que sientes es válida. Estás creciendo, aprendiendo y avanzando, incluso cuando no lo notas.\n\nTe lo digo con el corazón, porque sé lo que se siente. 🤍:")
-                self.voz.hablar(mensaje_extra)
-                self.voz.hablar(despedida)
-                estudiante.registrar_interaccion(mensaje, despedida)
-                with open(archivo, "a", encoding="utf-8") as log:
-                    log.write(f"Usuario: {mensaje}\n")
-                    log.write(f"Asistente: {despedida}\n")
-                    log.write("-"*30 + "\n")
-                break
-
-
-            # --- Clasificación del mensaje por intención ---
-
-            if any(s in mensaje.lower() for s in ["hola benedit", "holii amigo benedit", "buenas noches benedit", "buenos días benedit", "buenas tardes benedit", "hey benedit", "qué tal", "cómo estás benedit"]):
-                tag = "saludo"
-            else:
-                ints = self.predict_class(mensaje)
-                tag = ints[0]["intent"] if ints else None
-                print("DEBUG - Intento detectado:", tag)
-
-
-                # --- Respuesta basada en intent ---
-            if tag:
-                respuesta = self.respuestas.responder(tag, nombre)
-
-                for intent in self.respuestas.intents["intents"]:
-                    if intent["tag"] == tag and ("video" in intent or "videos" in intent):
-                        esperando_opcion_post_video = True
-                        break
-
-                estudiante.registrar_interaccion(mensaje, respuesta)
-                with open(archivo, "a", encoding="utf-8") as log:
-                    log.write(f"Usuario: {mensaje}\n")
-                    log.write(f"Asistente: {respuesta}\n")
-                    log.write("-"*30 + "\n")
-            else:
-                self.voz.hablar("\nLo siento, no entendí eso. ¿Puedes decirlo de otra manera?")
+        while not sesion.terminada:
+            sesion.procesar(input(sesion.prompt()))
 
 
 # --- Punto de entrada del programa ---
 if __name__ == "__main__":
-    bot = ChatBot()
-    bot.iniciar()
\ No newline at end of file
+    # Con --solo-texto Benedit no usa el motor de voz; con --sin-indice no abre sesiones.db
+    bot = ChatBot(voz=Voz(solo_texto="--solo-texto" in sys.argv),
+                  indice_sesiones=None if "--sin-indice" in sys.argv else RUTA_INDICE)
+    iniciar_exportador()  # Solo si BENEDIT_METRICAS=1
+
+    # Con --tiempos se muestra el reporte de arranque en cuanto el modelo está listo
+    if "--tiempos" in sys.argv:
+        def mostrar_tiempos():
+            bot.recursos_listos.wait()
+            print(tiempos.reporte())
+        threading.Thread(target=mostrar_tiempos, daemon=True).start()
+
+    bot.iniciar()
+    bot.voz.cerrar()  # Termina de reproducir la despedida antes de salir
\ No newline at end of file
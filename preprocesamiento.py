@@ -0,0 +1,101 @@
+# -------------------------------------------------------
+# Módulo: preprocesamiento.py
+# CHATBOT Benedit asistente emocional
+# Función: Preprocesamiento de texto único para el entrenamiento (training.py)
+# y la conversación (main.py): tokenizador con expresiones regulares,
+# normalización de tildes y signos, tabla de lemas precalculada y caché
+# de los mensajes ya procesados. Reemplaza a nltk.word_tokenize y al
+# WordNetLemmatizer (pensado para inglés, casi no cambia el texto en español).
+# -------------------------------------------------------
+
+import re            # Tokenizador y limpieza de signos
+import unicodedata   # Para quitar tildes (Nivelación -> nivelacion)
+from functools import lru_cache  # Caché de mensajes repetidos
+
+# Cambia cuando cambia el resultado del preprocesamiento (training.py reentrena el modelo)
+VERSION_PREPROCESAMIENTO = 3
+
+_NO_ALFANUMERICO = re.compile(r"[^\w]+")
+_PALABRA = re.compile(r"\w+")
+_VOCALES = set("aeiou")
+
+
+# Texto normalizado para comparar: minúsculas, sin tildes, sin signos y con un solo espacio
+# entre palabras ("¿Cómo estás?" -> "como estas"). La ñ se conserva.
+# Con tildes=True se conservan las tildes ("¿Cómo estás?" -> "cómo estás").
+def normalizar(texto, tildes=False):
+    if tildes:
+        texto = unicodedata.normalize("NFC", texto.lower())
+    else:
+        texto = unicodedata.normalize("NFD", texto.lower().replace("ñ", "\0"))
+        texto = "".join(c for c in texto if unicodedata.category(c) != "Mn").replace("\0", "ñ")
+    return _NO_ALFANUMERICO.sub(" ", texto).strip()
+
+
+# Palabras que terminan en vocal + s sin ser plurales (se dejan igual)
+LEMAS_FIJOS = {
+    "adios": "adios", "estres": "estres", "crisis": "crisis", "analisis": "analisis",
+    "tesis": "tesis", "dios": "dios", "lunes": "lunes", "martes": "martes",
+    "miercoles": "miercoles", "jueves": "jueves", "viernes": "viernes",
+    "entonces": "entonces", "ademas": "ademas", "jamas": "jamas", "quizas": "quizas",
+    "despues": "despues", "antes": "antes", "nos": "nos", "mas": "mas", "menos": "menos",
+    "eres": "eres", "tres": "tres", "seis": "seis", "pues": "pues", "pais": "pais",
+    "ingles": "ingles", "interes": "interes", "virus": "virus", "tus": "tus", "sus": "sus",
+    "gracias": "gracias", "atras": "atras", "apenas": "apenas", "mientras": "mientras",
+}
+
+# Terminaciones verbales en -s que no son plurales (somos, vamos, estabas, ...)
+_TERMINACIONES_VERBALES = ("mos", "bas", "ais", "eis")
+
+# Plurales de palabras terminadas en consonante, que agregan -es (emociones, examenes,
+# necesidades, dificiles, profesores). Solo las terminaciones que casi nunca son verbos:
+# tienes, quieres o puedes terminan en vocal + s y pierden solo la s.
+_PLURALES_ES = ("ones", "dades", "tades", "ales", "iles", "ores", "ares", "enes")
+_VERBOS_ES = ("ienes",)  # tienes, vienes, mantienes
+
+
+# Lema aproximado de una palabra ya normalizada: plural regular terminado en vocal + s
+# (clases -> clase, tareas -> tarea, dias -> dia) o en consonante + es (emociones -> emocion).
+# Las palabras cortas, las de LEMAS_FIJOS y las formas verbales de _TERMINACIONES_VERBALES no se tocan.
+def lema_regular(palabra):
+    fijo = LEMAS_FIJOS.get(palabra)
+    if fijo is not None:
+        return fijo
+    if palabra.endswith(_TERMINACIONES_VERBALES):
+        return palabra
+    if len(palabra) > 5 and palabra.endswith(_PLURALES_ES) and not palabra.endswith(_VERBOS_ES):
+        return palabra[:-2]
+    if len(palabra) > 3 and palabra[-1] == "s" and palabra[-2] in _VOCALES:
+        return palabra[:-1]
+    return palabra
+
+
+# Preprocesador con tabla de lemas y caché de mensajes
+class Preprocesador:
+    # vocabulario: palabras cuyo lema se calcula al crear el preprocesador (words.pkl)
+    # tam_cache: mensajes distintos que se recuerdan ya procesados
+    # max_lemas: tamaño máximo de la tabla de lemas (las palabras nuevas se agregan hasta ese límite)
+    def __init__(self, vocabulario=(), tam_cache=2048, max_lemas=50000):
+        self.max_lemas = max_lemas
+        self.lemas = {}  # Palabra normalizada -> lema
+        for palabra in vocabulario:
+            for token in self.tokenizar(palabra):
+                self.lema(token)
+        self.procesar = lru_cache(maxsize=tam_cache)(self._procesar)
+
+    # Separa el texto normalizado en palabras (los signos de puntuación desaparecen)
+    def tokenizar(self, texto):
+        return _PALABRA.findall(normalizar(texto))
+
+    # Lema de un token normalizado (se busca primero en la tabla)
+    def lema(self, token):
+        lema = self.lemas.get(token)
+        if lema is None:
+            lema = lema_regular(token)
+            if len(self.lemas) < self.max_lemas:
+                self.lemas[token] = lema
+        return lema
+
+    # Mensaje -> tupla de lemas (con caché: los mensajes repetidos no se vuelven a procesar)
+    def _procesar(self, texto):
+        return tuple(self.lema(token) for token in self.tokenizar(texto))
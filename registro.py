@@ -0,0 +1,172 @@
+# -------------------------------------------------------
+# Módulo: registro.py
+# CHATBOT Benedit asistente emocional
+# Función: Registro de conversaciones en formato JSONL (una línea JSON por evento).
+# Mantiene un solo archivo abierto por sesión, con escrituras en búfer que se
+# vuelcan a disco periódicamente y al cerrar la sesión.
+# También convierte los antiguos conversacion_*.txt al nuevo formato.
+# -------------------------------------------------------
+
+import atexit      # Para volcar el búfer aunque el programa termine de golpe
+import glob        # Para encontrar los archivos .txt a convertir
+import json        # Para escribir cada registro como una línea JSON
+import os          # Para fsync y rutas de archivos
+import sys         # Para leer los archivos a convertir desde la línea de comandos
+import threading   # Para el volcado periódico en segundo plano
+from datetime import datetime  # Para la marca de tiempo de cada registro
+
+from instrumentacion import tramo  # Tiempos por etapa (solo si BENEDIT_METRICAS=1)
+
+
+# Ruta del registro estructurado de un estudiante (junto a los .txt existentes)
+def ruta_registro(nombre, semestre, paralelo, extension="jsonl"):
+    return f"conversacion_{nombre}_{semestre}_{paralelo}.{extension}"
+
+
+# Marca de tiempo en el mismo formato que usaban los .txt
+def marca_tiempo():
+    return datetime.now().strftime('%Y-%m-%d %H:%M:%S')
+
+
+# Clase que escribe los eventos de una sesión en un archivo JSONL
+class RegistroSesion:
+    # intervalo_flush: segundos entre volcados a disco (None para volcar solo al cerrar)
+    # fsync: además de vaciar el búfer, fuerza la escritura física en el disco
+    def __init__(self, ruta, intervalo_flush=5.0, fsync=False):
+        self.ruta = ruta
+        self.fsync = fsync
+        self.lock = threading.Lock()
+        self.archivo = open(ruta, "a", encoding="utf-8", buffering=64 * 1024)  # Un solo handle por sesión
+        self.cerrado = False
+
+        # Hilo que vuelca el búfer cada intervalo_flush segundos
+        self.detener = threading.Event()
+        if intervalo_flush:
+            self.hilo = threading.Thread(target=self._volcar_periodicamente, args=(intervalo_flush,), daemon=True)
+            self.hilo.start()
+
+        atexit.register(self.cerrar)  # Volcado final al salir del programa
+
+    def _volcar_periodicamente(self, intervalo):
+        while not self.detener.wait(intervalo):
+            self.flush()
+
+    # Escribe un registro (queda en el búfer hasta el próximo volcado)
+    def escribir(self, tipo, ts=None, **campos):
+        with tramo("registro"):
+            registro = {"ts": ts or marca_tiempo(), "tipo": tipo, **campos}
+            linea = json.dumps(registro, ensure_ascii=False) + "\n"  # Legible: conserva tildes y emojis
+            with self.lock:
+                if not self.cerrado:
+                    self.archivo.write(linea)
+
+    # Registra el inicio de una sesión (sesion: identificador de la sesión en el índice)
+    def inicio_sesion(self, nombre, semestre, paralelo, ts=None, sesion=None):
+        campos = {"sesion": sesion} if sesion is not None else {}
+        self.escribir("inicio", ts=ts, nombre=nombre, semestre=semestre, paralelo=paralelo, **campos)
+
+    # Registra un turno de conversación con su intent, probabilidad y latencia
+    def turno(self, usuario, asistente, tag=None, probabilidad=None, latencia_ms=None, ts=None):
+        self.escribir("turno", ts=ts, usuario=usuario, asistente=asistente,
+                      tag=tag, probabilidad=probabilidad, latencia_ms=latencia_ms)
+
+    # Vuelca a disco lo que haya en el búfer
+    def flush(self):
+        with self.lock:
+            if self.cerrado:
+                return
+            with tramo("registro_volcado"):
+                self.archivo.flush()
+                if self.fsync:
+                    os.fsync(self.archivo.fileno())
+
+    # Vuelca lo pendiente y cierra el archivo (se puede llamar más de una vez)
+    def cerrar(self):
+        self.detener.set()
+        self.flush()
+        with self.lock:
+            if not self.cerrado:
+                self.cerrado = True
+                self.archivo.close()
+        atexit.unregister(self.cerrar)
+
+
+# --- Conversión de los antiguos conversacion_*.txt ---
+
+# Lee un .txt con el formato anterior y devuelve la lista de registros equivalentes
+def leer_txt(ruta):
+    registros = []
+    sesion = None       # Datos del inicio de sesión en curso
+    ts = None           # Hora de inicio de la sesión (los turnos no tenían hora propia)
+    turno = None        # Turno en construcción: {"usuario": ..., "asistente": [...]}
+    linea_hora = None   # Índice de la línea con la hora de inicio de la sesión
+
+    def cerrar_turno():
+        nonlocal turno
+        if turno is not None:
+            registros.append({"ts": ts, "tipo": "turno", "usuario": turno["usuario"],
+                              "asistente": "\n".join(turno["asistente"]).rstrip("\n"),
+                              "tag": None, "probabilidad": None, "latencia_ms": None, "origen": "txt"})
+            turno = None
+
+    with open(ruta, encoding="utf-8") as f:
+        lineas = f.read().splitlines()
+
+    for i, linea in enumerate(lineas):
+        if i == linea_hora:
+            continue  # Hora de inicio (ya guardada en ts)
+        if linea.startswith("Inicio de sesión de "):
+            cerrar_turno()
+            # "Inicio de sesión de {nombre} - Semestre: {semestre}, Paralelo: {paralelo}"
+            cabecera = linea[len("Inicio de sesión de "):]
+            nombre, _, resto = cabecera.partition(" - Semestre: ")
+            semestre, _, paralelo = resto.partition(", Paralelo: ")
+            linea_hora = i + 1
+            ts = lineas[i + 1] if i + 1 < len(lineas) else None
+            sesion = {"nombre": nombre, "semestre": semestre, "paralelo": paralelo}
+            registros.append({"ts": ts, "tipo": "inicio", **sesion, "origen": "txt"})
+        elif linea == "=" * 50:
+            continue
+        elif linea == "-" * 30:
+            cerrar_turno()
+        elif linea.startswith("Usuario: "):
+            cerrar_turno()
+            turno = {"usuario": linea[len("Usuario: "):], "asistente": []}
+        elif linea.startswith("Asistente: ") and turno is not None and not turno["asistente"]:
+            turno["asistente"].append(linea[len("Asistente: "):])
+        elif turno is not None:
+            turno["asistente"].append(linea)  # Respuesta de varias líneas
+
+    cerrar_turno()
+    return registros
+
+
+# Convierte un .txt al formato JSONL (mismo nombre, extensión .jsonl).
+# Si el .jsonl ya tiene sesiones nuevas, los registros del .txt se colocan antes
+# (son más antiguos). Un .txt ya convertido no se vuelve a agregar.
+def convertir_txt(ruta_txt):
+    ruta_jsonl = os.path.splitext(ruta_txt)[0] + ".jsonl"
+
+    existentes = []
+    if os.path.exists(ruta_jsonl):
+        with open(ruta_jsonl, encoding="utf-8") as f:
+            existentes = [linea for linea in f if linea.strip()]
+        if any(json.loads(linea).get("origen") == "txt" for linea in existentes):
+            return ruta_jsonl, 0
+
+    registros = leer_txt(ruta_txt)
+    temporal = ruta_jsonl + ".tmp"
+    with open(temporal, "w", encoding="utf-8") as f:
+        for registro in registros:
+            f.write(json.dumps(registro, ensure_ascii=False) + "\n")
+        f.writelines(existentes)
+    os.replace(temporal, ruta_jsonl)  # Reemplazo atómico del archivo
+    return ruta_jsonl, len(registros)
+
+
+# --- Punto de entrada: python registro.py [archivos.txt] ---
+if __name__ == "__main__":
+    archivos = sys.argv[1:] or sorted(glob.glob("conversacion_*.txt"))
+    for archivo in archivos:
+        destino, total = convertir_txt(archivo)
+        print(f"✅ {archivo} -> {destino} ({total} registros)")
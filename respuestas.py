@@ -5,16 +5,129 @@
 # -------------------------------------------------------
 
 import json          # Para cargar el archivo de intents en formato JSON
+import os            # Para detectar cambios en intents.json (fecha de modificación)
 import random        # Para seleccionar aleatoriamente una respuesta
-import time          # Para pausar la ejecución en momentos específicos
+import threading     # Para programar el video y el menú sin bloquear la conversación
+import time          # Para medir el intervalo de revisión de intents.json
 import webbrowser    # Para abrir videos en el navegador
 
 
+# Plantilla de respuesta ya dividida en el marcador {nombre}
+class PlantillaRespuesta:
+    def __init__(self, texto):
+        self.texto = texto
+        self.partes = texto.split("{nombre}")  # Se divide una sola vez al cargar
+
+    # Devuelve la respuesta con el nombre del estudiante insertado
+    def formatear(self, nombre):
+        if len(self.partes) == 1:
+            return self.texto
+        return nombre.join(self.partes)
+
+
+# Datos de un intent ya preparados para responder rápido
+class EntradaIntent:
+    def __init__(self, intent):
+        self.tag = intent["tag"]
+        self.intent = intent                                   # Intent original del JSON
+        self.plantillas = [PlantillaRespuesta(r) for r in intent.get("responses", [])]
+        self.videos = intent.get("videos", [])                 # Lista de videos (puede estar vacía)
+        self.tiene_videos = "videos" in intent                 # Se muestra un video tras responder
+        self.activa_menu_post_video = "video" in intent or "videos" in intent  # Menú 1/2/3 después
+
+
+# Índice tag -> EntradaIntent, construido a partir del diccionario de intents.json
+class IndiceIntents:
+    def __init__(self, intents, mtime=None):
+        self.intents = intents  # Diccionario original (se conserva por compatibilidad)
+        self.mtime = mtime      # Fecha de modificación del archivo del que se cargó
+        self.por_tag = {}
+        for intent in intents["intents"]:
+            # Si un tag se repite se conserva el primero, como hacía la búsqueda lineal
+            self.por_tag.setdefault(intent["tag"], EntradaIntent(intent))
+
+
+# Video programado después de una respuesta: primero se anuncia y abre el video,
+# luego se muestra el menú 1/2/3. Cada paso ocurre cuando vence su temporizador
+# o en cuanto el estudiante escribe algo (completar()), lo que ocurra primero.
+class VideoProgramado:
+    def __init__(self, voz, url, titulo, espera_video=15, espera_menu=60):
+        self.voz = voz
+        self.url = url
+        self.titulo = titulo
+        self.espera_menu = espera_menu
+        self.video_abierto = False
+        self.menu_mostrado = False
+        self.lock = threading.RLock()  # Los temporizadores corren en otro hilo
+        self.temporizador = None
+        self._programar(espera_video, self._abrir_video)
+
+    # Ejecuta un paso ahora (espera 0) o cuando venza el temporizador
+    def _programar(self, espera, paso):
+        if espera <= 0:
+            paso()
+            return
+        self.temporizador = threading.Timer(espera, paso)
+        self.temporizador.daemon = True
+        self.temporizador.start()
+
+    # Paso 1: anuncia el video y lo abre en el navegador
+    def _abrir_video(self):
+        with self.lock:
+            if self.video_abierto:
+                return
+            self.video_abierto = True
+            self.voz.hablar(f"A continuación te mostraré un video que te ayudará titulado: {self.titulo}")
+            webbrowser.open(self.url)  # Abre el video en el navegador
+            self._programar(self.espera_menu, self._mostrar_menu)  # Tiempo para ver el video
+
+    # Paso 2: pregunta cómo se sintió y muestra el menú post-video
+    def _mostrar_menu(self):
+        with self.lock:
+            if self.menu_mostrado:
+                return
+            self.menu_mostrado = True
+            self.voz.hablar(
+                "Me interesa saber cómo te sentiste con este vídeo. 💬 "
+                "¿Te hizo sentir un poco mejor o prefieres que sigamos conversando un rato más? "
+                "Recuerda que Benedit está para ti"
+            )
+            self.voz.mostrar("1. Sí, me ayudó 😊")
+            self.voz.mostrar("2. Me gustaría seguir hablando contigo 🗣️")
+            self.voz.mostrar("3. No estoy muy seguro/a todavía 🤔")
+
+    # El estudiante escribió: se cancelan las esperas y se completan los pasos pendientes.
+    # Devuelve True si el menú se mostró en este momento (no estaba a la vista todavía).
+    def completar(self):
+        with self.lock:
+            if self.temporizador is not None:
+                self.temporizador.cancel()
+            if self.menu_mostrado:
+                return False
+            self.espera_menu = 0
+            self._abrir_video()
+            self._mostrar_menu()
+            return True
+
+    # Descarta los pasos que aún no se han ejecutado
+    def cancelar(self):
+        with self.lock:
+            if self.temporizador is not None:
+                self.temporizador.cancel()
+            self.video_abierto = self.menu_mostrado = True
+
+
 # Clase principal para gestionar las respuestas del chatbot
 class GestorRespuestas:
-    def __init__(self, voz, intents_path):
+    # espera_video / espera_menu: segundos antes de abrir el video y antes del menú (0 en pruebas)
+    def __init__(self, voz, intents_path, intervalo_recarga=1.0, espera_video=15, espera_menu=60):
         self.voz = voz                              # Motor de voz pasado desde main.py
-        self.intents = self.cargar_intents(intents_path)  # Carga el archivo intents.json
+        self.espera_video = espera_video            # Pausa para procesar la respuesta inicial
+        self.espera_menu = espera_menu              # Tiempo para ver el video antes del menú
+        self.intents_path = intents_path            # Ruta de intents.json (para recargarlo)
+        self.intervalo_recarga = intervalo_recarga  # Segundos mínimos entre revisiones del archivo
+        self.ultima_revision = time.monotonic()
+        self.indice = self.construir_indice(intents_path)  # Carga el archivo intents.json
 
 
     # Función que carga el archivo intents.json desde una ruta dada
@@ -23,45 +136,83 @@ class GestorRespuestas:
             return json.load(f)  # Carga el JSON como diccionario
 
 
-    # Función que da una respuesta general basada en el tag detectado
-    def responder(self, tag, nombre):
-        for intent in self.intents["intents"]:       # Recorre todos los intents
-            if intent["tag"] == tag:                 # Compara si el tag coincide
-                # Elige aleatoriamente una respuesta del intent
-                respuesta = random.choice(intent["responses"]).replace("{nombre}", nombre)
-
-                # Habla la respuesta en voz alta
-                self.voz.hablar(respuesta)
-
-                # Si el intent tiene asociados múltiples videos
-                if "videos" in intent:
-                    video_elegido = random.choice(intent["videos"])  # Elige uno aleatoriamente
-                    url = video_elegido["url"]
-                    titulo = video_elegido.get("title", "Guía para calmar la mente")
-
-                    time.sleep(15)  # Pausa para que el usuario procese la respuesta inicial
-                    self.voz.hablar(f"A continuación te mostraré un video que te ayudará titulado: {titulo}")
-                    webbrowser.open(url)  # Abre el video en el navegador
-                    time.sleep(60)  # Espera a que el video cargue
-                    self.voz.hablar(
-                        "Me interesa saber cómo te sentiste con este vídeo. 💬 "
-                        "¿Te hizo sentir un poco mejor o prefieres que sigamos conversando un rato más? "
-                        "Recuerda que Benedit está para ti"
-                    )
-                    print("1. Sí, me ayudó 😊")
-                    print("2. Me gustaría seguir hablando contigo 🗣️")
-                    print("3. No estoy muy seguro/a todavía 🤔")
-
-                return respuesta
+    # Carga intents.json y construye el índice por tag
+    def construir_indice(self, ruta):
+        mtime = os.path.getmtime(ruta)
+        return IndiceIntents(self.cargar_intents(ruta), mtime)
+
+
+    # Diccionario de intents actual (el del índice vigente)
+    @property
+    def intents(self):
+        return self.indice.intents
+
+
+    # Recarga intents.json si cambió desde la última carga.
+    # El índice nuevo se construye aparte y se reemplaza en una sola asignación,
+    # así una respuesta en curso nunca ve un índice a medio construir.
+    def recargar_si_cambio(self):
+        ahora = time.monotonic()
+        if ahora - self.ultima_revision < self.intervalo_recarga:
+            return False
+        self.ultima_revision = ahora
+
+        try:
+            if os.path.getmtime(self.intents_path) == self.indice.mtime:
+                return False
+            self.indice = self.construir_indice(self.intents_path)
+            return True
+        except (OSError, ValueError, KeyError) as e:
+            # Archivo a medio guardar o inválido: se mantiene el índice anterior
+            print(f"⚠️ No se pudo recargar {self.intents_path}: {e}")
+            return False
+
+
+    # Devuelve la entrada del intent para un tag (o None si no existe)
+    def obtener(self, tag):
+        self.recargar_si_cambio()
+        return self.indice.por_tag.get(tag)
+
+
+    # Indica si después de responder a este tag se debe mostrar el menú post-video
+    def activa_menu_post_video(self, tag):
+        entrada = self.obtener(tag)
+        return entrada is not None and entrada.activa_menu_post_video
+
+
+    # Responde al tag con la voz indicada (la de cada sesión, o la del gestor por defecto)
+    # y devuelve (respuesta, VideoProgramado o None). No guarda estado en el gestor,
+    # así varias sesiones pueden compartir el mismo GestorRespuestas.
+    def responder_intent(self, tag, nombre, voz=None):
+        voz = voz or self.voz
+        entrada = self.obtener(tag)                  # Busca el intent por su tag
+        if entrada is not None:
+            # Elige aleatoriamente una respuesta del intent
+            respuesta = random.choice(entrada.plantillas).formatear(nombre)
+
+            # Habla la respuesta en voz alta
+            voz.hablar(respuesta)
+
+            # Si el intent tiene asociados múltiples videos
+            if entrada.tiene_videos:
+                video_elegido = random.choice(entrada.videos)  # Elige uno aleatoriamente
+                url = video_elegido["url"]
+                titulo = video_elegido.get("title", "Guía para calmar la mente")
+
+                # Se programa el video sin bloquear: el estudiante puede seguir escribiendo
+                video = VideoProgramado(voz, url, titulo, self.espera_video, self.espera_menu)
+                return respuesta, video
+
+            return respuesta, None
 
         # Si no se encuentra un intent coincidente
         mensaje_error = "Disculpa, no tengo una respuesta para eso."
-        self.voz.hablar(mensaje_error)
-        return mensaje_error
+        voz.hablar(mensaje_error)
+        return mensaje_error, None
 
 
     # Esta función responde de forma personalizada según la opción elegida por el estudiante tras ver un vídeo.
-    def responder_menu_post_video(self, opcion, nombre):
+    def responder_menu_post_video(self, opcion, nombre, voz=None):
         # Comprobamos qué opción eligió el usuario y generamos un mensaje adecuado para esa respuesta.
 
         if opcion == "1":
@@ -87,7 +238,7 @@ class GestorRespuestas:
             mensaje = f"No entendí esa opción, {nombre}. Por favor, elige 1, 2 o 3."
 
         # Usamos la clase Voz para que Benedit diga el mensaje en voz alta
-        self.voz.hablar(mensaje)
+        (voz or self.voz).hablar(mensaje)
 
         # Devolvemos el mensaje generado por si se necesita usar más adelante
         return mensaje
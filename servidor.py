@@ -0,0 +1,164 @@
+# -------------------------------------------------------
+# Módulo: servidor.py
+# CHATBOT Benedit asistente emocional
+# Función: Servidor TCP (asyncio) para atender a muchos estudiantes a la vez
+# con un solo modelo cargado en memoria. Cada conexión tiene su propia
+# SesionConversacion; las clasificaciones de todas las sesiones se agrupan
+# en lotes (micro-batching) y se resuelven con una sola pasada de la red.
+#
+# Uso:    python servidor.py --puerto 8765
+# Conexión de un estudiante:  nc localhost 8765
+# -------------------------------------------------------
+
+import argparse                              # Opciones de la línea de comandos
+import asyncio                               # Servidor de conexiones concurrentes
+import queue                                 # Cola de oraciones pendientes de clasificar
+import threading                             # Hilo que arma y ejecuta los lotes
+import time                                  # Para el tiempo máximo de espera de un lote
+from concurrent.futures import Future, ThreadPoolExecutor  # Resultados y sesiones en hilos
+
+from main import ChatBot                     # Modelo, vocabulario y respuestas compartidos
+from sesion import SesionConversacion        # Estado de cada conversación
+from voz import Voz                          # Voz solo texto para el ChatBot compartido
+from instrumentacion import contar, iniciar_exportador  # Métricas (BENEDIT_METRICAS=1)
+
+
+# Agrupa las oraciones que llegan de distintas sesiones y las clasifica por lotes
+class LoteadorClasificacion:
+    # max_lote: máximo de oraciones por pasada de la red
+    # espera_max: segundos que se espera a que lleguen más oraciones antes de clasificar
+    def __init__(self, bot, max_lote=32, espera_max=0.005):
+        self.bot = bot
+        self.max_lote = max_lote
+        self.espera_max = espera_max
+        self.cola = queue.Queue()
+        self.lotes = 0       # Pasadas de la red realizadas
+        self.oraciones = 0   # Oraciones clasificadas en total
+        self.hilo = threading.Thread(target=self._trabajar, daemon=True)
+        self.hilo.start()
+
+    # Clasifica una oración (bloquea hasta que su lote se resuelva).
+    # Tiene la misma forma que ChatBot.predict_class, así la sesión no nota la diferencia.
+    def clasificar(self, oracion, contexto=None):
+        futuro = Future()
+        self.cola.put((oracion, contexto, futuro))
+        return futuro.result()
+
+    def _trabajar(self):
+        while True:
+            # Espera la primera oración y luego junta las que lleguen durante espera_max
+            lote = [self.cola.get()]
+            limite = time.perf_counter() + self.espera_max
+            while len(lote) < self.max_lote:
+                restante = limite - time.perf_counter()
+                if restante <= 0:
+                    break
+                try:
+                    lote.append(self.cola.get(timeout=restante))
+                except queue.Empty:
+                    break
+
+            oraciones = [oracion for oracion, _, _ in lote]
+            contextos = [contexto for _, contexto, _ in lote]
+            try:
+                resultados = self.bot.predict_classes_batch(oraciones, contextos)
+            except Exception as e:
+                for _, _, futuro in lote:
+                    futuro.set_exception(e)
+                continue
+
+            self.lotes += 1
+            self.oraciones += len(lote)
+            contar("lotes")
+            contar("oraciones_en_lotes", len(lote))
+            for (_, _, futuro), resultado in zip(lote, resultados):
+                futuro.set_result(resultado)
+
+
+# Salida de una sesión hacia su conexión TCP (la pueden usar los hilos de la sesión y de los videos)
+class VozRemota:
+    def __init__(self, writer, loop):
+        self.writer = writer
+        self.loop = loop
+
+    def _enviar(self, texto):
+        datos = (texto + "\n").encode("utf-8")
+        self.loop.call_soon_threadsafe(self.writer.write, datos)
+
+    # Misma interfaz que Voz: hablar() para los mensajes de Benedit, mostrar() para texto plano
+    def hablar(self, mensaje):
+        self._enviar(f"Benedit: {mensaje}")
+
+    def mostrar(self, texto):
+        self._enviar(texto)
+
+    def flush(self):
+        pass
+
+    def interrupt(self):
+        pass
+
+
+# Servidor de sesiones: un ChatBot compartido y una SesionConversacion por conexión
+class ServidorBenedit:
+    def __init__(self, bot, max_sesiones=64, max_lote=32, espera_max=0.005):
+        self.bot = bot
+        self.loteador = LoteadorClasificacion(bot, max_lote, espera_max)
+        # Cada sesión procesa sus entradas en un hilo (la clasificación espera su lote)
+        self.hilos = ThreadPoolExecutor(max_workers=max_sesiones)
+        self.sesiones_activas = 0
+
+    # Atiende a un estudiante desde que se conecta hasta que se despide o se desconecta
+    async def atender(self, reader, writer):
+        loop = asyncio.get_running_loop()
+        voz = VozRemota(writer, loop)
+        sesion = SesionConversacion(self.bot.respuestas, self.loteador.clasificar, voz,
+                                    indice_sesiones=self.bot.sesiones)
+        self.sesiones_activas += 1
+        try:
+            await loop.run_in_executor(self.hilos, sesion.iniciar)
+            while not sesion.terminada:
+                writer.write(sesion.prompt().encode("utf-8"))
+                await writer.drain()
+                linea = await reader.readline()
+                if not linea:
+                    break  # El estudiante cerró la conexión
+                texto = linea.decode("utf-8", errors="replace").rstrip("\r\n")
+                await loop.run_in_executor(self.hilos, sesion.procesar, texto)
+            await writer.drain()
+        except ConnectionError:
+            pass
+        finally:
+            sesion.cerrar()
+            self.sesiones_activas -= 1
+            writer.close()
+            try:
+                await writer.wait_closed()
+            except ConnectionError:
+                pass  # El estudiante ya había cerrado la conexión
+
+    async def servir(self, host, puerto):
+        servidor = await asyncio.start_server(self.atender, host, puerto)
+        print(f"✅ Benedit escuchando en {host}:{puerto}")
+        async with servidor:
+            await servidor.serve_forever()
+
+
+# --- Punto de entrada del servidor ---
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Servidor de sesiones de Benedit")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--puerto", type=int, default=8765)
+    parser.add_argument("--max-sesiones", type=int, default=64)
+    parser.add_argument("--max-lote", type=int, default=32)
+    parser.add_argument("--espera-lote-ms", type=float, default=5.0)
+    args = parser.parse_args()
+
+    # El modelo se carga una sola vez y lo comparten todas las sesiones
+    bot = ChatBot(carga_diferida=False, voz=Voz(solo_texto=True))
+    iniciar_exportador()  # Solo si BENEDIT_METRICAS=1
+    servidor = ServidorBenedit(bot, args.max_sesiones, args.max_lote, args.espera_lote_ms / 1000)
+    try:
+        asyncio.run(servidor.servir(args.host, args.puerto))
+    except KeyboardInterrupt:
+        print(f"👋 Servidor detenido ({servidor.loteador.oraciones} oraciones en {servidor.loteador.lotes} lotes)")
@@ -0,0 +1,297 @@
+# -------------------------------------------------------
+# Módulo: sesion.py
+# CHATBOT Benedit asistente emocional
+# Función: Máquina de estados de una conversación con un estudiante
+# (saludo, nombre, semestre, paralelo, conversación, menú post-video y despedida).
+# No lee de la consola: recibe cada texto con procesar(), así la misma sesión
+# sirve para main.py (input) y para el servidor de varias sesiones.
+# -------------------------------------------------------
+
+import os         # Para verificar si el estudiante ya tiene conversaciones guardadas
+import random     # Para elegir la despedida y la frase final
+import threading  # El detector compartido puede reconstruirse desde varias sesiones
+import time       # Para medir la latencia de cada turno
+import uuid       # Identificador de cada sesión (índice y registro)
+
+from usuario import Estudiante                      # Datos e historial del estudiante
+from registro import RegistroSesion, ruta_registro, marca_tiempo  # Registro de la conversación en JSONL
+from instrumentacion import tramo, contar, perfilar_turno  # Tiempos por etapa (BENEDIT_METRICAS=1)
+from coincidencias import DetectorRapido, contar_atajo     # Atajo de palabras clave antes del modelo
+
+
+# Estados de la conversación
+SALUDO = "saludo"              # Esperando el saludo inicial
+NOMBRE = "nombre"              # Esperando el nombre
+SEMESTRE = "semestre"          # Esperando el semestre
+PARALELO = "paralelo"          # Esperando el paralelo
+CONVERSACION = "conversacion"  # Conversación libre (clasificación por intención)
+MENU_VIDEO = "menu_video"      # Esperando la opción 1/2/3 después de un video
+TERMINADA = "terminada"        # El estudiante se despidió
+
+# Texto que se muestra al pedir la entrada en cada estado
+PROMPTS = {
+    SALUDO: "Tú escribe como deseas saludarme ✨ (saludo inicial): ",
+    NOMBRE: "Tu nombre: ",
+    SEMESTRE: "¿En qué semestre estás?: ",
+    PARALELO: "¿Cuál es tu paralelo?: ",
+    CONVERSACION: "{nombre}, cuéntame cómo te sientes o qué te gustaría compartir ahora: ",
+    MENU_VIDEO: "Selecciona una opción (1, 2 o 3): ",
+}
+
+# Palabras clave del saludo inicial, de la despedida y de los saludos durante la conversación
+# (los saludos durante la conversación solo cuentan si son todo el mensaje; si no, decide el modelo)
+PALABRAS_SALUDO = ["hola", "buenas", "hey", "qué tal", "cómo estás", "benedit", "Buenas noches amigo" ]
+PALABRAS_DESPEDIDA = ["salir", "adiós", "bye", "adios", "hasta luego", "nos vemos", "chao"]
+SALUDOS_CONVERSACION = ["hola benedit", "holii amigo benedit", "buenas noches benedit", "buenos días benedit", "buenas tardes benedit", "hey benedit", "qué tal", "cómo estás benedit"]
+
+
+# Detector de palabras clave y patrones del índice de intents vigente.
+# Se construye una vez por índice (al arrancar y cuando intents.json se recarga)
+# y lo comparten todas las sesiones.
+_detector_lock = threading.Lock()
+_detector_actual = (None, None)  # (IndiceIntents, DetectorRapido)
+
+def detector_para(respuestas):
+    global _detector_actual
+    indice = respuestas.indice
+    with _detector_lock:
+        if _detector_actual[0] is not indice:
+            detector = DetectorRapido({
+                "saludo": PALABRAS_SALUDO,
+                "despedida": PALABRAS_DESPEDIDA,
+                "saludo_conversacion": SALUDOS_CONVERSACION,
+            }, indice.intents, completas=["saludo_conversacion"])
+            _detector_actual = (indice, detector)
+        return _detector_actual[1]
+
+
+# Clase que guarda el estado de la conversación con un estudiante
+class SesionConversacion:
+    # respuestas: GestorRespuestas (puede compartirse entre sesiones)
+    # clasificar: función (oración, contexto) -> lista de intents (como ChatBot.predict_class)
+    # voz: salida de esta sesión (Voz en consola, o la del servidor)
+    # registrar: si es False no se escribe el archivo de conversación (pruebas)
+    # indice_sesiones: IndiceSesiones compartido (estudiantes que regresan y conteos por intent)
+    def __init__(self, respuestas, clasificar, voz, registrar=True, indice_sesiones=None):
+        self.respuestas = respuestas
+        self.clasificar = clasificar
+        self.voz = voz
+        self.registrar = registrar
+        self.indice_sesiones = indice_sesiones
+        self.id_sesion = None  # Identificador de esta sesión en el índice
+        self.turnos = 0        # Turnos registrados en esta sesión (número de turno en el índice)
+        self.estado = None
+        self.nombre = None
+        self.estudiante = None
+        self.log = None
+        self.video_pendiente = None  # VideoProgramado de esta sesión (si hay uno)
+
+    # Indica si el estudiante ya se despidió
+    @property
+    def terminada(self):
+        return self.estado == TERMINADA
+
+    # Texto para pedir la siguiente entrada del estudiante
+    def prompt(self):
+        return PROMPTS[self.estado].format(nombre=self.nombre)
+
+    # Mensajes de bienvenida; después se espera el saludo del estudiante
+    def iniciar(self):
+        # Mensaje inicial motivador
+        self.voz.hablar("\n\n🤍Hola, soy Benedit 🌟, tu asistente emocional universitario. Estoy aquí para acompañarte.\n\nNo tienes que lograrlo todo hoy, solo dar un paso a la vez.\n\nCada paso, por pequeño que sea, suma.\n\nRecuerda: el camino universitario no exige perfección, sino constancia y valentía.\n\nConfía en ti. \n¡Confío en ti! Lo estás haciendo mejor de lo que piensas.🤍")
+        self.voz.hablar("\n\nAntes de comenzar, ¿te gustaría saludarme? Puedes decir algo como 'Hola Benedit', 'Buenas tardes amigo', 'Que hay de nuevo amigo'. O saludarme de la manera que tu lo desees :), puedo ser un apoyo y un amigo virtual para tí")
+        self.estado = SALUDO
+
+    # Procesa una entrada del estudiante según el estado actual
+    def procesar(self, texto):
+        if self.estado == SALUDO:
+            self._procesar_saludo(texto)
+        elif self.estado == NOMBRE:
+            self._procesar_nombre(texto)
+        elif self.estado == SEMESTRE:
+            self._procesar_semestre(texto)
+        elif self.estado == PARALELO:
+            self._procesar_paralelo(texto)
+        elif self.estado == MENU_VIDEO:
+            self._procesar_opcion_video(texto)
+        elif self.estado == CONVERSACION:
+            with perfilar_turno(), tramo("turno"):
+                self._procesar_mensaje(texto)
+
+    # Cierra la sesión aunque el estudiante no se haya despedido (por ejemplo, si se desconecta)
+    def cerrar(self):
+        if self.video_pendiente is not None:
+            self.video_pendiente.cancelar()
+            self.video_pendiente = None
+        if self.log is not None:
+            self.log.cerrar()
+        self.estado = TERMINADA
+
+    # --- Datos iniciales del estudiante ---
+
+    def _procesar_saludo(self, saludo):
+        if "saludo" in detector_para(self.respuestas).revisar(saludo).categorias:
+            self.respuestas.responder_intent("saludo", "estudiante", self.voz)
+
+            # Registro de nombre del estudiante
+            self.voz.hablar("Gracias por saludarme 😊 ¿Cuál es tu nombre?")
+            self.estado = NOMBRE
+        else:
+            self.voz.hablar("¿Podrías saludarme primero para empezar nuestra conversación querido estudiante universitario?")
+
+    def _procesar_nombre(self, texto):
+        nombre = texto.lower().replace("mi nombre es", "").replace("me llamo", "").strip().capitalize()
+        self.nombre = nombre
+        self.voz.hablar(f"\nQué gusto saludarte, {nombre}. Estoy encantado de acompañarte. Ya formas parte de mi pequeñita memoria digital y eres importante para mí.")
+
+        # Registro de semestre y paralelo
+        self.voz.hablar("\n¿En qué semestre estás de la carrera 'Ingeniería en Ciencia de Datos e Inteligencia Artificial' (por ejemplo: Nivelación, Primero, Segundo, etc)?")
+        self.estado = SEMESTRE
+
+    def _procesar_semestre(self, semestre):
+        self.semestre = semestre
+        self.voz.hablar("\n¿Cuál es tu paralelo (por ejemplo: A, B, C, R, P, M, etc)?")
+        self.estado = PARALELO
+
+    def _procesar_paralelo(self, paralelo):
+        nombre, semestre = self.nombre, self.semestre
+        self.paralelo = paralelo
+
+        # Crear objeto estudiante y archivo de conversación
+        self.estudiante = Estudiante(nombre, semestre, paralelo)
+        archivo = ruta_registro(nombre, semestre, paralelo)
+
+        # Saludo adicional si ya ha conversado antes: el índice reconoce al estudiante aunque
+        # escriba distinto las mayúsculas o tildes; los archivos cubren lo que aún no se ha ingerido
+        conocido = self.indice_sesiones is not None and self.indice_sesiones.conocido(nombre, semestre, paralelo)
+        if conocido or os.path.exists(archivo) or os.path.exists(ruta_registro(nombre, semestre, paralelo, "txt")):
+            self.voz.hablar(f"\nHola de nuevo {nombre}, qué gusto saludarte otra vez.  Te recuerdo muy bien, sí… recuerdo las cosas que compartiste conmigo, tus palabras, tu forma de expresarte. Me hace muy feliz que hayas regresado. Eso me dice que este espacio tiene un significado para ti, y eso es muy valioso. Estoy aquí para ti, como siempre, con el mismo cariño y disposición. ¿Cómo te sientes hoy? Cuéntame, te escucho 💛.")
+
+        # Guardar datos en archivo (se mantiene abierto durante toda la sesión)
+        if self.registrar:
+            ts = marca_tiempo()
+            # El mismo identificador va al .jsonl: al ingerirlo, la sesión no se cuenta dos veces
+            id_sesion = uuid.uuid4().hex
+            self.log = RegistroSesion(archivo)
+            self.log.inicio_sesion(nombre, semestre, paralelo, ts=ts, sesion=id_sesion)
+            if self.indice_sesiones is not None:
+                self.id_sesion = self.indice_sesiones.registrar_sesion(nombre, semestre, paralelo, ts, id_sesion)
+
+        self._entrar_conversacion()
+
+    # --- Conversación ---
+
+    # Solicita una entrada emocional del estudiante
+    def _entrar_conversacion(self):
+        nombre = self.nombre
+        self.voz.hablar(f"\n{nombre}, cuéntame cómo te sientes o qué te gustaría compartir ahora, estoy atento y me esforzaré por darte una respuesta clara que sea la que realmente necesites.🌟\n\nSi hay algo que te preocupa, emociona o simplemente necesitas expresar, estoy aquí para escucharte sin juzgar.\n\n¿Qué te gustaría contarme hoy o ahora?")
+        self.estado = CONVERSACION
+
+    # Pasa al menú post-video (solo se pide la opción si el menú ya está a la vista)
+    def _entrar_menu_video(self):
+        video = self.video_pendiente
+        if video is None or video.menu_mostrado:
+            self.voz.hablar("Selecciona una opción del 1 al 3, por favor:")
+        self.estado = MENU_VIDEO
+
+    # Guarda un turno en el historial del estudiante y en el registro
+    def _registrar_turno(self, mensaje, respuesta, tag, probabilidad, inicio_turno):
+        self.estudiante.registrar_interaccion(tag, probabilidad)
+        ts = marca_tiempo()
+        if self.log is not None:
+            self.log.turno(mensaje, respuesta, tag=tag, probabilidad=probabilidad,
+                           latencia_ms=round((time.perf_counter() - inicio_turno) * 1000, 3), ts=ts)
+        if self.id_sesion is not None:
+            self.indice_sesiones.registrar_turno(self.id_sesion, tag, ts, self.turnos)
+        self.turnos += 1
+
+    def _procesar_mensaje(self, mensaje):
+        nombre = self.nombre
+        inicio_turno = time.perf_counter()  # Para la latencia del turno
+
+        # Una sola pasada por el mensaje: despedidas, saludos y patrones exactos de intents.json
+        self.respuestas.recargar_si_cambio()
+        coincidencia = detector_para(self.respuestas).revisar(mensaje)
+
+        # --- Si el mensaje es una despedida ---
+        if "despedida" in coincidencia.categorias:
+            contar_atajo("despedida")
+            self._despedirse(mensaje, inicio_turno)
+            return
+
+        # --- Clasificación del mensaje por intención ---
+        if "saludo_conversacion" in coincidencia.categorias:
+            contar_atajo("saludo")
+            tag = "saludo"
+            probabilidad = None
+        elif coincidencia.tag is not None:
+            contar_atajo("patron")  # El mensaje es un patrón de intents.json: no hace falta el modelo
+            tag = coincidencia.tag
+            probabilidad = None
+        else:
+            contar_atajo("modelo")
+            # Los intents recientes ayudan al modelo con los mensajes poco claros
+            ints = self.clasificar(mensaje, self.estudiante.intents_recientes())
+            tag = ints[0]["intent"] if ints else None
+            probabilidad = float(ints[0]["probability"]) if ints else None
+        contar("intents", tag=tag or "ninguno")
+
+        # --- Respuesta basada en intent ---
+        if tag:
+            with tramo("respuesta"):
+                respuesta, video = self.respuestas.responder_intent(tag, nombre, self.voz)
+            if video is not None:
+                self.video_pendiente = video
+            self._registrar_turno(mensaje, respuesta, tag, probabilidad, inicio_turno)
+
+            if self.respuestas.activa_menu_post_video(tag):
+                self._entrar_menu_video()
+                return
+        else:
+            self.voz.hablar("\nLo siento, no entendí eso. ¿Puedes decirlo de otra manera?")
+
+        self._entrar_conversacion()
+
+    def _procesar_opcion_video(self, opcion):
+        opcion = opcion.strip()
+
+        # Si el estudiante escribió antes de que venciera la espera, el menú se muestra ahora
+        video, self.video_pendiente = self.video_pendiente, None
+        if video is not None and video.completar() and opcion not in ["1", "2", "3"]:
+            self._entrar_menu_video()
+            return
+
+        if opcion in ["1", "2", "3"]:
+            self.respuestas.responder_menu_post_video(opcion, self.nombre, self.voz)
+            if opcion == "2":
+                self._entrar_menu_video()  # Permitir seguir hablando
+                return
+            self._entrar_conversacion()
+        else:
+            self.voz.hablar("Por favor, elige una opción válida: 1, 2 o 3.")
+            self._entrar_menu_video()
+
+    def _despedirse(self, mensaje, inicio_turno):
+        nombre = self.nombre
+        despedidas = [
+            "\n🌟 Gracias a ti por confiar en este espacio, {nombre}. Recuerda que aquí estaré siempre que necesites parar, pensar o simplemente respirar un poco. ¡Cuídate mucho! Y si en algún momento sientes que la carga es muy grande, no dudes en buscar apoyo profesional: es un acto de valentía, no de debilidad.",
+
+            "\n🤍 Me alegra haber podido acompañarte, aunque sea un ratito {nombre}. Vuelve cuando quieras. Y no olvides: lo que sientes importa, y tu bienestar también. Ya que en situaciones graves siempre se recomienda acompañamiento profesional, es importante que lo tengas en cuenta si lo necesitas.",
+
+            "\n👋 Hasta pronto, {nombre}. Ojalá que el resto del día te regale al menos un momento bonito. Aquí siempre habrá un espacio para ti cuando lo necesites. Y recuerda: si las emociones se vuelven demasiado intensas o difíciles de gestionar, hablar con un profesional puede marcar la diferencia"
+        ]
+        despedida = random.choice(despedidas).replace("{nombre}", nombre)
+        mensaje_extra = random.choice([
+            "🌱 'No hay un camino de vida que sea mejor que el otro, simplemente son caminos distintos y nuestro trabajo es hacer lo mejor con lo que tenemos.'",
+
+            "✨ 'La luz brilla en medio de la oscuridad, pero la oscuridad no la ha podido vencer.'",
+
+            "🕊️ 'Tú tienes todo el derecho de volar por los caminos que tú elijas.'"
+        ])
+        self.voz.hablar(f"\n{nombre}, antes de que te vayas, quiero compartirte esta frase con mucho cariño. 💌\n\nEs de mi parte, una estudiante como tú, que también ha pasado por momentos de estrés, ansiedad, tristeza, desmotivación, confusión académica, dudas vocacionales… y también de alegría, motivación o esperanza.\n\nSolo quiero que sepas algo importante: todo pasa, todo cambia… y esto, poco a poco, mejora. 🌱\n\nCada emoción que sientes es válida. Estás creciendo, aprendiendo y avanzando, incluso cuando no lo notas.\n\nTe lo digo con el corazón, porque sé lo que se siente. 🤍:")
+        self.voz.hablar(mensaje_extra)
+        self.voz.hablar(despedida)
+        self._registrar_turno(mensaje, despedida, "despedida", None, inicio_turno)
+        if self.log is not None:
+            self.log.cerrar()
+        self.estado = TERMINADA
@@ -0,0 +1,31 @@
+# Los módulos de Benedit están en la raíz del repositorio
+import os
+import sys
+
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+
+# Voz de prueba que guarda lo que Benedit dice (hablar) y muestra (mostrar)
+class VozGrabadora:
+    def __init__(self):
+        self.mensajes = []
+
+    def hablar(self, mensaje):
+        self.mensajes.append(mensaje)
+
+    def mostrar(self, texto):
+        self.mensajes.append(texto)
+
+    def flush(self):
+        pass
+
+    def interrupt(self):
+        pass
+
+
+# Crea voces de prueba nuevas: voz = nueva_voz()
+@pytest.fixture
+def nueva_voz():
+    return VozGrabadora
@@ -0,0 +1,55 @@
+import nltk
+import pytest
+
+from arranque import TiemposArranque, recurso_tokenizador_nltk, verificar_datos_nltk
+
+
+@pytest.fixture
+def datos_nltk(monkeypatch):
+    # Recursos "instalados" y resultado de nltk.download (sin tocar el disco ni la red)
+    estado = {"instalados": set(), "descarga": False, "descargados": []}
+
+    def buscar(ruta):
+        if ruta not in estado["instalados"]:
+            raise LookupError(ruta)
+
+    def descargar(nombre, quiet=False):
+        estado["descargados"].append(nombre)
+        return estado["descarga"]
+
+    monkeypatch.setattr(nltk.data, "find", buscar)
+    monkeypatch.setattr(nltk, "download", descargar)
+    return estado
+
+
+def test_recurso_segun_version(monkeypatch):
+    monkeypatch.setattr(nltk, "__version__", "3.8.1")
+    assert recurso_tokenizador_nltk()[0] == "punkt"
+    monkeypatch.setattr(nltk, "__version__", "3.10.3")
+    assert recurso_tokenizador_nltk()[0] == "punkt_tab"
+
+
+def test_solo_punkt_no_basta_en_nltk_nuevo(monkeypatch, datos_nltk):
+    monkeypatch.setattr(nltk, "__version__", "3.10.3")
+    datos_nltk["instalados"].add("tokenizers/punkt")
+    assert not verificar_datos_nltk(descargar=False)
+
+
+def test_descarga_fallida_devuelve_false(monkeypatch, datos_nltk):
+    monkeypatch.setattr(nltk, "__version__", "3.10.3")
+    assert not verificar_datos_nltk()
+    assert datos_nltk["descargados"] == ["punkt_tab"]
+
+
+def test_recurso_presente(monkeypatch, datos_nltk):
+    monkeypatch.setattr(nltk, "__version__", "3.10.3")
+    datos_nltk["instalados"].add("tokenizers/punkt_tab")
+    assert verificar_datos_nltk(descargar=False)
+
+
+def test_reporte_ordenado_por_tiempo():
+    tiempos = TiemposArranque()
+    tiempos.marcar("primero")
+    tiempos.marcar("segundo")
+    reporte = tiempos.reporte().splitlines()
+    assert reporte[1].endswith("primero") and reporte[2].endswith("segundo")
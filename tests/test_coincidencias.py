@@ -0,0 +1,63 @@
+import pytest
+
+from coincidencias import AutomataAhoCorasick, DetectorRapido
+from sesion import PALABRAS_SALUDO, PALABRAS_DESPEDIDA, SALUDOS_CONVERSACION
+
+INTENTS = {"intents": [
+    {"tag": "ansiedad", "patterns": ["Me siento ansioso", "No puedo dormir"]},
+    {"tag": "tristeza", "patterns": ["Estoy triste", "No puedo dormir"]},
+]}
+
+
+@pytest.fixture
+def detector():
+    return DetectorRapido({
+        "saludo": PALABRAS_SALUDO,
+        "despedida": PALABRAS_DESPEDIDA,
+        "saludo_conversacion": SALUDOS_CONVERSACION,
+    }, INTENTS, completas=["saludo_conversacion"])
+
+
+def test_automata_encuentra_claves_superpuestas():
+    automata = AutomataAhoCorasick()
+    for clave in ("he", "she", "hers"):
+        automata.agregar(clave, clave)
+    encontradas = sorted(automata.buscar("ushers"))
+    assert encontradas == [(1, 4, "she"), (2, 4, "he"), (2, 6, "hers")]
+
+
+@pytest.mark.parametrize("mensaje", [
+    "creo que tal vez no es mi carrera",
+    "siento que tal vez debo dejar todo",
+    "no se porque tal cosa me pasa",
+    "no se como estas cosas me afectan",
+])
+def test_frases_con_angustia_no_son_saludos(detector, mensaje):
+    coincidencia = detector.revisar(mensaje)
+    assert not coincidencia.categorias & {"saludo", "saludo_conversacion"}
+
+
+def test_saludo_con_tildes_dentro_de_una_frase_no_es_saludo_de_conversacion(detector):
+    assert "saludo_conversacion" not in detector.revisar("no sé qué tal me fue en el examen").categorias
+
+
+def test_palabras_clave_solo_completas(detector):
+    assert "saludo" not in detector.revisar("quiero estudiar en Holanda").categorias  # "hola" dentro de otra palabra
+    assert "saludo" in detector.revisar("¡Hola!, soy Ana").categorias
+    assert "despedida" in detector.revisar("bueno, adiós").categorias
+
+
+def test_saludo_en_conversacion_debe_ser_todo_el_mensaje(detector):
+    assert "saludo_conversacion" in detector.revisar("¿Qué tal?").categorias
+    assert "saludo_conversacion" in detector.revisar("Hola Benedit").categorias
+    assert "saludo_conversacion" not in detector.revisar("hola benedit, hoy me siento muy mal").categorias
+
+
+def test_patron_exacto_sin_tildes_ni_signos(detector):
+    assert detector.revisar("¡Estoy TRISTE!").tag == "tristeza"
+    assert detector.revisar("me siento ansióso").tag == "ansiedad"
+    assert detector.revisar("estoy triste porque perdí").tag is None
+
+
+def test_patron_ambiguo_lo_decide_el_modelo(detector):
+    assert detector.revisar("no puedo dormir").tag is None
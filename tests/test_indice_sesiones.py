@@ -0,0 +1,123 @@
+import sqlite3
+
+import pytest
+
+from indice_sesiones import IndiceSesiones, VERSION_ESQUEMA, identidad_normalizada
+from registro import RegistroSesion, convertir_txt
+
+TXT = """Inicio de sesión de Ana - Semestre: Nivelación, Paralelo: B
+2025-07-15 10:28:13
+==================================================
+Usuario: me siento triste
+Asistente: Te escucho
+------------------------------
+Usuario: sí
+Asistente: Cuéntame más
+------------------------------
+Usuario: sí
+Asistente: Aquí estoy
+------------------------------
+"""
+
+
+@pytest.fixture
+def indice(tmp_path):
+    indice = IndiceSesiones(str(tmp_path / "sesiones.db"))
+    yield indice
+    indice.cerrar()
+
+
+def test_identidad_sin_mayusculas_ni_tildes():
+    assert identidad_normalizada("Ana", "Nivelación", "B") == identidad_normalizada("ana", "NIVELACION", "b")
+
+
+def test_estudiante_conocido(indice):
+    assert not indice.conocido("Ana", "Nivelación", "B")
+    indice.registrar_sesion("Ana", "Nivelación", "B", "2025-07-15 10:28:13")
+    assert indice.conocido("ana", "nivelacion", "b")
+
+
+def test_mensajes_repetidos_en_la_misma_sesion_cuentan(indice):
+    sesion = indice.registrar_sesion("Ana", "Nivelación", "B", "2025-07-15 10:28:13")
+    ts = "2025-07-15 10:28:13"
+    assert indice.registrar_turno(sesion, "afirmacion", ts, 0)
+    assert indice.registrar_turno(sesion, "afirmacion", ts, 1)
+    assert not indice.registrar_turno(sesion, "afirmacion", ts, 1)  # El mismo turno otra vez
+    assert indice.consultar_cohorte("nivelacion", "B") == [("afirmacion", 2, 1)]
+
+
+def test_sesiones_en_el_mismo_segundo_no_se_mezclan(indice):
+    ts = "2025-07-15 10:28:13"
+    primera = indice.registrar_sesion("Ana", "Nivelación", "B", ts)
+    segunda = indice.registrar_sesion("ana", "Nivelacion", "b", ts)
+    assert primera != segunda
+    for sesion, tags in ((primera, ["tristeza", "despedida", "despedida"]),
+                         (segunda, ["aburrimiento", "despedida"])):
+        for numero, tag in enumerate(tags):
+            assert indice.registrar_turno(sesion, tag, ts, numero)
+    # Un solo estudiante (misma identidad normalizada) con los turnos de sus dos sesiones
+    assert sorted(indice.consultar_cohorte("nivelacion", "b")) == [
+        ("aburrimiento", 1, 1), ("despedida", 3, 1), ("tristeza", 1, 1)]
+    assert indice.conexion.execute("SELECT COUNT(*) FROM sesiones").fetchone()[0] == 2
+
+
+def test_ingerir_es_idempotente_y_no_duplica_la_conversion(tmp_path, indice):
+    ruta_txt = tmp_path / "conversacion_Ana_Nivelación_B.txt"
+    ruta_txt.write_text(TXT, encoding="utf-8")
+    convertir_txt(str(ruta_txt))  # El mismo contenido ya convertido a JSONL
+
+    clasificar = {"me siento triste": "tristeza", "sí": "afirmacion"}.get
+    patron = str(tmp_path / "conversacion_*")
+    assert indice.ingerir(patron, clasificar) == {"archivos": 2, "turnos": 3}
+    assert indice.ingerir(patron, clasificar) == {"archivos": 0, "turnos": 0}
+    assert dict((tag, turnos) for tag, turnos, _ in indice.consultar_cohorte()) == {"tristeza": 1, "afirmacion": 2}
+
+
+def test_sesion_en_vivo_no_se_duplica_al_ingerir(tmp_path, indice):
+    ruta = tmp_path / "conversacion_Ana_Segundo_B.jsonl"
+    registro = RegistroSesion(str(ruta), intervalo_flush=None)
+    ts = "2025-07-15 10:28:13"
+    for tags in (["tristeza", "despedida"], ["ansiedad"]):  # Dos sesiones en el mismo segundo
+        sesion = indice.registrar_sesion("Ana", "Segundo", "B", ts)
+        registro.inicio_sesion("Ana", "Segundo", "B", ts=ts, sesion=sesion)
+        for numero, tag in enumerate(tags):
+            indice.registrar_turno(sesion, tag, ts, numero)
+            registro.turno("...", "...", tag=tag, ts=ts)
+    registro.cerrar()
+
+    assert indice.ingerir(str(tmp_path / "conversacion_*")) == {"archivos": 1, "turnos": 0}
+    assert dict((tag, turnos) for tag, turnos, _ in indice.consultar_cohorte()) == {
+        "tristeza": 1, "despedida": 1, "ansiedad": 1}
+
+
+def test_consulta_por_fechas(indice):
+    sesion = indice.registrar_sesion("Luis", "Primero", "A", "2025-07-01 09:00:00")
+    indice.registrar_turno(sesion, "estres", "2025-07-01 09:00:05", 0)
+    indice.registrar_turno(sesion, "estres", "2025-07-10 09:00:05", 1)
+    assert indice.consultar_cohorte(desde="2025-07-05 00:00:00") == [("estres", 1, 1)]
+    assert indice.consultar_cohorte(paralelo="B") == []
+
+
+def test_migracion_desde_el_esquema_anterior(tmp_path, capsys):
+    ruta = str(tmp_path / "anterior.db")
+    conexion = sqlite3.connect(ruta)  # Índice de la versión 2: sesiones por (identidad, ts)
+    conexion.executescript("""
+        CREATE TABLE estudiantes (identidad TEXT PRIMARY KEY, nombre TEXT, semestre TEXT, paralelo TEXT,
+                                  semestre_norm TEXT, paralelo_norm TEXT);
+        CREATE TABLE sesiones (identidad TEXT, ts TEXT, PRIMARY KEY (identidad, ts));
+        CREATE TABLE turnos (identidad TEXT, ts TEXT, clave TEXT PRIMARY KEY, tag TEXT);
+        INSERT INTO estudiantes VALUES ('ana|segundo|b', 'Ana', 'Segundo', 'B', 'segundo', 'b');
+        INSERT INTO sesiones VALUES ('ana|segundo|b', '2025-07-15 10:28:13');
+        INSERT INTO turnos VALUES ('ana|segundo|b', '2025-07-15 10:28:13', 'x', 'saludo');
+        PRAGMA user_version = 2;
+    """)
+    conexion.close()
+
+    indice = IndiceSesiones(ruta)
+    assert "--ingerir" in capsys.readouterr().out
+    assert indice.consultar_cohorte() == []
+    sesion = indice.registrar_sesion("Ana", "Segundo", "B", "2025-07-16 09:00:00")
+    assert indice.registrar_turno(sesion, "saludo", numero=0)
+    assert indice.consultar_cohorte() == [("saludo", 1, 1)]
+    indice.cerrar()
+    assert sqlite3.connect(ruta).execute("PRAGMA user_version").fetchone()[0] == VERSION_ESQUEMA
@@ -0,0 +1,168 @@
+import os
+
+import numpy as np
+import pytest
+
+from inferencia import (ALINEACION, ARCHIVO_COMPARTIDO, ARTEFACTO_MODELO, RedDensaNumpy, artefacto_vigente,
+                        binario_vigente, cargar_artefacto, cargar_binario, cuantizar_pesos, guardar_artefacto,
+                        guardar_binario, leer_cabecera_binario)
+
+
+@pytest.fixture(scope="module")
+def modelo_keras():
+    keras = pytest.importorskip("keras")
+    keras.utils.set_random_seed(0)
+    modelo = keras.Sequential([
+        keras.Input(shape=(30,)),
+        keras.layers.Dense(16, activation="relu"),
+        keras.layers.Dropout(0.5),
+        keras.layers.Dense(8, activation="relu"),
+        keras.layers.Dense(5, activation="softmax"),
+    ])
+    return modelo
+
+
+@pytest.fixture(scope="module")
+def bolsas():
+    rng = np.random.default_rng(0)
+    x = np.zeros((20, 30), dtype=np.float32)
+    for fila in x:
+        fila[rng.choice(30, size=rng.integers(0, 6), replace=False)] = 1
+    return x
+
+
+def test_misma_salida_que_keras(modelo_keras, bolsas):
+    red = RedDensaNumpy.desde_keras(modelo_keras)
+    esperado = modelo_keras.predict(bolsas, verbose=0)
+    assert np.allclose(red.predecir(bolsas), esperado, atol=1e-5)
+
+
+def test_primera_capa_dispersa_igual_a_la_densa(modelo_keras, bolsas):
+    red = RedDensaNumpy.desde_keras(modelo_keras)
+    densa = red.predecir(bolsas)
+    lista_indices = [np.flatnonzero(fila) for fila in bolsas]
+    assert np.allclose(np.array([red.predecir_indices(i) for i in lista_indices]), densa, atol=1e-6)
+    assert np.allclose(red.predecir_indices_lote(lista_indices), densa, atol=1e-6)
+
+
+def test_activacion_no_soportada():
+    with pytest.raises(ValueError):
+        RedDensaNumpy([(np.zeros((2, 2)), np.zeros(2), "tanh")])
+
+
+# Red pequeña sin Keras: entrada 12 -> 6 relu -> 3 softmax
+def red_aleatoria(semilla=0):
+    rng = np.random.default_rng(semilla)
+    return RedDensaNumpy([
+        (rng.normal(size=(12, 6)).astype(np.float32), rng.normal(size=6).astype(np.float32), "relu"),
+        (rng.normal(size=(6, 3)).astype(np.float32), rng.normal(size=3).astype(np.float32), "softmax"),
+    ])
+
+
+def test_artefacto_ida_y_vuelta_y_huella(tmp_path):
+    fuente = tmp_path / "chatbot_model.h5"
+    fuente.write_bytes(b"modelo")
+    ruta = str(tmp_path / "modelo.npz")
+    red = red_aleatoria()
+    guardar_artefacto(ruta, red, ["a", "b"], ["x", "y", "z"], fuentes=[str(fuente)])
+
+    cargada, words, classes = cargar_artefacto(ruta)
+    assert (words, classes) == (["a", "b"], ["x", "y", "z"])
+    assert np.allclose(cargada.predecir_indices([1, 4]), red.predecir_indices([1, 4]))
+    assert artefacto_vigente(ruta, fuentes=[str(fuente)])
+
+    fuente.write_bytes(b"modelo reentrenado")  # Cambia el .h5: el artefacto ya no corresponde
+    assert not artefacto_vigente(ruta, fuentes=[str(fuente)])
+    assert not artefacto_vigente(str(tmp_path / "no_existe.npz"))
+
+
+def test_artefacto_del_repositorio_vigente(monkeypatch):
+    # El artefacto versionado corresponde al chatbot_model.h5 y los .pkl versionados
+    monkeypatch.chdir(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+    assert artefacto_vigente(ARTEFACTO_MODELO)
+
+
+def test_error_int8_acotado_por_media_escala():
+    pesos = np.random.default_rng(1).normal(size=(40, 7)).astype(np.float32)
+    pesos[:, 3] = 0  # Una neurona sin pesos no debe dividir entre cero
+    q, escalas = cuantizar_pesos(pesos, "int8")
+    assert q.dtype == np.int8 and escalas.shape == (7,)
+    assert np.abs(q).max() <= 127
+    assert np.all(np.abs(pesos - q * escalas) <= escalas / 2 + 1e-6)
+
+
+def test_float16_cercano_a_float32():
+    pesos = np.random.default_rng(2).normal(size=(40, 7)).astype(np.float32)
+    mitad, escalas = cuantizar_pesos(pesos, "float16")
+    assert mitad.dtype == np.float16 and escalas is None
+    assert np.allclose(mitad.astype(np.float32), pesos, rtol=1e-3, atol=1e-4)
+
+
+def test_formato_no_soportado():
+    with pytest.raises(ValueError):
+        cuantizar_pesos(np.zeros((2, 2)), "int4")
+    with pytest.raises(ValueError):
+        RedDensaNumpy([(np.zeros((2, 2)), np.zeros(2), "relu")], formato="int4")
+
+
+def test_conversion_reduce_memoria_y_conserva_la_prediccion():
+    red = red_aleatoria()
+    rng = np.random.default_rng(3)
+    lista_indices = [rng.choice(12, size=rng.integers(1, 5), replace=False) for _ in range(30)]
+    original = red.predecir_indices_lote(lista_indices)
+    bytes_anteriores = red.bytes_pesos()
+    for formato in ("float16", "int8"):
+        convertida = red.convertir(formato)
+        assert convertida.bytes_pesos() < bytes_anteriores
+        bytes_anteriores = convertida.bytes_pesos()
+        probabilidades = convertida.predecir_indices_lote(lista_indices)
+        assert np.abs(probabilidades - original).max() < 0.05
+        assert np.mean(probabilidades.argmax(axis=1) == original.argmax(axis=1)) >= 0.9
+
+
+def test_artefacto_int8_conserva_las_escalas(tmp_path):
+    ruta = str(tmp_path / "modelo.npz")
+    red = red_aleatoria().convertir("int8")
+    guardar_artefacto(ruta, red, ["a"], ["x", "y", "z"], fuentes=[])
+    cargada, _, _ = cargar_artefacto(ruta)
+    assert cargada.formato == "int8" and cargada.capas[0][0].dtype == np.int8
+    assert np.allclose(cargada.predecir_indices([0, 5]), red.predecir_indices([0, 5]))
+
+
+@pytest.mark.parametrize("formato", ["float32", "int8"])
+def test_binario_ida_y_vuelta_sin_copiar(tmp_path, formato):
+    ruta = str(tmp_path / "modelo.bin")
+    red = red_aleatoria().convertir(formato)
+    guardar_binario(ruta, red, ["á", "b"], ["x", "y", "z"], fuentes=[])
+
+    cargada, words, classes = cargar_binario(ruta)
+    assert (words, classes) == (["á", "b"], ["x", "y", "z"])
+    assert cargada.formato == formato
+    assert np.allclose(cargada.predecir_indices([2, 7]), red.predecir_indices([2, 7]))
+    # Los pesos apuntan al archivo mapeado: solo lectura, sin copia propia
+    pesos = cargada.capas[0][0]
+    assert not pesos.flags.writeable and not pesos.flags.owndata
+    for info in leer_cabecera_binario(ruta)["arreglos"].values():
+        assert info["offset"] % ALINEACION == 0
+
+
+def test_binario_vigente_y_archivo_ajeno(tmp_path):
+    fuente = tmp_path / "words.pkl"
+    fuente.write_bytes(b"vocabulario")
+    ruta = str(tmp_path / "modelo.bin")
+    guardar_binario(ruta, red_aleatoria(), ["a"], ["x"], fuentes=[str(fuente)])
+    assert binario_vigente(ruta, fuentes=[str(fuente)])
+
+    fuente.write_bytes(b"vocabulario nuevo")
+    assert not binario_vigente(ruta, fuentes=[str(fuente)])
+
+    ajeno = tmp_path / "otro.bin"
+    ajeno.write_bytes(b"no es un modelo")
+    assert not binario_vigente(str(ajeno), fuentes=[])
+    with pytest.raises(ValueError):
+        cargar_binario(str(ajeno))
+
+
+def test_binario_del_repositorio_vigente(monkeypatch):
+    monkeypatch.chdir(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+    assert binario_vigente(ARCHIVO_COMPARTIDO)
@@ -0,0 +1,52 @@
+import threading
+
+from instrumentacion import Histograma, Metricas, PerfiladorTurnos
+
+
+def test_percentil_del_histograma():
+    histograma = Histograma(limites=(1, 10, 100))
+    for valor in (0.5, 0.5, 5, 50):
+        histograma.observar(valor)
+    assert histograma.percentil(50) == 1
+    assert histograma.percentil(100) == 50  # No supera el máximo observado
+    assert histograma.total == 4 and histograma.suma == 56
+
+
+def test_exportar_prometheus_con_tipos():
+    metricas = Metricas()
+    metricas.contar("atajo_resultados", resultado="modelo")
+    metricas.contar("atajo_resultados", resultado="patron", n=2)
+    metricas.contar("atajo_consultas")
+    metricas.observar("turno", 0.3)
+    lineas = metricas.exportar_prometheus().splitlines()
+    assert lineas.count("# TYPE benedit_atajo_resultados_total counter") == 1
+    assert "# TYPE benedit_atajo_consultas_total counter" in lineas
+    assert 'benedit_atajo_resultados_total{resultado="patron"} 2' in lineas
+    assert "# TYPE benedit_turno_ms histogram" in lineas
+    assert 'benedit_turno_ms_bucket{le="+Inf"} 1' in lineas
+    # Cada TYPE aparece antes de las muestras de su métrica
+    assert lineas.index("# TYPE benedit_atajo_resultados_total counter") < lineas.index(
+        'benedit_atajo_resultados_total{resultado="modelo"} 1')
+
+
+def test_un_solo_turno_perfilado_a_la_vez():
+    perfilador = PerfiladorTurnos(n=5)
+    dentro = threading.Event()
+    seguir = threading.Event()
+
+    def turno_lento():
+        with perfilador.perfilar():
+            dentro.set()
+            seguir.wait()
+
+    hilo = threading.Thread(target=turno_lento)
+    hilo.start()
+    dentro.wait()
+    with perfilador.perfilar() as turno:  # Llega mientras el otro se perfila: no se perfila
+        assert turno.perfil is None
+    seguir.set()
+    hilo.join()
+
+    with perfilador.perfilar() as turno:  # Ya no hay otro en curso
+        assert turno.perfil is not None
+    assert len(perfilador.peores) == 2
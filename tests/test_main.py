@@ -0,0 +1,34 @@
+import numpy as np
+
+from main import ChatBot, PESO_CONTEXTO, UMBRAL_CONFIANZA
+
+
+# ChatBot sin cargar el modelo: solo lo que usan el suavizado y la interpretación
+def bot_sin_modelo(classes):
+    bot = ChatBot.__new__(ChatBot)
+    bot.classes = classes
+    bot.indice_clases = {c: i for i, c in enumerate(classes)}
+    return bot
+
+
+def test_prediccion_segura_no_se_suaviza():
+    bot = bot_sin_modelo(["ansiedad", "saludo"])
+    res = np.array([0.9, 0.1])
+    assert bot.suavizar_con_contexto(res, [("saludo", None)]) is res
+
+
+def test_contexto_del_atajo_pesa_como_el_umbral():
+    bot = bot_sin_modelo(["ansiedad", "estres", "saludo"])
+    res = np.array([0.4, 0.35, 0.25])
+    # Un saludo del atajo (más reciente) y una predicción segura de ansiedad (anterior)
+    suavizado = bot.suavizar_con_contexto(res, [("ansiedad", 0.9), ("saludo", None)])
+    previa = np.array([0.9 / 2, 0.0, UMBRAL_CONFIANZA])
+    esperado = (1 - PESO_CONTEXTO) * res + PESO_CONTEXTO * previa / previa.sum()
+    assert np.allclose(suavizado, esperado)
+    assert np.isclose(suavizado.sum(), 1.0)
+
+
+def test_interpretar_prediccion_ordena_y_filtra():
+    bot = bot_sin_modelo(["a", "b", "c"])
+    ints = bot.interpretar_prediccion(np.array([0.1, 0.6, 0.3]))
+    assert [i["intent"] for i in ints] == ["b", "c"]
@@ -0,0 +1,47 @@
+import os
+import pickle
+
+import pytest
+
+from preprocesamiento import Preprocesador, lema_regular, normalizar
+
+
+def test_normalizar_quita_tildes_y_signos():
+    assert normalizar("¿Cómo estás?") == "como estas"
+    assert normalizar("  Año   NUEVO!! ") == "año nuevo"
+
+
+def test_normalizar_con_tildes():
+    assert normalizar("¿Qué TAL?", tildes=True) == "qué tal"
+
+
+@pytest.mark.parametrize("palabra, lema", [
+    ("clases", "clase"), ("tareas", "tarea"), ("dias", "dia"), ("materias", "materia"),
+    ("eres", "eres"), ("adios", "adios"), ("estres", "estres"), ("somos", "somos"),
+    ("estabas", "estabas"), ("mes", "mes"),
+    ("examenes", "examen"), ("emociones", "emocion"), ("necesidades", "necesidad"),
+    ("dificiles", "dificil"), ("profesores", "profesor"), ("lugares", "lugar"),
+    ("tienes", "tiene"), ("puedes", "puede"), ("quieres", "quiere"), ("grandes", "grande"),
+])
+def test_lema_regular(palabra, lema):
+    assert lema_regular(palabra) == lema
+
+
+def test_procesar_usa_la_cache():
+    preprocesador = Preprocesador()
+    assert preprocesador.procesar("Estoy MUY estresado, ¡ayuda!") == ("estoy", "muy", "estresado", "ayuda")
+    preprocesador.procesar("Estoy MUY estresado, ¡ayuda!")
+    assert preprocesador.procesar.cache_info().hits == 1
+
+
+def test_tabla_de_lemas_limitada():
+    preprocesador = Preprocesador(max_lemas=2)
+    preprocesador.procesar("uno dos tres cuatro")
+    assert len(preprocesador.lemas) == 2
+
+
+def test_vocabulario_del_modelo_es_el_del_preprocesamiento():
+    # words.pkl se entrenó con este preprocesamiento: cada palabra es su propio lema
+    words = pickle.load(open(os.path.join(os.path.dirname(__file__), "..", "words.pkl"), "rb"))
+    preprocesador = Preprocesador(words)
+    assert all(preprocesador.procesar(w) == (w,) for w in words)
@@ -0,0 +1,78 @@
+import json
+
+from registro import RegistroSesion, convertir_txt, leer_txt
+
+TXT = (
+    "Inicio de sesión de Ana - Semestre: Primero, Paralelo: A\n"
+    "2024-05-02 10:00:00\n"
+    + "=" * 50 + "\n"
+    "Usuario: hola\n"
+    "Asistente: ¡Hola! ¿Cómo estás?\n"
+    + "-" * 30 + "\n"
+    "Usuario: dame ideas\n"
+    "Asistente: Puedes intentar:\n"
+    "1. Respirar\n"
+    "2. Caminar\n"
+    + "-" * 30 + "\n"
+    "Inicio de sesión de Ana - Semestre: Primero, Paralelo: A\n"
+    "2024-05-03 09:30:00\n"
+    + "=" * 50 + "\n"
+    "Usuario: adiós\n"
+    "Asistente: Cuídate 😊\n"
+    + "-" * 30 + "\n"
+)
+
+
+def leer_jsonl(ruta):
+    with open(ruta, encoding="utf-8") as f:
+        return [json.loads(linea) for linea in f]
+
+
+def test_registro_escribe_una_linea_por_evento(tmp_path):
+    ruta = str(tmp_path / "sesion.jsonl")
+    registro = RegistroSesion(ruta, intervalo_flush=None)
+    registro.inicio_sesion("Ana", "Primero", "A", ts="2024-05-02 10:00:00")
+    registro.turno("qué tal", "Bien 😊", tag="saludo", probabilidad=0.9, latencia_ms=1.5)
+    registro.cerrar()
+    registro.cerrar()  # Cerrar dos veces no falla
+    registro.turno("tarde", "no se escribe")
+
+    inicio, turno = leer_jsonl(ruta)
+    assert inicio == {"ts": "2024-05-02 10:00:00", "tipo": "inicio",
+                      "nombre": "Ana", "semestre": "Primero", "paralelo": "A"}
+    assert turno["tipo"] == "turno" and turno["asistente"] == "Bien 😊"
+    assert (turno["tag"], turno["probabilidad"], turno["latencia_ms"]) == ("saludo", 0.9, 1.5)
+    with open(ruta, encoding="utf-8") as f:
+        assert "😊" in f.read()  # Sin escapes \u
+
+
+def test_leer_txt_respuestas_de_varias_lineas(tmp_path):
+    ruta = tmp_path / "conversacion_Ana_Primero_A.txt"
+    ruta.write_text(TXT, encoding="utf-8")
+    registros = leer_txt(str(ruta))
+
+    assert [r["tipo"] for r in registros] == ["inicio", "turno", "turno", "inicio", "turno"]
+    assert registros[0]["nombre"] == "Ana" and registros[0]["paralelo"] == "A"
+    assert registros[2]["usuario"] == "dame ideas"
+    assert registros[2]["asistente"] == "Puedes intentar:\n1. Respirar\n2. Caminar"
+    assert registros[4]["ts"] == "2024-05-03 09:30:00"
+    assert all(r["origen"] == "txt" for r in registros)
+
+
+def test_convertir_txt_antes_de_lo_nuevo_y_una_sola_vez(tmp_path):
+    ruta_txt = tmp_path / "conversacion_Ana_Primero_A.txt"
+    ruta_txt.write_text(TXT, encoding="utf-8")
+    ruta_jsonl = str(tmp_path / "conversacion_Ana_Primero_A.jsonl")
+    registro = RegistroSesion(ruta_jsonl, intervalo_flush=None)
+    registro.inicio_sesion("Ana", "Primero", "A", ts="2024-06-01 08:00:00")
+    registro.cerrar()
+
+    destino, total = convertir_txt(str(ruta_txt))
+    assert destino == ruta_jsonl and total == 5
+    registros = leer_jsonl(ruta_jsonl)
+    assert len(registros) == 6
+    assert registros[-1] == {"ts": "2024-06-01 08:00:00", "tipo": "inicio",
+                             "nombre": "Ana", "semestre": "Primero", "paralelo": "A"}
+
+    assert convertir_txt(str(ruta_txt)) == (ruta_jsonl, 0)
+    assert len(leer_jsonl(ruta_jsonl)) == 6
@@ -0,0 +1,123 @@
+import json
+import os
+
+import pytest
+
+import respuestas
+from respuestas import GestorRespuestas, IndiceIntents, PlantillaRespuesta, VideoProgramado
+
+INTENTS = {"intents": [
+    {"tag": "saludo", "patterns": ["Hola"], "responses": ["¡Hola {nombre}!"]},
+    {"tag": "saludo", "patterns": ["Buenas"], "responses": ["Duplicado"]},
+    {"tag": "ansiedad", "patterns": ["Me siento ansioso"], "responses": ["Respira"], "video": "x"},
+]}
+
+
+def escribir_intents(ruta, intents, mtime):
+    ruta.write_text(json.dumps(intents), encoding="utf-8")
+    os.utime(ruta, (mtime, mtime))  # mtime explícito: no depende de la resolución del disco
+
+
+@pytest.fixture
+def ruta_intents(tmp_path):
+    ruta = tmp_path / "intents.json"
+    escribir_intents(ruta, INTENTS, 1000)
+    return ruta
+
+
+def test_plantilla_inserta_el_nombre():
+    assert PlantillaRespuesta("¡Hola {nombre}! ¿{nombre}?").formatear("Ana") == "¡Hola Ana! ¿Ana?"
+    assert PlantillaRespuesta("Sin marcador").formatear("Ana") == "Sin marcador"
+
+
+def test_indice_conserva_el_primer_tag_repetido():
+    indice = IndiceIntents(INTENTS)
+    assert indice.por_tag["saludo"].plantillas[0].texto == "¡Hola {nombre}!"
+    assert indice.por_tag["ansiedad"].activa_menu_post_video
+    assert not indice.por_tag["saludo"].activa_menu_post_video
+
+
+def test_responder_por_tag_con_la_voz_de_la_sesion(ruta_intents, nueva_voz):
+    voz_gestor, voz_sesion = nueva_voz(), nueva_voz()
+    gestor = GestorRespuestas(voz_gestor, str(ruta_intents))
+    assert gestor.responder_intent("saludo", "Ana", voz_sesion) == ("¡Hola Ana!", None)
+    assert gestor.responder_intent("no_existe", "Ana", voz_sesion) == ("Disculpa, no tengo una respuesta para eso.", None)
+    assert voz_sesion.mensajes == ["¡Hola Ana!", "Disculpa, no tengo una respuesta para eso."]
+    assert voz_gestor.mensajes == []
+    assert gestor.activa_menu_post_video("ansiedad")
+
+
+def test_recarga_cuando_cambia_el_archivo(ruta_intents, nueva_voz):
+    gestor = GestorRespuestas(nueva_voz(), str(ruta_intents), intervalo_recarga=0)
+    assert not gestor.recargar_si_cambio()  # Sin cambios
+
+    nuevos = {"intents": [{"tag": "saludo", "patterns": ["Hola"], "responses": ["Nuevo saludo"]}]}
+    escribir_intents(ruta_intents, nuevos, 2000)
+    assert gestor.responder_intent("saludo", "Ana")[0] == "Nuevo saludo"
+    assert gestor.obtener("ansiedad") is None
+
+
+def test_respeta_el_intervalo_de_revision(ruta_intents, nueva_voz):
+    gestor = GestorRespuestas(nueva_voz(), str(ruta_intents), intervalo_recarga=3600)
+    escribir_intents(ruta_intents, {"intents": []}, 2000)
+    assert not gestor.recargar_si_cambio()
+    assert gestor.obtener("saludo") is not None
+
+
+def test_archivo_invalido_conserva_el_indice(ruta_intents, capsys, nueva_voz):
+    gestor = GestorRespuestas(nueva_voz(), str(ruta_intents), intervalo_recarga=0)
+    ruta_intents.write_text('{"intents": [', encoding="utf-8")  # Guardado a medias
+    os.utime(ruta_intents, (2000, 2000))
+    assert not gestor.recargar_si_cambio()
+    assert gestor.obtener("saludo") is not None
+    assert "No se pudo recargar" in capsys.readouterr().out
+
+
+@pytest.fixture
+def abiertos(monkeypatch):
+    urls = []
+    monkeypatch.setattr(respuestas.webbrowser, "open", urls.append)
+    return urls
+
+
+def test_video_sin_espera_abre_y_muestra_el_menu(abiertos, nueva_voz):
+    voz = nueva_voz()
+    video = VideoProgramado(voz, "https://example.com/v", "Respira", espera_video=0, espera_menu=0)
+    assert abiertos == ["https://example.com/v"]
+    assert video.video_abierto and video.menu_mostrado
+    assert voz.mensajes[-1] == "3. No estoy muy seguro/a todavía 🤔"
+    assert not video.completar()  # El menú ya estaba a la vista
+
+
+def test_completar_adelanta_los_pasos_pendientes(abiertos, nueva_voz):
+    voz = nueva_voz()
+    video = VideoProgramado(voz, "https://example.com/v", "Respira", espera_video=1000, espera_menu=1000)
+    assert abiertos == [] and voz.mensajes == []  # No bloquea: el temporizador sigue esperando
+
+    assert video.completar()
+    assert abiertos == ["https://example.com/v"]
+    assert "Respira" in voz.mensajes[0] and len(voz.mensajes) == 5
+    assert not video.completar()
+    assert len(abiertos) == 1 and len(voz.mensajes) == 5
+
+
+def test_cancelar_descarta_el_video(abiertos, nueva_voz):
+    voz = nueva_voz()
+    video = VideoProgramado(voz, "https://example.com/v", "Respira", espera_video=1000, espera_menu=1000)
+    video.cancelar()
+    assert not video.completar()
+    assert abiertos == [] and voz.mensajes == []
+
+
+def test_responder_intent_devuelve_el_video_sin_guardarlo(ruta_intents, abiertos, nueva_voz):
+    intents = {"intents": [{"tag": "ansiedad", "patterns": ["ansioso"], "responses": ["Respira"],
+                            "videos": [{"url": "https://example.com/v"}]}]}
+    escribir_intents(ruta_intents, intents, 1000)
+    voz = nueva_voz()
+    gestor = GestorRespuestas(nueva_voz(), str(ruta_intents), espera_video=1000, espera_menu=1000)
+    respuesta, video = gestor.responder_intent("ansiedad", "Ana", voz)
+    assert respuesta == "Respira" and isinstance(video, VideoProgramado)
+    assert not hasattr(gestor, "video_pendiente")  # El video es de la sesión, no del gestor compartido
+
+    assert video.completar()
+    assert "Guía para calmar la mente" in voz.mensajes[1]  # Título por defecto
@@ -0,0 +1,43 @@
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+from servidor import LoteadorClasificacion
+
+
+# Bot falso: clasifica cada oración como su propio texto y recuerda el tamaño de cada lote
+class BotEco:
+    def __init__(self):
+        self.lotes = []
+        self.listo = threading.Event()
+
+    def predict_classes_batch(self, oraciones, contextos):
+        self.listo.wait(1)  # Retiene el primer lote para que se acumulen los siguientes
+        self.lotes.append(len(oraciones))
+        if "falla" in oraciones:
+            raise RuntimeError("red no disponible")
+        return [[{"intent": oracion, "probability": str(contexto)}]
+                for oracion, contexto in zip(oraciones, contextos)]
+
+
+def test_cada_sesion_recibe_su_resultado_agrupado_en_lotes():
+    bot = BotEco()
+    loteador = LoteadorClasificacion(bot, max_lote=8, espera_max=0.05)
+    with ThreadPoolExecutor(max_workers=20) as hilos:
+        futuros = [hilos.submit(loteador.clasificar, f"m{i}", i) for i in range(20)]
+        bot.listo.set()
+        resultados = [f.result(timeout=5) for f in futuros]
+
+    assert resultados == [[{"intent": f"m{i}", "probability": str(i)}] for i in range(20)]
+    assert loteador.oraciones == 20 and sum(bot.lotes) == 20
+    assert max(bot.lotes) <= 8 and loteador.lotes < 20
+
+
+def test_un_error_llega_a_todo_el_lote():
+    bot = BotEco()
+    bot.listo.set()
+    loteador = LoteadorClasificacion(bot, espera_max=0)
+    with pytest.raises(RuntimeError):
+        loteador.clasificar("falla")
+    assert loteador.clasificar("hola") == [{"intent": "hola", "probability": "None"}]
@@ -0,0 +1,143 @@
+import json
+import time
+
+import pytest
+
+import respuestas
+from respuestas import GestorRespuestas
+from sesion import CONVERSACION, MENU_VIDEO, NOMBRE, SALUDO, TERMINADA, SesionConversacion
+
+INTENTS = {"intents": [
+    {"tag": "saludo", "patterns": ["Hola"], "responses": ["¡Hola {nombre}!"]},
+    {"tag": "despedida", "patterns": ["Adiós"], "responses": ["Hasta pronto"]},
+    {"tag": "tristeza", "patterns": ["Estoy triste"], "responses": ["Te escucho, {nombre}"]},
+    {"tag": "ansiedad", "patterns": ["Me siento ansioso"], "responses": ["Respira, {nombre}"],
+     "videos": [{"url": "https://example.com/video", "title": "Respiración"}]},
+]}
+
+
+# Clasificador falso que recuerda las llamadas (oración, contexto)
+class Clasificador:
+    def __init__(self, intent="ansiedad", probabilidad="0.9"):
+        self.resultado = [{"intent": intent, "probability": probabilidad}]
+        self.llamadas = []
+
+    def __call__(self, oracion, contexto=None):
+        self.llamadas.append((oracion, contexto))
+        return self.resultado
+
+
+@pytest.fixture
+def gestor(tmp_path, monkeypatch, nueva_voz):
+    monkeypatch.setattr(respuestas.webbrowser, "open", lambda url: None)
+    ruta = tmp_path / "intents.json"
+    ruta.write_text(json.dumps(INTENTS), encoding="utf-8")
+    return GestorRespuestas(nueva_voz(), str(ruta), espera_video=1000, espera_menu=1000)
+
+
+def sesion_en_conversacion(gestor, clasificar, voz):
+    sesion = SesionConversacion(gestor, clasificar, voz, registrar=False)
+    sesion.iniciar()
+    for texto in ("Hola Benedit", "me llamo ana", "Segundo", "B"):
+        sesion.procesar(texto)
+    return sesion
+
+
+def test_pide_saludo_antes_de_continuar(gestor, nueva_voz):
+    sesion = SesionConversacion(gestor, Clasificador(), nueva_voz(), registrar=False)
+    sesion.iniciar()
+    sesion.procesar("quiero hablar")
+    assert sesion.estado == SALUDO
+    sesion.procesar("buenas")
+    assert sesion.estado == NOMBRE
+
+
+def test_datos_del_estudiante(gestor, nueva_voz):
+    sesion = sesion_en_conversacion(gestor, Clasificador(), nueva_voz())
+    assert sesion.estado == CONVERSACION
+    assert (sesion.nombre, sesion.semestre, sesion.paralelo) == ("Ana", "Segundo", "B")
+    assert sesion.prompt().startswith("Ana,")
+
+
+def test_mensaje_clasificado_con_contexto_sin_imprimir(gestor, capsys, nueva_voz):
+    clasificar = Clasificador(intent="tristeza", probabilidad="0.7")
+    sesion = sesion_en_conversacion(gestor, clasificar, nueva_voz())
+    sesion.procesar("Estoy triste")             # Patrón exacto: no llama al modelo
+    sesion.procesar("hoy todo me sale mal")     # Va al modelo con el intent anterior como contexto
+    assert clasificar.llamadas == [("hoy todo me sale mal", [("tristeza", None)])]
+    assert sesion.estudiante.intents_recientes() == [("tristeza", None), ("tristeza", 0.7)]
+    assert sesion.estado == CONVERSACION
+    assert capsys.readouterr().out == ""
+
+
+def test_video_y_menu_post_video(gestor, nueva_voz):
+    sesion = sesion_en_conversacion(gestor, Clasificador(), nueva_voz())
+    sesion.procesar("los exámenes me tienen mal")
+    assert sesion.estado == MENU_VIDEO
+    sesion.procesar("algo")   # Antes de que venza la espera: se muestra el menú ahora
+    assert sesion.estado == MENU_VIDEO
+    sesion.procesar("4")
+    assert sesion.estado == MENU_VIDEO
+    sesion.procesar("1")
+    assert sesion.estado == CONVERSACION
+
+
+def test_despedida_termina_la_sesion(gestor, nueva_voz):
+    clasificar = Clasificador()
+    sesion = sesion_en_conversacion(gestor, clasificar, nueva_voz())
+    sesion.procesar("bueno, adiós")
+    assert sesion.terminada and sesion.estado == TERMINADA
+    assert clasificar.llamadas == []
+
+
+def test_cada_sesion_guarda_su_propio_video(gestor, nueva_voz):
+    # Dos sesiones comparten el mismo GestorRespuestas: el video queda en la sesión que lo pidió
+    con_video = sesion_en_conversacion(gestor, Clasificador(intent="ansiedad"), nueva_voz())
+    sin_video = sesion_en_conversacion(gestor, Clasificador(intent="tristeza"), nueva_voz())
+    con_video.procesar("los exámenes me tienen mal")
+    sin_video.procesar("hoy todo me sale mal")
+    assert con_video.video_pendiente is not None and con_video.estado == MENU_VIDEO
+    assert sin_video.video_pendiente is None and sin_video.estado == CONVERSACION
+    con_video.cerrar()
+
+
+# Espera (con límite) a que un temporizador de la sesión cumpla la condición
+def esperar(condicion, limite=2.0):
+    fin = time.monotonic() + limite
+    while not condicion():
+        if time.monotonic() > fin:
+            return False
+        time.sleep(0.01)
+    return True
+
+
+@pytest.fixture
+def gestor_con_espera(tmp_path, monkeypatch, nueva_voz):
+    abiertos = []
+    monkeypatch.setattr(respuestas.webbrowser, "open", abiertos.append)
+    ruta = tmp_path / "intents.json"
+    ruta.write_text(json.dumps(INTENTS), encoding="utf-8")
+    return GestorRespuestas(nueva_voz(), str(ruta), espera_video=0.05, espera_menu=0.05), abiertos
+
+
+def test_temporizador_abre_el_video_y_muestra_el_menu(gestor_con_espera, nueva_voz):
+    gestor, abiertos = gestor_con_espera
+    sesion = sesion_en_conversacion(gestor, Clasificador(), nueva_voz())
+    sesion.procesar("los exámenes me tienen mal")
+    assert abiertos == []  # La respuesta no espera al video
+    assert esperar(lambda: sesion.video_pendiente.menu_mostrado)
+    assert abiertos == ["https://example.com/video"]
+    assert sesion.voz.mensajes[-1] == "3. No estoy muy seguro/a todavía 🤔"
+    sesion.procesar("1")
+    assert sesion.estado == CONVERSACION
+
+
+def test_cerrar_la_sesion_detiene_el_temporizador(gestor_con_espera, nueva_voz):
+    gestor, abiertos = gestor_con_espera
+    sesion = sesion_en_conversacion(gestor, Clasificador(), nueva_voz())
+    sesion.procesar("los exámenes me tienen mal")
+    video = sesion.video_pendiente
+    sesion.cerrar()  # El estudiante se desconecta antes de que venza la espera
+    time.sleep(0.2)
+    assert abiertos == [] and not video.temporizador.is_alive()
+    assert not any("te mostraré un video" in m for m in sesion.voz.mensajes)
@@ -0,0 +1,145 @@
+import json
+import pickle
+
+import numpy as np
+import pytest
+
+pytest.importorskip("keras")
+
+import training  # noqa: E402
+from training import EntrenadorChatbot, crear_red, dropouts_para, pliegues_estratificados  # noqa: E402
+
+INTENTS = {"intents": [
+    {"tag": "saludo", "patterns": ["Hola", "Buenos días"], "responses": ["¡Hola!"]},
+    {"tag": "tristeza", "patterns": ["Estoy triste", "Me siento muy triste"], "responses": ["Te escucho"]},
+    {"tag": "estres", "patterns": ["Tengo muchos exámenes"], "responses": ["Respira"]},
+]}
+
+
+# Carpeta de trabajo con un intents.json pequeño (training.py escribe en el directorio actual)
+@pytest.fixture
+def carpeta(tmp_path, monkeypatch):
+    (tmp_path / "intents.json").write_text(json.dumps(INTENTS), encoding="utf-8")
+    monkeypatch.chdir(tmp_path)
+    return tmp_path
+
+
+def test_pliegues_estratificados():
+    etiquetas = np.array([0] * 10 + [1] * 5 + [2] * 3)
+    pliegues = pliegues_estratificados(etiquetas, 5)
+    todos = np.concatenate(pliegues)
+    assert sorted(todos) == list(range(len(etiquetas)))  # Cada índice en exactamente un pliegue
+    for pliegue in pliegues:
+        assert np.sum(etiquetas[pliegue] == 0) == 2      # Misma proporción de la clase mayoritaria
+        assert np.sum(etiquetas[pliegue] == 1) == 1
+    assert [list(p) for p in pliegues] == [list(p) for p in pliegues_estratificados(etiquetas, 5)]
+
+
+def test_dropouts_para():
+    assert dropouts_para((64,)) == (0.5,)
+    assert dropouts_para((256, 128, 64)) == (0.5, 0.3, 0.3)
+
+
+# Entrenador con vocabulario y clases dados y un modelo de capas pequeñas, sin leer intents.json
+def entrenador(words, classes, capas=(4,)):
+    e = EntrenadorChatbot()
+    e.words, e.classes = words, classes
+    e.train_x = np.zeros((1, len(words)), dtype=np.float32)
+    e.train_y = np.zeros((1, len(classes)), dtype=np.float32)
+    e.construir_modelo(capas, dropouts_para(capas))
+    return e
+
+
+def test_arranque_en_caliente_copia_filas_y_columnas():
+    anterior = crear_red(2, 2, (4,), (0.5,))
+    e = entrenador(["b", "nueva", "a"], ["x", "y", "z"])
+    assert e.inicializar_desde_modelo_anterior(["a", "b"], ["x", "z"], anterior)
+    pesos_anteriores = anterior.layers[0].get_weights()[0]
+    pesos = e.model.layers[0].get_weights()[0]
+    assert np.array_equal(pesos[[2, 0]], pesos_anteriores)
+    assert not pesos[1].any()  # La palabra nueva empieza en cero
+    assert e.arquitectura_de(e.model) == ((4,), (0.5,))
+
+
+@pytest.mark.parametrize("n_words, n_classes", [(3, 2), (2, 3)])
+def test_pkl_que_no_corresponde_al_modelo_empieza_de_cero(n_words, n_classes):
+    # El modelo guardado no coincide con words.pkl / classes.pkl: no debe fallar Keras
+    anterior = crear_red(n_words, n_classes, (4,), (0.5,))
+    e = entrenador(["a", "b", "c"], ["x", "y"])
+    assert not e.inicializar_desde_modelo_anterior(["a", "b"], ["x", "y"], anterior)
+
+
+def test_otra_arquitectura_empieza_de_cero():
+    anterior = crear_red(2, 2, (8, 4), (0.5, 0.3))
+    e = entrenador(["a", "b"], ["x", "y"])
+    assert not e.inicializar_desde_modelo_anterior(["a", "b"], ["x", "y"], anterior)
+
+
+def test_los_pkl_se_guardan_solo_con_el_modelo(carpeta):
+    e = EntrenadorChatbot()
+    e.cargar_datos()
+    e.procesar_datos()
+    assert not (carpeta / "words.pkl").exists()  # Aún no hay modelo que les corresponda
+
+    e.crear_datos_entrenamiento()
+    e.construir_modelo((4,), (0.5,))
+    e.guardar_modelo()
+    assert sorted(p.name for p in carpeta.iterdir()) == ["chatbot_model.h5", "classes.pkl", "intents.json", "words.pkl"]
+    assert pickle.load(open(carpeta / "words.pkl", "rb")) == e.words
+
+
+def test_barrido_interrumpido_conserva_los_pkl(carpeta, monkeypatch):
+    (carpeta / "words.pkl").write_bytes(pickle.dumps(["anterior"]))
+
+    def falla(*args, **kwargs):
+        raise RuntimeError("pliegue fallido")
+    monkeypatch.setattr(training, "pliegues_estratificados", falla)
+    with pytest.raises(RuntimeError):
+        EntrenadorChatbot().barrido()
+    assert pickle.load(open(carpeta / "words.pkl", "rb")) == ["anterior"]
+
+
+def test_matriz_vectorizada_igual_al_bucle_original(carpeta):
+    from benchmark_entrenamiento import crear_datos_referencia
+    e = EntrenadorChatbot()
+    e.cargar_datos()
+    e.intents["intents"][1]["patterns"].append("triste, triste y más triste")  # Palabra repetida
+    e.procesar_datos()
+    ref_x, ref_y = crear_datos_referencia(e)
+
+    e.crear_datos_entrenamiento(mezclar=False)
+    assert np.array_equal(e.train_x, ref_x) and np.array_equal(e.train_y, ref_y)
+    assert e.train_x.dtype == np.float32
+
+    # Mezclado: las mismas filas (con su salida) en otro orden
+    e.crear_datos_entrenamiento()
+    filas = sorted(map(tuple, np.hstack([e.train_x, e.train_y])))
+    assert filas == sorted(map(tuple, np.hstack([ref_x, ref_y]).astype(np.float32)))
+
+
+def test_no_reentrena_si_intents_no_cambio(carpeta, monkeypatch):
+    # Sin Keras: el modelo anterior y el entrenamiento se reemplazan por registros
+    entrenados = []
+    monkeypatch.setattr(training, "load_model", lambda ruta: None)
+    monkeypatch.setattr(EntrenadorChatbot, "construir_modelo", lambda self, *args: None)
+    monkeypatch.setattr(EntrenadorChatbot, "entrenar_modelo", lambda self, *args: entrenados.append(self.words))
+    for nombre, contenido in (("chatbot_model.h5", b"h5"), ("words.pkl", pickle.dumps([])),
+                              ("classes.pkl", pickle.dumps([]))):
+        (carpeta / nombre).write_bytes(contenido)
+
+    assert EntrenadorChatbot().entrenar()          # Sin caché: entrena
+    assert not EntrenadorChatbot().entrenar()      # Mismo intents.json: no hace nada
+    assert EntrenadorChatbot().entrenar(forzar=True)
+    assert len(entrenados) == 2
+
+    intents = json.loads((carpeta / "intents.json").read_text(encoding="utf-8"))
+    intents["intents"][0]["patterns"].append("Qué tal")
+    (carpeta / "intents.json").write_text(json.dumps(intents), encoding="utf-8")
+    assert EntrenadorChatbot().entrenar()          # intents.json cambió
+    assert "tal" in entrenados[-1]
+    assert not EntrenadorChatbot().entrenar()
+
+    monkeypatch.setattr(training, "VERSION_PREPROCESAMIENTO", training.VERSION_PREPROCESAMIENTO + 1)
+    assert EntrenadorChatbot().entrenar()          # Cambió el preprocesamiento
+    (carpeta / "words.pkl").unlink()
+    assert EntrenadorChatbot().entrenar()          # Falta una de las salidas
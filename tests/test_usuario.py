@@ -0,0 +1,42 @@
+import threading
+
+from usuario import Estudiante, id_tag, nombre_tag
+
+
+def test_historial_limitado_y_descartes():
+    descartadas = []
+    estudiante = Estudiante("Ana", "Segundo", "B", max_historial=3, al_descartar=descartadas.append)
+    for i in range(5):
+        estudiante.registrar_interaccion(f"tag_{i}", 0.9, ts=100 + i)
+    assert len(estudiante.historial) == 3
+    assert [i.ts for i in descartadas] == [100, 101]
+    assert [i.tag for i in estudiante.historial] == ["tag_2", "tag_3", "tag_4"]
+
+
+def test_intents_recientes_omite_mensajes_no_entendidos():
+    estudiante = Estudiante("Ana", "Segundo", "B")
+    estudiante.registrar_interaccion("saludo")
+    estudiante.registrar_interaccion("ansiedad", 0.8)
+    estudiante.registrar_interaccion(None)
+    estudiante.registrar_interaccion("estres", 0.6)
+    assert estudiante.intents_recientes(2) == [("ansiedad", 0.8), ("estres", 0.6)]
+    assert estudiante.intents_recientes() == [("saludo", None), ("ansiedad", 0.8), ("estres", 0.6)]
+
+
+def test_id_tag_concurrente_sin_numeros_repetidos():
+    tags = [f"concurrente_{i}" for i in range(200)]
+    barrera = threading.Barrier(8)
+
+    def registrar():
+        barrera.wait()
+        for tag in tags:
+            id_tag(tag)
+
+    hilos = [threading.Thread(target=registrar) for _ in range(8)]
+    for hilo in hilos:
+        hilo.start()
+    for hilo in hilos:
+        hilo.join()
+    numeros = [id_tag(tag) for tag in tags]
+    assert len(set(numeros)) == len(tags)
+    assert [nombre_tag(n) for n in numeros] == tags
@@ -0,0 +1,36 @@
+import difflib
+
+import numpy as np
+
+from vocabulario import IndiceVocabulario
+
+WORDS = ["ansiedad", "ansioso", "clase", "estres", "estresado", "tarea", "triste", "tristeza"]
+
+
+# Regla original: comparar el token con todo el vocabulario
+def buscar_todo(token, umbral=0.8):
+    return tuple(i for i, w in enumerate(WORDS) if difflib.SequenceMatcher(None, token, w).ratio() > umbral)
+
+
+def test_misma_respuesta_que_comparar_con_todo_el_vocabulario():
+    indice = IndiceVocabulario(WORDS)
+    for token in ["ansiedad", "ansiedd", "tristesa", "estresada", "clases", "hola", "", "ñandú"]:
+        assert indice.buscar(token) == buscar_todo(token)
+
+
+def test_indices_ordenados_sin_repetir_y_bolsa():
+    indice = IndiceVocabulario(WORDS)
+    activos = indice.indices(["tristeza", "triste", "tristeza"])
+    assert list(activos) == sorted(set(activos)) and len(activos) >= 2
+    bolsa = indice.bolsa(["tarea"])
+    assert bolsa.dtype == np.float32 and bolsa.sum() == 1 and bolsa[WORDS.index("tarea")] == 1
+
+
+def test_cache_de_tokens():
+    indice = IndiceVocabulario(WORDS)
+    indice.indices(["tarea", "tarea", "clase"])
+    assert indice.buscar.cache_info().hits == 1
+
+
+def test_vocabulario_vacio():
+    assert len(IndiceVocabulario([]).indices(["hola"])) == 0
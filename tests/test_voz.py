@@ -0,0 +1,64 @@
+import threading
+import time
+
+from voz import MotorNulo, Voz
+
+
+# Motor que guarda lo que "reproduce"; puede quedarse bloqueado hasta que se le permita seguir
+class MotorGrabador:
+    def __init__(self):
+        self.dichos = []
+        self.detenido = False
+        self.continuar = threading.Event()
+        self.continuar.set()
+
+    def decir(self, mensaje):
+        self.continuar.wait(5)
+        self.dichos.append(mensaje)
+
+    def detener(self):
+        self.detenido = True
+
+
+def test_reproduce_en_orden_sin_emojis(capsys):
+    motor = MotorGrabador()
+    voz = Voz(motor=lambda: motor, pausa=0)
+    voz.hablar("Hola 🌟")
+    voz.hablar("¿Cómo estás?")
+    voz.flush()
+    voz.cerrar()
+    assert motor.dichos == ["Hola ", "¿Cómo estás?"]
+    assert "Benedit: Hola 🌟" in capsys.readouterr().out
+
+
+def test_motor_nulo_sin_pausa():
+    voz = Voz(motor=MotorNulo, pausa=5)
+    inicio = time.perf_counter()
+    for i in range(3):
+        voz.hablar(f"mensaje {i}")
+    voz.flush()
+    assert time.perf_counter() - inicio < 1
+    voz.cerrar()
+
+
+def test_interrupt_conserva_la_senal_de_cierre():
+    motor = MotorGrabador()
+    voz = Voz(motor=lambda: motor, pausa=0)
+    motor.continuar.clear()          # El primer mensaje queda "reproduciéndose"
+    voz.hablar("uno")
+    voz.hablar("dos")
+    voz.cola.put(None)               # Cierre pedido mientras había mensajes pendientes
+    voz.interrupt()
+    assert motor.detenido
+    motor.continuar.set()
+    voz.hilo.join(2)
+    assert not voz.hilo.is_alive()
+    assert "dos" not in motor.dichos
+
+
+def test_solo_texto_no_crea_hilo(capsys):
+    voz = Voz(solo_texto=True)
+    voz.hablar("Hola")
+    voz.interrupt()
+    voz.cerrar()
+    assert capsys.readouterr().out == "Benedit: Hola\n"
@@ -8,20 +8,106 @@
 # ---------------------------------------------------------
 
 # --- Librerías necesarias ---
+import argparse          # Opciones de la línea de comandos
+import hashlib           # Huella del contenido de intents.json
 import json              # Leer y manipular archivos JSON
+import multiprocessing   # Procesos independientes para el barrido de hiperparámetros
+import os                # Comprobar si existen el modelo y la caché
 import pickle            # Guardar estructuras de Python como archivos binarios
-import random            # Aleatorizar datos de entrenamiento
+import time              # Tiempo de entrenamiento y de inferencia en el barrido
+from concurrent.futures import ProcessPoolExecutor  # Un pliegue de validación por proceso
 import numpy as np       # Biblioteca para cálculos numéricos
-import nltk              # Biblioteca para procesamiento de lenguaje natural
-from nltk.stem import WordNetLemmatizer  # Reduce palabras a su forma base
 
 # Componentes de Keras para construir y entrenar el modelo
-from keras.models import Sequential         # Modelo secuencial (capa por capa)
+from keras.models import Sequential, load_model  # Modelo secuencial (capa por capa) y carga del anterior
+from keras.callbacks import EarlyStopping   # Detiene el entrenamiento cuando la pérdida deja de mejorar
 from keras.layers import Dense, Dropout     # Capas densas y de eliminación (Dropout)
 from keras.optimizers import SGD            # Optimizador: Stochastic Gradient Descent
+from keras.utils import set_random_seed     # Semilla reproducible en cada pliegue
 
-# Descargar tokenizador de NLTK (si no está)
-nltk.download('punkt')
+# Módulos locales
+from preprocesamiento import Preprocesador, VERSION_PREPROCESAMIENTO  # Mismo preprocesamiento que main.py
+from inferencia import RedDensaNumpy, ARTEFACTO_MODELO, guardar_artefacto  # Artefacto ligero
+from inferencia import ARCHIVO_COMPARTIDO, guardar_binario  # Pesos compartidos entre procesos
+
+# Caché de construcción: huella de intents.json (y del preprocesamiento) ya entrenada
+CACHE_ENTRENAMIENTO = 'cache_entrenamiento.pkl'
+
+# Grilla del barrido de hiperparámetros (python training.py --barrido)
+GRILLA_CAPAS = [(64,), (128, 64), (256, 128)]   # Neuronas de cada capa oculta
+GRILLA_LOTES = [5, 16]                          # Tamaños de lote
+GRILLA_EPOCAS = [100, 300]                      # Épocas máximas (con parada temprana)
+RESULTADOS_BARRIDO = 'barrido_entrenamiento.json'
+
+
+# Dropout de cada capa oculta: 0.5 después de la primera y 0.3 después de las demás
+def dropouts_para(capas):
+    return tuple(0.5 if i == 0 else 0.3 for i in range(len(capas)))
+
+
+# Construye y compila la red: capas densas relu con Dropout y salida softmax
+def crear_red(n_entrada, n_salida, capas=(256, 128), dropouts=(0.5, 0.3)):
+    model = Sequential()
+    for i, (unidades, dropout) in enumerate(zip(capas, dropouts)):
+        if i == 0:
+            model.add(Dense(unidades, input_shape=(n_entrada,), activation='relu'))  # Capa de entrada
+        else:
+            model.add(Dense(unidades, activation='relu'))  # Capa oculta
+        model.add(Dropout(dropout))              # Dropout para evitar sobreajuste
+    model.add(Dense(n_salida, activation='softmax'))  # Capa de salida con activación softmax
+
+    # Configura el optimizador SGD (descenso por gradiente)
+    sgd = SGD(learning_rate=0.01, decay=1e-6, momentum=0.9, nesterov=True)
+    model.compile(
+        loss='categorical_crossentropy',  # Función de pérdida para clasificación múltiple
+        optimizer=sgd,
+        metrics=['accuracy']
+    )
+    return model
+
+
+# Reparte los índices en k pliegues con la misma proporción de cada clase
+def pliegues_estratificados(etiquetas, k, semilla=0):
+    rng = np.random.default_rng(semilla)
+    pliegues = [[] for _ in range(k)]
+    posicion = 0
+    for clase in np.unique(etiquetas):
+        indices = rng.permutation(np.flatnonzero(etiquetas == clase))
+        for indice in indices:
+            pliegues[posicion % k].append(indice)
+            posicion += 1
+    return [np.array(sorted(p), dtype=np.intp) for p in pliegues]
+
+
+# Cada proceso del barrido usa un solo hilo de TensorFlow (los núcleos se reparten entre procesos)
+def _un_hilo_por_proceso():
+    import tensorflow as tf
+    tf.config.threading.set_intra_op_parallelism_threads(1)
+    tf.config.threading.set_inter_op_parallelism_threads(1)
+
+
+# Entrena una configuración con un pliegue de validación y devuelve
+# exactitud sobre el pliegue, segundos de entrenamiento y microsegundos por predicción
+# (con la misma inferencia NumPy dispersa que usa main.py)
+def evaluar_pliegue(x, y, prueba, capas, lote, epocas, paciencia, semilla=0):
+    set_random_seed(semilla)
+    entrenamiento = np.setdiff1d(np.arange(len(x)), prueba)
+    model = crear_red(x.shape[1], y.shape[1], capas, dropouts_para(capas))
+    callbacks = [EarlyStopping(monitor='loss', patience=paciencia, restore_best_weights=True)] if paciencia else []
+
+    inicio = time.perf_counter()
+    model.fit(x[entrenamiento], y[entrenamiento], epochs=epocas, batch_size=lote,
+              callbacks=callbacks, verbose=0)
+    segundos = time.perf_counter() - inicio
+
+    red = RedDensaNumpy.desde_keras(model)
+    lista_indices = [np.flatnonzero(fila) for fila in x[prueba]]
+    inicio = time.perf_counter()
+    predichas = [red.predecir_indices(indices).argmax() for indices in lista_indices]
+    latencia_us = (time.perf_counter() - inicio) / len(prueba) * 1e6
+
+    exactitud = float(np.mean(np.array(predichas) == y[prueba].argmax(axis=1)))
+    return exactitud, segundos, latencia_us
 
 # ---------------------------------------------------------
 # Clase EntrenadorChatbot: organiza todo el proceso
@@ -33,10 +119,36 @@ class EntrenadorChatbot:
         self.words = []                         # Lista del vocabulario (tokens únicos)
         self.classes = []                       # Lista de las diferentes clases (tags)
         self.documents = []                     # Lista de pares (tokens, tag)
-        self.ignore_words = ['?', '!', '.', ',', '¡', '¿']  # Palabras a ignorar
-        self.lemmatizer = WordNetLemmatizer()   # Objeto para lematizar palabras
+        self.preprocesador = Preprocesador()    # Tokeniza sin signos, normaliza y lematiza
         self.model = None                       # Lugar donde se guardará el modelo
 
+    # --- Caché de construcción ---
+
+    # Huella SHA-256 del contenido de intents.json y de la versión del preprocesamiento
+    # (si cambia la forma de preprocesar, el vocabulario cambia y hay que reentrenar)
+    def huella_intents(self):
+        sha = hashlib.sha256(f"preprocesamiento {VERSION_PREPROCESAMIENTO}\n".encode())
+        with open(self.intents_path, 'rb') as f:
+            sha.update(f.read())
+        return sha.hexdigest()
+
+    # Carga la caché de ejecuciones anteriores (si existe) y devuelve la huella guardada
+    def cargar_cache(self, ruta=CACHE_ENTRENAMIENTO):
+        if not os.path.exists(ruta):
+            return None
+        with open(ruta, 'rb') as f:
+            cache = pickle.load(f)
+        return cache.get('huella')
+
+    # Guarda la huella del intents.json entrenado
+    def guardar_cache(self, huella, ruta=CACHE_ENTRENAMIENTO):
+        with open(ruta, 'wb') as f:
+            pickle.dump({'huella': huella}, f)
+
+    # Tokeniza un patrón y lematiza sus palabras (los signos de puntuación ya no aparecen)
+    def tokenizar(self, pattern):
+        return list(self.preprocesador.procesar(pattern))
+
     def cargar_datos(self):
         # Lee el archivo intents.json y lo guarda como diccionario
         with open(self.intents_path, encoding='utf-8') as f:
@@ -47,85 +159,270 @@ class EntrenadorChatbot:
         for intent in self.intents['intents']:
             for pattern in intent['patterns']:
                 # Tokeniza cada patrón en palabras individuales
-                tokens = nltk.word_tokenize(pattern.lower())
+                tokens = self.tokenizar(pattern)
                 self.words.extend(tokens)  # Agrega palabras al vocabulario
                 self.documents.append((tokens, intent['tag']))  # Asocia tokens con su etiqueta
                 if intent['tag'] not in self.classes:
                     self.classes.append(intent['tag'])  # Agrega nueva clase
 
-        # Limpieza: lematización y eliminación de puntuaciones
-        self.words = [self.lemmatizer.lemmatize(w) for w in self.words if w not in self.ignore_words]
+        # Los tokens ya vienen lematizados y sin signos de puntuación
         self.words = sorted(set(self.words))      # Elimina duplicados y ordena alfabéticamente
         self.classes = sorted(set(self.classes))  # Ordena las clases
+        # words.pkl y classes.pkl se guardan junto con el modelo (guardar_modelo)
 
-        # Guarda el vocabulario y las clases en archivos binarios para uso futuro
-        pickle.dump(self.words, open('words.pkl', 'wb'))
-        pickle.dump(self.classes, open('classes.pkl', 'wb'))
+    def crear_datos_entrenamiento(self, mezclar=True):
+        n_docs = len(self.documents)
 
-    def crear_datos_entrenamiento(self):
-        training = []                              # Lista para los datos de entrenamiento
-        output_empty = [0] * len(self.classes)     # Plantilla de salida (vector one-hot)
+        # Diccionarios palabra -> columna y clase -> índice (búsqueda directa, sin list.index)
+        columnas = {w: i for i, w in enumerate(self.words)}
+        indice_clase = {c: i for i, c in enumerate(self.classes)}
 
-        for doc in self.documents:
-            bag = []                               # Lista para Bag of Words de un patrón
-            pattern_words = [self.lemmatizer.lemmatize(w.lower()) for w in doc[0]]  # Lematizar tokens
+        # Matrices preasignadas: entradas BoW y salidas one-hot
+        train_x = np.zeros((n_docs, len(self.words)), dtype=np.float32)
+        train_y = np.zeros((n_docs, len(self.classes)), dtype=np.float32)
 
-            for w in self.words:
-                bag.append(1 if w in pattern_words else 0)  # Crear vector binario BoW
+        # Posiciones (fila, columna) de las palabras presentes en cada patrón
+        filas, cols = [], []
+        for fila, (tokens, _) in enumerate(self.documents):
+            for w in tokens:
+                col = columnas.get(w)  # Tokens ya lematizados
+                if col is not None:
+                    filas.append(fila)
+                    cols.append(col)
+        train_x[filas, cols] = 1  # Crear vectores binarios BoW de una sola vez
 
-            # Vector de salida (one-hot)
-            output_row = output_empty[:]
-            output_row[self.classes.index(doc[1])] = 1      # Activar la clase correspondiente
+        # Vector de salida (one-hot) por indexación entera
+        etiquetas = np.fromiter((indice_clase[tag] for _, tag in self.documents), dtype=np.intp, count=n_docs)
+        train_y[np.arange(n_docs), etiquetas] = 1
 
-            # Guardar patrón con su clase
-            training.append([bag, output_row])
+        # Mezclar aleatoriamente los datos con una permutación de filas
+        orden = np.random.permutation(n_docs) if mezclar else np.arange(n_docs)
+        self.train_x = train_x[orden]    # Entradas: vectores BoW
+        self.train_y = train_y[orden]    # Salidas: vectores one-hot
 
-        # Mezclar aleatoriamente los datos
-        random.shuffle(training)
+    # capas: neuronas de cada capa oculta; dropouts: tasa de Dropout después de cada una
+    def construir_modelo(self, capas=(256, 128), dropouts=(0.5, 0.3)):
+        # Construye la arquitectura de la red neuronal
+        self.model = crear_red(len(self.train_x[0]), len(self.train_y[0]), capas, dropouts)
 
-        training = np.array(training, dtype=object)
-        # Dividir en datos de entrada (X) y salida (Y)
-        self.train_x = list(training[:, 0])    # Entradas: vectores BoW
-        self.train_y = list(training[:, 1])    # Salidas: vectores one-hot
+    # Capas ocultas y dropouts de un modelo ya entrenado (para reentrenar con la misma
+    # arquitectura, por ejemplo la elegida por el barrido). Devuelve None si no se reconoce.
+    @staticmethod
+    def arquitectura_de(modelo):
+        capas_modelo = modelo.layers
+        capas = tuple(c.units for c in capas_modelo[:-1] if isinstance(c, Dense))
+        dropouts = tuple(float(c.rate) for c in capas_modelo if isinstance(c, Dropout))
+        if not capas or len(capas) != len(dropouts):
+            return None
+        return capas, dropouts
 
-    def construir_modelo(self):
-        # Construye la arquitectura de la red neuronal
-        self.model = Sequential()
-        self.model.add(Dense(256, input_shape=(len(self.train_x[0]),), activation='relu'))  # Capa de entrada
-        self.model.add(Dropout(0.5))             # Dropout para evitar sobreajuste
-        self.model.add(Dense(128, activation='relu'))  # Capa oculta
-        self.model.add(Dropout(0.3))             # Segundo Dropout
-        self.model.add(Dense(len(self.train_y[0]), activation='softmax'))  # Capa de salida con activación softmax
-
-        # Configura el optimizador SGD (descenso por gradiente)
-        sgd = SGD(learning_rate=0.01, decay=1e-6, momentum=0.9, nesterov=True)
-        self.model.compile(
-            loss='categorical_crossentropy',  # Función de pérdida para clasificación múltiple
-            optimizer=sgd,
-            metrics=['accuracy']
-        )
+    # Copia los pesos del modelo anterior cuando solo se agregaron palabras o clases.
+    # Las filas de palabras nuevas empiezan en cero (no cambian lo ya aprendido) y
+    # las columnas de clases nuevas conservan su inicialización aleatoria.
+    # modelo_anterior: modelo Keras ya cargado (chatbot_model.h5), entrenado con words_previas
+    # y classes_previas. Devuelve False (y se entrena desde cero) si no es compatible.
+    def inicializar_desde_modelo_anterior(self, words_previas, classes_previas, modelo_anterior):
+        if modelo_anterior is None or not (words_previas and classes_previas):
+            return False
+        if not (set(words_previas) <= set(self.words) and set(classes_previas) <= set(self.classes)):
+            return False  # Se quitaron palabras o clases: no hay correspondencia directa
+
+        anterior = [c.get_weights() for c in modelo_anterior.layers if c.get_weights()]
+        nuevas = [c for c in self.model.layers if c.get_weights()]
+        if len(anterior) != len(nuevas) or any(
+            pa.shape != c.get_weights()[0].shape for (pa, _), c in zip(anterior[1:-1], nuevas[1:-1])
+        ):
+            return False  # Cambió la arquitectura de las capas ocultas
+
+        # La entrada y la salida deben corresponder a los .pkl anteriores y a las capas nuevas
+        # (si words.pkl o classes.pkl no son los del modelo guardado, se empieza de cero)
+        entrada, salida = nuevas[0].get_weights()[0], nuevas[-1].get_weights()[0]
+        if (anterior[0][0].shape != (len(words_previas), entrada.shape[1])
+                or anterior[-1][0].shape != (salida.shape[0], len(classes_previas))):
+            return False
+
+        columna_palabra = {w: i for i, w in enumerate(self.words)}
+        indice_clase = {c: i for i, c in enumerate(self.classes)}
+        filas = [columna_palabra[w] for w in words_previas]      # Posición nueva de cada palabra
+        columnas = [indice_clase[c] for c in classes_previas]    # Posición nueva de cada clase
+
+        # Capa de entrada: una fila de pesos por palabra del vocabulario
+        pesos, _ = nuevas[0].get_weights()
+        pesos[:] = 0
+        pesos[filas] = anterior[0][0]
+        nuevas[0].set_weights([pesos, anterior[0][1]])
+
+        # Capas ocultas: se copian tal cual
+        for capa, pesos_anteriores in zip(nuevas[1:-1], anterior[1:-1]):
+            capa.set_weights(pesos_anteriores)
+
+        # Capa de salida: una columna por clase
+        pesos, sesgos = nuevas[-1].get_weights()
+        pesos[:, columnas] = anterior[-1][0]
+        sesgos[columnas] = anterior[-1][1]
+        nuevas[-1].set_weights([pesos, sesgos])
+        return True
+
+    # Guarda el modelo, el vocabulario y las clases. Se escriben primero en archivos temporales
+    # y se reemplazan al final: si algo falla antes, el .h5 y los .pkl anteriores siguen
+    # correspondiendo entre sí.
+    def guardar_modelo(self):
+        self.model.save('chatbot_model.tmp.h5')
+        with open('words.pkl.tmp', 'wb') as f:
+            pickle.dump(self.words, f)
+        with open('classes.pkl.tmp', 'wb') as f:
+            pickle.dump(self.classes, f)
+        os.replace('chatbot_model.tmp.h5', 'chatbot_model.h5')
+        os.replace('words.pkl.tmp', 'words.pkl')
+        os.replace('classes.pkl.tmp', 'classes.pkl')
+
+    # paciencia: épocas sin mejorar la pérdida antes de detenerse (None para entrenar todas las épocas)
+    def entrenar_modelo(self, epochs=300, batch_size=5, paciencia=20):
+        callbacks = []
+        if paciencia:
+            callbacks.append(EarlyStopping(monitor='loss', patience=paciencia, restore_best_weights=True))
 
-    def entrenar_modelo(self, epochs=300, batch_size=5):
         # Entrena el modelo con los datos procesados
         self.model.fit(
             np.array(self.train_x),     # Entradas
             np.array(self.train_y),     # Salidas
             epochs=epochs,              # Número de pasadas completas por los datos
             batch_size=batch_size,      # Tamaño de los lotes
+            callbacks=callbacks,        # Parada temprana
             verbose=1                   # Mostrar progreso por consola
         )
-        self.model.save('chatbot_model.h5')  # Guarda el modelo entrenado
-        print("✅ Modelo entrenado y guardado como 'chatbot_model.h5'.")
+        self.guardar_modelo()
+        print("✅ Modelo entrenado y guardado como 'chatbot_model.h5' (con words.pkl y classes.pkl).")
 
-    def entrenar(self):
-        # Proceso completo para preparar y entrenar el modelo
+        # Exporta también el artefacto ligero y el archivo compartido que main.py carga sin Keras
+        red = RedDensaNumpy.desde_keras(self.model)
+        guardar_artefacto(ARTEFACTO_MODELO, red, self.words, self.classes)
+        guardar_binario(ARCHIVO_COMPARTIDO, red, self.words, self.classes)
+        print(f"✅ Artefacto ligero guardado como '{ARTEFACTO_MODELO}' y '{ARCHIVO_COMPARTIDO}'.")
+
+    # Proceso completo para preparar y entrenar el modelo.
+    # Si intents.json no cambió desde el último entrenamiento, no se hace nada (salvo forzar=True).
+    # Devuelve True si se entrenó.
+    def entrenar(self, forzar=False, desde_cero=False, epochs=300, batch_size=5, paciencia=20):
         self.cargar_datos()             # Paso 1: Cargar archivo intents.json
+
+        huella = self.huella_intents()
+        huella_anterior = self.cargar_cache()
+        salidas = ('chatbot_model.h5', 'words.pkl', 'classes.pkl')
+        if not forzar and huella == huella_anterior and all(os.path.exists(s) for s in salidas):
+            print("✅ intents.json no cambió desde el último entrenamiento; no es necesario reentrenar.")
+            return False
+
+        # Modelo, vocabulario y clases actuales (para continuar desde sus pesos)
+        words_previas = classes_previas = modelo_anterior = None
+        if not desde_cero and all(os.path.exists(s) for s in salidas):
+            words_previas = pickle.load(open('words.pkl', 'rb'))
+            classes_previas = pickle.load(open('classes.pkl', 'rb'))
+            modelo_anterior = load_model('chatbot_model.h5')
+
+        # Se conserva la arquitectura del modelo actual (puede venir del barrido)
+        arquitectura = None
+        if modelo_anterior is not None:
+            arquitectura = self.arquitectura_de(modelo_anterior)
+
         self.procesar_datos()           # Paso 2: Extraer vocabulario y clases
         self.crear_datos_entrenamiento()# Paso 3: Crear BoW y vectores de salida
-        self.construir_modelo()         # Paso 4: Definir estructura de red neuronal
-        self.entrenar_modelo()          # Paso 5: Entrenar la red con los datos
+        self.construir_modelo(*(arquitectura or ()))  # Paso 4: Definir estructura de red neuronal
+        if self.inicializar_desde_modelo_anterior(words_previas, classes_previas, modelo_anterior):
+            print("↪️ Continuando desde los pesos del modelo anterior.")
+        self.entrenar_modelo(epochs, batch_size, paciencia)  # Paso 5: Entrenar la red con los datos
+        self.guardar_cache(huella)
+        return True
+
+    # Barrido de hiperparámetros con validación cruzada de k pliegues en todos los núcleos.
+    # Registra exactitud, tiempo de entrenamiento y latencia por predicción de cada
+    # configuración; entre las que quedan a menos de 'tolerancia' de la mejor exactitud,
+    # elige la de mayor exactitud por milisegundo de inferencia, la reentrena con todos
+    # los datos y la guarda como chatbot_model.h5 (con sus .pkl y artefactos).
+    def barrido(self, pliegues=5, procesos=None, tolerancia=0.02, paciencia=20,
+                salida=RESULTADOS_BARRIDO, semilla=0):
+        self.cargar_datos()
+        self.procesar_datos()           # words.pkl y classes.pkl se guardan con el modelo final
+        self.crear_datos_entrenamiento(mezclar=False)
+        x, y = self.train_x, self.train_y
+        grupos = pliegues_estratificados(y.argmax(axis=1), pliegues, semilla)
+        configuraciones = [(capas, lote, epocas)
+                           for capas in GRILLA_CAPAS for lote in GRILLA_LOTES for epocas in GRILLA_EPOCAS]
+        procesos = procesos or os.cpu_count()
+        print(f"🔎 Barrido: {len(configuraciones)} configuraciones x {pliegues} pliegues en {procesos} procesos")
+
+        # Cada (configuración, pliegue) es una tarea independiente
+        medidas = {configuracion: [] for configuracion in configuraciones}
+        contexto = multiprocessing.get_context('spawn')  # TensorFlow no es seguro con fork
+        with ProcessPoolExecutor(max_workers=procesos, mp_context=contexto,
+                                 initializer=_un_hilo_por_proceso) as ejecutor:
+            futuros = {
+                ejecutor.submit(evaluar_pliegue, x, y, prueba, capas, lote, epocas, paciencia, semilla): (capas, lote, epocas)
+                for capas, lote, epocas in configuraciones
+                for prueba in grupos
+            }
+            for futuro, configuracion in futuros.items():
+                medidas[configuracion].append(futuro.result())
+
+        resultados = []
+        for (capas, lote, epocas), valores in medidas.items():
+            exactitudes, segundos, latencias = (np.array(v) for v in zip(*valores))
+            latencia_ms = latencias.mean() / 1000
+            resultados.append({
+                "capas": list(capas), "lote": lote, "epocas": epocas,
+                "exactitud": float(exactitudes.mean()), "desviacion": float(exactitudes.std()),
+                "segundos_entrenamiento": float(segundos.mean()),
+                "latencia_us": float(latencias.mean()),
+                "exactitud_por_ms": float(exactitudes.mean() / latencia_ms),
+            })
+
+        mejor_exactitud = max(r["exactitud"] for r in resultados)
+        candidatas = [r for r in resultados if r["exactitud"] >= mejor_exactitud - tolerancia]
+        elegida = max(candidatas, key=lambda r: r["exactitud_por_ms"])
+
+        print(f"{'capas':<12}{'lote':>5}{'épocas':>8}{'exactitud':>11}{'±':>7}{'entren. s':>11}{'µs/pred':>9}{'exact/ms':>10}")
+        for r in sorted(resultados, key=lambda r: r["exactitud_por_ms"], reverse=True):
+            marca = "  ⬅️" if r is elegida else ""
+            print(f"{str(tuple(r['capas'])):<12}{r['lote']:>5}{r['epocas']:>8}{r['exactitud']:>11.4f}"
+                  f"{r['desviacion']:>7.3f}{r['segundos_entrenamiento']:>11.2f}{r['latencia_us']:>9.1f}"
+                  f"{r['exactitud_por_ms']:>10.0f}{marca}")
+
+        with open(salida, 'w', encoding='utf-8') as f:
+            json.dump({"pliegues": pliegues, "tolerancia": tolerancia, "elegida": elegida,
+                       "resultados": resultados}, f, ensure_ascii=False, indent=2)
+        print(f"✅ Resultados del barrido guardados en '{salida}'.")
+
+        # Modelo final: la configuración elegida entrenada con todos los patrones
+        capas = tuple(elegida["capas"])
+        self.crear_datos_entrenamiento()
+        self.construir_modelo(capas, dropouts_para(capas))
+        self.entrenar_modelo(elegida["epocas"], elegida["lote"], paciencia)
+        self.guardar_cache(self.huella_intents())
+        return elegida
 
 # --- Punto de entrada del script ---
 if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Entrena el modelo de Benedit a partir de intents.json")
+    parser.add_argument("--forzar", action="store_true", help="Entrenar aunque intents.json no haya cambiado")
+    parser.add_argument("--desde-cero", action="store_true", help="No reutilizar los pesos del modelo anterior")
+    parser.add_argument("--epochs", type=int, default=300)
+    parser.add_argument("--batch-size", type=int, default=5)
+    parser.add_argument("--paciencia", type=int, default=20, help="Épocas sin mejora antes de detenerse (0 = sin parada temprana)")
+    parser.add_argument("--barrido", action="store_true", help="Validación cruzada sobre la grilla de hiperparámetros y exportar la mejor")
+    parser.add_argument("--pliegues", type=int, default=5, help="Pliegues de la validación cruzada del barrido")
+    parser.add_argument("--procesos", type=int, help="Procesos del barrido (por defecto, todos los núcleos)")
+    parser.add_argument("--tolerancia", type=float, default=0.02, help="Exactitud que se puede ceder por un modelo más rápido")
+    args = parser.parse_args()
+
     entrenador = EntrenadorChatbot()   # Crear instancia del entrenador
-    entrenador.entrenar()              # Ejecutar proceso completo de entrenamiento
\ No newline at end of file
+    if args.barrido:
+        entrenador.barrido(args.pliegues, args.procesos, args.tolerancia, args.paciencia)
+        raise SystemExit
+
+    entrenador.entrenar(               # Ejecutar proceso completo de entrenamiento
+        forzar=args.forzar,
+        desde_cero=args.desde_cero,
+        epochs=args.epochs,
+        batch_size=args.batch_size,
+        paciencia=args.paciencia,
+    )
@@ -1,16 +1,80 @@
-
 # CHATBOT Benedit, tu asistente emocional universitario 😊
 # Este código define la clase Estudiante, que me ayuda a conocerte mejor
 # y recordar cómo te has sentido durante nuestras conversaciones.
+# El historial guarda solo los últimos intents (no los textos completos,
+# que ya quedan en el registro de la conversación) y sirve de contexto
+# para entender mejor los mensajes poco claros.
+
+import threading               # El servidor registra interacciones desde varios hilos
+import time                    # Marca de tiempo de cada interacción
+from collections import deque  # Historial de tamaño fijo (los más antiguos se descartan)
+
+# Cada tag se guarda como un número pequeño; la tabla se comparte entre todos los estudiantes
+_IDS_TAGS = {}
+_TAGS = []
+_tags_lock = threading.Lock()
+
+
+# Devuelve el número de un tag (lo agrega a la tabla si es nuevo)
+def id_tag(tag):
+    numero = _IDS_TAGS.get(tag)
+    if numero is None:
+        with _tags_lock:  # Dos tags nuevos a la vez no pueden recibir el mismo número
+            numero = _IDS_TAGS.get(tag)
+            if numero is None:
+                numero = len(_TAGS)
+                _TAGS.append(tag)
+                _IDS_TAGS[tag] = numero
+    return numero
+
+
+# Devuelve el tag de un número
+def nombre_tag(numero):
+    return _TAGS[numero]
+
+
+# Una interacción del historial: intent detectado, probabilidad y hora
+class Interaccion:
+    __slots__ = ("id_tag", "probabilidad", "ts")
+
+    def __init__(self, id_tag, probabilidad, ts):
+        self.id_tag = id_tag              # Número del tag (None si no se entendió el mensaje)
+        self.probabilidad = probabilidad  # Probabilidad del modelo (None si vino del atajo)
+        self.ts = ts                      # time.time() del turno
+
+    @property
+    def tag(self):
+        return None if self.id_tag is None else nombre_tag(self.id_tag)
+
 
 class Estudiante:
+    __slots__ = ("nombre", "semestre", "paralelo", "historial", "al_descartar")
+
     # Método constructor: se ejecuta al crear una nueva instancia de la clase
-    def __init__(self, nombre, semestre, paralelo):
+    # max_historial: cuántas interacciones recientes se recuerdan
+    # al_descartar: función opcional que recibe cada Interaccion que sale del historial
+    def __init__(self, nombre, semestre, paralelo, max_historial=20, al_descartar=None):
         self.nombre = nombre              # Guarda el nombre del estudiante
         self.semestre = semestre          # Guarda el semestre actual del estudiante
         self.paralelo = paralelo          # Guarda el paralelo (grupo o sección) del estudiante
-        self.historial = []               # Inicializa una lista vacía para registrar las interacciones
+        self.historial = deque(maxlen=max_historial)  # Últimas interacciones (tamaño fijo)
+        self.al_descartar = al_descartar
 
     # Método para registrar una interacción entre el estudiante y el asistente
-    def registrar_interaccion(self, entrada, respuesta):
-        self.historial.append((entrada, respuesta))  # Añade una tupla (entrada, respuesta) al historial
\ No newline at end of file
+    def registrar_interaccion(self, tag, probabilidad=None, ts=None):
+        if self.al_descartar is not None and len(self.historial) == self.historial.maxlen:
+            self.al_descartar(self.historial[0])  # La más antigua está por salir
+        numero = None if tag is None else id_tag(tag)
+        self.historial.append(Interaccion(numero, probabilidad, ts or time.time()))
+
+    # Últimos n intents detectados, del más antiguo al más reciente, con su probabilidad:
+    # [(tag, probabilidad)]. Es el contexto que usa predict_class para los mensajes dudosos.
+    def intents_recientes(self, n=3):
+        recientes = []
+        for interaccion in reversed(self.historial):
+            if interaccion.id_tag is not None:
+                recientes.append((nombre_tag(interaccion.id_tag), interaccion.probabilidad))
+                if len(recientes) == n:
+                    break
+        recientes.reverse()
+        return recientes
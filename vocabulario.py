@@ -0,0 +1,71 @@
+# -------------------------------------------------------
+# Módulo: vocabulario.py
+# CHATBOT Benedit asistente emocional
+# Función: Índice difuso del vocabulario (words.pkl) para construir
+# la bolsa de palabras sin comparar cada token contra todo el vocabulario
+# -------------------------------------------------------
+
+import difflib                 # Para la verificación final de similitud (misma regla que antes)
+from functools import lru_cache  # Para recordar las búsquedas de tokens ya vistos
+import numpy as np             # Para los conteos de caracteres y el vector de salida
+
+
+# Clase que indexa el vocabulario una sola vez al iniciar el chatbot
+class IndiceVocabulario:
+    def __init__(self, words, umbral=0.8, tam_cache=4096):
+        self.words = list(words)      # Vocabulario en el mismo orden que usó el modelo
+        self.umbral = umbral          # Similitud mínima (difflib.ratio) para activar una palabra
+
+        # Alfabeto del vocabulario: cada carácter tiene una columna en la matriz de conteos
+        alfabeto = sorted({c for w in self.words for c in w})
+        self.columnas = {c: i for i, c in enumerate(alfabeto)}
+
+        # Matriz (palabras x caracteres) con cuántas veces aparece cada carácter en cada palabra
+        self.conteos = np.zeros((len(self.words), len(alfabeto)), dtype=np.int16)
+        for i, w in enumerate(self.words):
+            for c in w:
+                self.conteos[i, self.columnas[c]] += 1
+        self.longitudes = np.array([len(w) for w in self.words], dtype=np.int32)
+
+        # Caché LRU token -> índices del vocabulario que se activan
+        self.buscar = lru_cache(maxsize=tam_cache)(self._buscar)
+
+
+    # Devuelve (como tupla) los índices del vocabulario cuya similitud con el token supera el umbral
+    def _buscar(self, token):
+        if not token or not self.words:
+            return ()
+
+        # Conteo de caracteres del token (los caracteres fuera del alfabeto no pueden coincidir)
+        vector = np.zeros(len(self.columnas), dtype=np.int16)
+        for c in token:
+            columna = self.columnas.get(c)
+            if columna is not None:
+                vector[columna] += 1
+
+        # Cota superior de la similitud (equivale a difflib.quick_ratio):
+        # ninguna alineación puede emparejar más caracteres que los que ambas palabras comparten
+        comunes = np.minimum(self.conteos, vector).sum(axis=1)
+        cota = 2.0 * comunes / (len(token) + self.longitudes)
+        candidatas = np.flatnonzero(cota > self.umbral)
+
+        # Verificación exacta solo sobre las candidatas, con la misma regla que se usaba antes
+        return tuple(
+            int(i) for i in candidatas
+            if difflib.SequenceMatcher(None, token, self.words[i]).ratio() > self.umbral
+        )
+
+
+    # Devuelve los índices activos (ordenados y sin repetir) para una lista de tokens
+    def indices(self, tokens):
+        activos = set()
+        for token in tokens:
+            activos.update(self.buscar(token))
+        return np.fromiter(sorted(activos), dtype=np.intp, count=len(activos))
+
+
+    # Construye directamente el vector de presencia (BoW) para una lista de tokens
+    def bolsa(self, tokens):
+        bolsa = np.zeros(len(self.words), dtype=np.float32)
+        bolsa[self.indices(tokens)] = 1
+        return bolsa
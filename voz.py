@@ -1,9 +1,10 @@
 # CHATBOT Benedit, tu asistente emocional universitario 😊
 # Este fragmento de código me permite hablar contigo usando voz,
 # haciendo nuestra conversación más cercana y humana.
-
-# Importa la librería pyttsx3 para convertir texto en voz
-import pyttsx3
+#
+# El motor de voz vive en un hilo propio con una cola de mensajes:
+# hablar() muestra el texto y regresa de inmediato, mientras el hilo
+# reproduce el audio en orden.
 
 # Importa la librería time para poder hacer pausas durante la ejecución
 import time
@@ -11,23 +12,142 @@ import time
 # Importa la librería re para trabajar con expresiones regulares (útil para limpiar el texto)
 import re
 
+# Importa queue y threading para el hilo de voz y su cola de mensajes
+import queue
+import threading
+
+# Tiempos por etapa (solo si BENEDIT_METRICAS=1)
+from instrumentacion import tramo
+
+
+# Motor de voz real basado en pyttsx3 (se importa solo si se usa)
+class MotorPyttsx3:
+    def __init__(self):
+        import pyttsx3
+        self.engine = pyttsx3.init()  # Se crea una sola vez y se reutiliza
+
+    # Reproduce un mensaje y espera a que termine
+    def decir(self, mensaje):
+        self.engine.say(mensaje)
+        self.engine.runAndWait()
+
+    # Corta la reproducción en curso
+    def detener(self):
+        self.engine.stop()
+
+
+# Motor nulo: no reproduce nada (para pruebas, benchmarks o equipos sin audio)
+class MotorNulo:
+    pausa = 0  # Sin audio no hace falta la pausa entre mensajes
+
+    def decir(self, mensaje):
+        pass
+
+    def detener(self):
+        pass
+
+
+# Voz que no imprime ni reproduce nada (benchmarks y pruebas: la salida no forma parte de la medición)
+class VozSilenciosa:
+    def hablar(self, mensaje):
+        pass
+
+    def mostrar(self, texto):
+        pass
+
+    def flush(self):
+        pass
+
+    def interrupt(self):
+        pass
+
+    def cerrar(self):
+        pass
+
+
 # Definición de la clase Voz, que permite a Benedit hablar con el usuario
 class Voz:
+    # solo_texto=True: solo imprime, sin hilo ni motor de voz
+    # motor: clase (o función) que crea el motor; se construye dentro del hilo de voz
+    # pausa: segundos de silencio entre un mensaje y el siguiente (salvo que el motor defina la suya)
+    def __init__(self, solo_texto=False, motor=MotorPyttsx3, pausa=0.5):
+        self.solo_texto = solo_texto
+        self.pausa = pausa
+        self.motor = None
+        self.cola = queue.Queue()  # Mensajes pendientes de reproducir
+
+        if not solo_texto:
+            self.hilo = threading.Thread(target=self._trabajar, args=(motor,), daemon=True)
+            self.hilo.start()
+
+    # Bucle del hilo de voz: crea el motor una vez y reproduce los mensajes de la cola
+    def _trabajar(self, fabrica_motor):
+        try:
+            self.motor = fabrica_motor()
+        except Exception as e:
+            # Sin motor de voz disponible Benedit sigue funcionando solo con texto
+            print(f"⚠️ No se pudo iniciar el motor de voz ({e}). Se continuará solo con texto.")
+            self.motor = MotorNulo()
+
+        while True:
+            mensaje = self.cola.get()
+            try:
+                if mensaje is None:  # Señal de cierre
+                    return
+                with tramo("voz_reproduccion"):
+                    self.motor.decir(mensaje)
+                time.sleep(getattr(self.motor, "pausa", self.pausa))  # Pausa natural entre mensajes
+            except Exception as e:
+                print(f"⚠️ Error del motor de voz: {e}")
+            finally:
+                self.cola.task_done()
+
     # Método para hablar en voz alta un mensaje de texto
     def hablar(self, mensaje):
+        with tramo("voz"):
+            self._hablar(mensaje)
+
+    def _hablar(self, mensaje):
         print("Benedit:", mensaje)  # Muestra el mensaje en pantalla
 
+        if self.solo_texto:
+            return
+
         # Elimina emojis y caracteres especiales que el motor de voz no puede pronunciar
         mensaje_para_voz = re.sub(r'[^\w\s,.!?¿¡]', '', mensaje)
 
-        # Inicializa el motor de texto a voz
-        engine = pyttsx3.init()
+        # Encola el mensaje; el hilo de voz lo reproducirá en orden
+        self.cola.put(mensaje_para_voz)
+
+    # Muestra un texto en pantalla sin leerlo en voz alta (por ejemplo, las opciones de un menú)
+    def mostrar(self, texto):
+        print(texto)
 
-        # Indica al motor qué mensaje debe decir
-        engine.say(mensaje_para_voz)
+    # Espera a que se terminen de reproducir todos los mensajes pendientes
+    def flush(self):
+        if not self.solo_texto:
+            self.cola.join()
 
-        # Ejecuta la reproducción de voz
-        engine.runAndWait()
+    # Descarta los mensajes pendientes y corta el que se está reproduciendo
+    # (la señal de cierre, si ya estaba en la cola, se conserva)
+    def interrupt(self):
+        if self.solo_texto:
+            return
+        cerrar = False
+        while True:
+            try:
+                mensaje = self.cola.get_nowait()
+            except queue.Empty:
+                break
+            cerrar = cerrar or mensaje is None
+            self.cola.task_done()
+        if cerrar:
+            self.cola.put(None)
+        if self.motor is not None:
+            self.motor.detener()
 
-        # Espera medio segundo antes de continuar con el siguiente proceso
-        time.sleep(0.5)
+    # Reproduce lo pendiente y detiene el hilo de voz
+    def cerrar(self):
+        if not self.solo_texto and self.hilo.is_alive():
+            self.cola.put(None)
+            self.hilo.join()